@@ -0,0 +1,90 @@
+import os
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from corpus import sentence, unordered_list, ordered_list, quote
+from htmlnode import BlockTypes, LeafNode, ParentNode, markdown_to_blocks, markdown_to_html_node
+
+
+def legacy_block_to_block_type(block):
+    if block.startswith("#") and block.lstrip("#").startswith(" "):
+        return BlockTypes.HEADING
+    if block.startswith("```") and block.endswith("```"):
+        return BlockTypes.CODE
+    lines = block.split("\n")
+    if all(line.startswith(">") for line in lines):
+        return BlockTypes.QUOTE
+    if all(line.startswith(f"{i + 1}.") for i, line in enumerate(lines)):
+        return BlockTypes.OL
+    if all(line.startswith("*") or line.startswith("-") for line in lines):
+        return BlockTypes.UL
+    return BlockTypes.PARAGRAPH
+
+
+def legacy_markdown_to_html_node(markdown):
+    blocks = markdown_to_blocks(markdown)
+    div_node = ParentNode("div", [])
+    for block in blocks:
+        if legacy_block_to_block_type(block) == BlockTypes.HEADING:
+            for line in block.split("\n"):
+                level = line.count("#")
+                div_node.children.append(LeafNode(f"h{level if level < 7 else 6}", line.lstrip("#").strip()))
+        elif legacy_block_to_block_type(block) == BlockTypes.CODE:
+            value = "\n".join(block.split("\n")[1:-1])
+            div_node.children.append(ParentNode("pre", [ParentNode("code", [LeafNode("", value)])]))
+        elif legacy_block_to_block_type(block) == BlockTypes.QUOTE:
+            lines = block.split("\n")
+            div_node.children.append(ParentNode("blockquote", [LeafNode("p", line.lstrip("> ").strip()) for line in lines]))
+        elif legacy_block_to_block_type(block) == BlockTypes.UL:
+            items = [line.lstrip("*- ").strip() for line in block.split("\n") if line.strip()]
+            div_node.children.append(ParentNode("ul", [LeafNode("li", item) for item in items]))
+        elif legacy_block_to_block_type(block) == BlockTypes.OL:
+            items = [line.split(".", 1)[1].strip() for line in block.split("\n") if line.strip()]
+            div_node.children.append(ParentNode("ol", [LeafNode("li", item) for item in items]))
+        else:
+            div_node.children.append(LeafNode("p", block.strip()))
+    return div_node
+
+
+def document(kind, blocks, items, seed=0):
+    rng = random.Random(seed)
+    parts = [f"# {kind}"]
+    for i in range(blocks):
+        if kind == "lists":
+            parts.append(unordered_list(rng, items) if i % 2 else ordered_list(rng, items))
+        else:
+            parts.append(quote(rng, items))
+        parts.append(sentence(rng))
+    return "\n\n".join(parts)
+
+
+def best_of(repeat, func, markdown):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(markdown).to_html()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Block classification benchmark")
+    parser.add_argument("--blocks", type=int, default=500)
+    parser.add_argument("--items", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for kind in ("lists", "quotes"):
+        markdown = document(kind, args.blocks, args.items)
+        assert legacy_markdown_to_html_node(markdown).to_html() == markdown_to_html_node(markdown).to_html()
+        legacy = best_of(args.repeat, legacy_markdown_to_html_node, markdown)
+        current = best_of(args.repeat, markdown_to_html_node, markdown)
+        print(f"{kind:>7}: legacy {legacy * 1000:8.2f} ms   single-pass {current * 1000:8.2f} ms   {legacy / current:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
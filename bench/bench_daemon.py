@@ -0,0 +1,96 @@
+import os
+import sys
+import time
+import argparse
+import tempfile
+import contextlib
+import subprocess
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+sys.path.insert(0, SRC_DIR)
+
+from corpus import CORPORA, generate_corpus
+from daemon import request
+from main import generate_page, page_dest_path
+from run import working_directory
+
+CLI = os.path.join(SRC_DIR, "__main__.py")
+
+
+def edit(path, repeat_index):
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(f"\n\nEdit number {repeat_index}.\n")
+
+
+def best_of(repeat, func, page):
+    best = float("inf")
+    for i in range(repeat):
+        edit(page, i)
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def wait_for(path, timeout=60):
+    deadline = time.monotonic() + timeout
+    while not os.path.exists(path):
+        if time.monotonic() > deadline:
+            raise TimeoutError(f"Daemon did not create {path}")
+        time.sleep(0.01)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Single-file rebuild latency: cold CLI versus build daemon")
+    parser.add_argument("--corpus", choices=sorted(CORPORA), default="small_pages")
+    parser.add_argument("--scale", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        pages = generate_corpus(root, args.corpus, args.scale)
+        page = os.path.join("content", pages[len(pages) // 2][0])
+        quiet = {"cwd": root, "stdout": subprocess.DEVNULL, "stderr": subprocess.DEVNULL}
+        subprocess.run([sys.executable, CLI, "build", "--workers", "1"], check=True, **quiet)
+
+        with working_directory(root), open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            render = best_of(
+                args.repeat,
+                lambda: generate_page(page, "template.html", page_dest_path(page, "content", "public")),
+                page,
+            )
+        cold = best_of(
+            args.repeat,
+            lambda: subprocess.run([sys.executable, CLI, "build", "--workers", "1"], check=True, **quiet),
+            os.path.join(root, page),
+        )
+
+        socket_path = os.path.join(root, "daemon.sock")
+        daemon = subprocess.Popen([sys.executable, CLI, "daemon", "--socket", socket_path], **quiet)
+        try:
+            wait_for(socket_path)
+            message = {"command": "build", "paths": [os.path.join(root, page)]}
+            warm = best_of(args.repeat, lambda: request(message, socket_path), os.path.join(root, page))
+            client = best_of(
+                args.repeat,
+                lambda: subprocess.run(
+                    [sys.executable, CLI, "client", "build", page, "--socket", socket_path], check=True, **quiet
+                ),
+                os.path.join(root, page),
+            )
+            request({"command": "stop"}, socket_path)
+        finally:
+            daemon.wait(timeout=60)
+
+        print(f"{args.corpus}: {len(pages)} page(s), rebuilding {page} after an edit")
+        for name, seconds in (
+            ("render the page only", render),
+            ("cold CLI build", cold),
+            ("daemon request", warm),
+            ("daemon via CLI client", client),
+        ):
+            print(f"  {name:<24}{seconds * 1000:9.1f} ms  {seconds / render:6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+import os
+import sys
+import html
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from corpus import WORDS
+from htmlnode import LeafNode, ParentNode, escape_text
+
+TRANSLATE_TABLE = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;"})
+STRATEGIES = {
+    "unescaped": lambda text: text,
+    "html.escape": lambda text: html.escape(text, quote=False),
+    "translate": lambda text: text.translate(TRANSLATE_TABLE),
+    "serializer": escape_text,
+}
+
+
+def code_body(rng, lines):
+    return "\n".join(
+        f"if (items[{i}] < limit && {rng.choice(WORDS)} > 0) {{ total &= mask<{rng.choice(WORDS)}>; }}"
+        for i in range(lines)
+    )
+
+
+def prose_body(rng, lines):
+    return "\n".join(" ".join(rng.choice(WORDS) for _ in range(12)) for _ in range(lines))
+
+
+def serialize(body, escape):
+    # mirrors LeafNode.to_html for the untagged leaf inside <pre><code>
+    return "<div><pre><code>" + escape(body) + "</code></pre></div>"
+
+
+def best_of(repeat, func):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTML escaping benchmark on large code blocks")
+    parser.add_argument("--lines", type=int, default=20000)
+    parser.add_argument("--blocks", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    for kind, make in (("code", code_body), ("prose", prose_body)):
+        bodies = [make(rng, args.lines // args.blocks) for _ in range(args.blocks)]
+        size = sum(len(body) for body in bodies)
+        expected = [serialize(body, STRATEGIES["html.escape"]) for body in bodies]
+        actual = [
+            ParentNode("div", [ParentNode("pre", [ParentNode("code", [LeafNode("", body)])])]).to_html()
+            for body in bodies
+        ]
+        assert actual == expected
+
+        timings = {
+            name: best_of(args.repeat, lambda: [serialize(body, escape) for body in bodies])
+            for name, escape in STRATEGIES.items()
+        }
+        timings["full tree"] = best_of(args.repeat, lambda: [
+            ParentNode("pre", [ParentNode("code", [LeafNode("", body)])]).to_html() for body in bodies
+        ])
+        print(f"{kind} ({size / 1e6:.2f} MB):")
+        for name, seconds in timings.items():
+            print(f"  {name:>12} {seconds * 1000:8.2f} ms   {size / seconds / 1e6:8.1f} MB/s")
+
+
+if __name__ == "__main__":
+    main()
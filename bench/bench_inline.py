@@ -0,0 +1,52 @@
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from textnode import (
+    TextNode, TextTypes,
+    split_nodes_delimiter, split_nodes_image, split_nodes_link,
+    text_to_textnodes,
+)
+
+SENTENCE = (
+    "Plain words with a **bold claim**, an *aside*, some `inline_code()` and a "
+    "[link](https://example.com/page) next to an ![image](/images/rivendell.png). "
+)
+
+
+def legacy_text_to_textnodes(text):
+    nodes = [TextNode(text, TextTypes.TEXT)]
+    nodes = split_nodes_image(nodes)
+    nodes = split_nodes_link(nodes)
+    nodes = split_nodes_delimiter(nodes, "**", TextTypes.BOLD)
+    nodes = split_nodes_delimiter(nodes, "*", TextTypes.ITALIC)
+    nodes = split_nodes_delimiter(nodes, "`", TextTypes.CODE)
+    return nodes
+
+
+def throughput(func, text, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(text)
+        best = min(best, time.perf_counter() - start)
+    return len(text.encode("utf-8")) / best / 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inline tokenizer throughput")
+    parser.add_argument("--sentences", type=int, default=5000, help="Sentences per paragraph")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    text = SENTENCE * args.sentences
+    print(f"paragraph size: {len(text) / 1e6:.2f} MB")
+    for name, func in (("legacy", legacy_text_to_textnodes), ("single-pass", text_to_textnodes)):
+        print(f"{name:>12}: {throughput(func, text, args.repeat):8.2f} MB/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+import os
+import sys
+import time
+import argparse
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from htmlnode import LeafNode, ParentNode
+from textnode import TextNode, TextTypes
+
+
+class DictHTMLNode:
+    def __init__(self, tag=None, value=None, children=None, props=None):
+        self.tag = tag
+        self.value = value
+        self.children = children
+        self.props = props
+
+
+class DictLeafNode(DictHTMLNode):
+    def __init__(self, tag, value, props=None):
+        super().__init__(tag, value, None, props)
+
+
+class DictParentNode(DictHTMLNode):
+    def __init__(self, tag, children):
+        super().__init__(tag, None, children, None)
+
+
+class DictTextNode:
+    def __init__(self, text, text_type, url=None):
+        self.text = text
+        self.text_type = text_type
+        self.url = url
+
+
+def measure(factory, count):
+    start = time.perf_counter()
+    nodes = [factory() for _ in range(count)]
+    elapsed = time.perf_counter() - start
+    del nodes
+
+    tracemalloc.start()
+    nodes = [factory() for _ in range(count)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # the list holding the nodes is included; subtract its pointer array
+    size -= sys.getsizeof(nodes)
+    return size / count, elapsed / count * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Node memory footprint and construction time")
+    parser.add_argument("--nodes", type=int, default=200000)
+    args = parser.parse_args()
+
+    cases = (
+        ("LeafNode", lambda: DictLeafNode("p", "text"), lambda: LeafNode("p", "text")),
+        ("ParentNode", lambda: DictParentNode("div", None), lambda: ParentNode("div", None)),
+        ("TextNode", lambda: DictTextNode("text", TextTypes.TEXT), lambda: TextNode("text", TextTypes.TEXT)),
+    )
+    print(f"{'node':>10} {'before B':>9} {'after B':>8} {'before ns':>10} {'after ns':>9}")
+    for name, before, after in cases:
+        before_bytes, before_ns = measure(before, args.nodes)
+        after_bytes, after_ns = measure(after, args.nodes)
+        print(f"{name:>10} {before_bytes:9.1f} {after_bytes:8.1f} {before_ns:10.1f} {after_ns:9.1f}")
+
+
+if __name__ == "__main__":
+    main()
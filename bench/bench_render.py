@@ -0,0 +1,86 @@
+import os
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from corpus import CORPORA
+from htmlnode import (
+    BlockTypes, LeafNode, ParentNode, classify_block, iter_markdown_blocks, inline_to_html_node,
+)
+from textnode import text_node_to_html, text_to_html_nodes, text_to_textnodes
+
+
+def raw_text(tag, text):
+    # what blocks rendered before inline markup was wired in
+    return LeafNode(tag, text)
+
+
+def always_tokenize(tag, text):
+    return ParentNode(tag, text_to_html_nodes(text))
+
+
+def via_textnodes(tag, text):
+    return ParentNode(tag, [text_node_to_html(node) for node in text_to_textnodes(text)])
+
+
+def render(markdown, inline):
+    children = []
+    for block in iter_markdown_blocks(markdown.split("\n")):
+        block = classify_block(block)
+        block_type = block.block_type
+        if block_type == BlockTypes.HEADING:
+            children.extend(inline(f"h{level}", text) for level, text in block.items)
+        elif block_type == BlockTypes.CODE:
+            children.append(ParentNode("pre", [ParentNode("code", [LeafNode("", block.items)])]))
+        elif block_type == BlockTypes.QUOTE:
+            children.append(ParentNode("blockquote", [inline("p", item) for item in block.items]))
+        elif block_type == BlockTypes.UL:
+            children.append(ParentNode("ul", [inline("li", item) for item in block.items]))
+        elif block_type == BlockTypes.OL:
+            children.append(ParentNode("ol", [inline("li", item) for item in block.items]))
+        else:
+            children.append(inline("p", block.items))
+    return ParentNode("div", children).to_html()
+
+
+def best_of(repeat, func):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inline rendering overhead benchmark")
+    parser.add_argument("--corpus", choices=sorted(CORPORA), action="append")
+    parser.add_argument("--scale", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for name in args.corpus or ["small_pages", "long_lists", "inline_heavy"]:
+        documents = [markdown for _, markdown in CORPORA[name](random.Random(0), args.scale)]
+        timings = {}
+        for label, inline in (
+            ("raw text", raw_text),
+            ("inline", inline_to_html_node),
+            ("no fast path", always_tokenize),
+            ("via TextNode", via_textnodes),
+        ):
+            timings[label] = best_of(args.repeat, lambda: [render(markdown, inline) for markdown in documents])
+        raw = timings["raw text"]
+        print(
+            f"{name:>13}: raw text {raw * 1000:8.2f} ms   "
+            + "   ".join(
+                f"{label} {seconds * 1000:8.2f} ms ({seconds / raw:4.2f}x)"
+                for label, seconds in timings.items() if label != "raw text"
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
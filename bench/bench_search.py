@@ -0,0 +1,73 @@
+import os
+import sys
+import gzip
+import time
+import argparse
+import tempfile
+import contextlib
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from corpus import CORPORA, generate_corpus
+from main import generate_pages_recursive
+from search import SearchIndex
+
+
+def build(root, workers, search_index):
+    content_dir = os.path.join(root, "content")
+    template_path = os.path.join(root, "template.html")
+    dest_dir = os.path.join(root, "public")
+    start = time.perf_counter()
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        generate_pages_recursive(content_dir, template_path, dest_dir, workers=workers, search_index=search_index)
+    return time.perf_counter() - start
+
+
+def directory_size(path):
+    raw = compressed = 0
+    for name in os.listdir(path):
+        with open(os.path.join(path, name), "rb") as f:
+            data = f.read()
+        raw += len(data)
+        compressed += len(gzip.compress(data))
+    return raw, compressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Search index size and build time benchmark")
+    parser.add_argument("--corpus", choices=sorted(CORPORA), default="small_pages")
+    parser.add_argument("--scale", type=int, default=1)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--prefix", type=int, default=2, help="Term prefix length used to partition shards")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        pages = generate_corpus(root, args.corpus, args.scale)
+        markdown_size = sum(len(markdown.encode("utf-8")) for _, markdown in pages)
+
+        plain = build(root, args.workers, None)
+        index = SearchIndex(os.path.join(root, "search.json"), args.prefix)
+        indexed = build(root, args.workers, index)
+
+        search_dir = os.path.join(root, "search")
+        start = time.perf_counter()
+        index.write(search_dir)
+        write = time.perf_counter() - start
+
+        raw, compressed = directory_size(search_dir)
+        shards = os.listdir(search_dir)
+        largest = max(os.path.getsize(os.path.join(search_dir, name)) for name in shards)
+        terms = len({term for page in index.pages.values() for term in page["terms"]})
+
+        print(f"{args.corpus}: {len(pages)} page(s), {markdown_size / 1e6:.2f} MB of markdown, {terms} term(s)")
+        print(f"  render without index {plain * 1000:9.1f} ms")
+        print(f"  render with index    {indexed * 1000:9.1f} ms   (+{(indexed / plain - 1) * 100:.1f}%)")
+        print(f"  write shards         {write * 1000:9.1f} ms")
+        print(
+            f"  index size           {raw / 1e3:9.1f} KB raw, {compressed / 1e3:.1f} KB gzip, "
+            f"{len(shards)} file(s), largest {largest / 1e3:.1f} KB"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+import os
+import sys
+import time
+import argparse
+import subprocess
+
+ROOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+COMMANDS = {
+    "build_help": ["build", "--help"],
+    "serve_help": ["serve", "--help"],
+}
+
+
+def parse_importtime(stderr):
+    # -X importtime writes "import time: self [us] | cumulative | name" lines,
+    # with nesting shown by indenting the name
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = (int(self_us), int(cumulative_us))
+    return modules
+
+
+def import_times(args):
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        cwd=ROOT_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, check=True,
+    )
+    return parse_importtime(result.stderr)
+
+
+def cli_import_times(argv):
+    # modules the bare interpreter imports anyway are not the CLI's doing
+    interpreter = import_times(["-c", "pass"])
+    modules = import_times(["-m", "src", *argv])
+    return {name: times for name, times in modules.items() if name not in interpreter}
+
+
+def cold_start(argv, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-m", "src", *argv], cwd=ROOT_DIR, stdout=subprocess.DEVNULL, check=True)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_startup(repeat):
+    results = {}
+    for name, argv in COMMANDS.items():
+        results[name] = cold_start(argv, repeat)
+        results[f"{name}_imports"] = sum(self_us for self_us, _ in cli_import_times(argv).values()) / 1e6
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CLI cold-start and -X importtime report")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15, help="Slowest imports to list per command")
+    args = parser.parse_args()
+
+    for argv in COMMANDS.values():
+        modules = cli_import_times(argv)
+        total = sum(self_us for self_us, _ in modules.values())
+        print(
+            f"{' '.join(argv)}: {cold_start(argv, args.repeat) * 1000:.1f} ms wall, "
+            f"{len(modules)} module(s) imported in {total / 1000:.1f} ms"
+        )
+        slowest = sorted(modules.items(), key=lambda item: -item[1][0])[:args.top]
+        for module, (self_us, cumulative_us) in slowest:
+            print(f"  {module:<32}{self_us / 1000:8.2f} ms self {cumulative_us / 1000:8.2f} ms cumulative")
+
+
+if __name__ == "__main__":
+    main()
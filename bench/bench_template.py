@@ -0,0 +1,40 @@
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from template import load_template
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+BODY = "<div>" + "<p>Rendered paragraph with some text.</p>" * 200 + "</div>"
+
+
+def render_replace(template_path, title, content):
+    with open(template_path, "r", encoding="utf-8") as f:
+        template_content = f.read()
+    template_content = template_content.replace("{{ Title }}", title)
+    return template_content.replace("{{ Content }}", content)
+
+
+def render_compiled(template_path, title, content):
+    return load_template(template_path).render({"Title": title, "Content": [content]})
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Template rendering microbenchmark")
+    parser.add_argument("--pages", type=int, default=10000)
+    parser.add_argument("--template", default=os.path.join(ROOT, "template.html"))
+    args = parser.parse_args()
+
+    for name, func in (("str.replace", render_replace), ("compiled", render_compiled)):
+        start = time.perf_counter()
+        for i in range(args.pages):
+            func(args.template, f"Page {i}", BODY)
+        elapsed = time.perf_counter() - start
+        print(f"{name:>12}: {args.pages / elapsed:10.0f} pages/s ({elapsed * 1e6 / args.pages:.1f} us/page)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+import os
+import random
+import argparse
+
+WORDS = (
+    "middle earth ring fellowship shire river mountain elves dwarves wizard "
+    "journey shadow light council forest tower ancient road hobbit kingdom"
+).split()
+
+TEMPLATE = """<!DOCTYPE html>
+<html>
+<head><title> {{ Title }} </title><link href="/index.css" rel="stylesheet"></head>
+<body><article>{{ Content }}</article></body>
+</html>
+"""
+
+
+def sentence(rng, words=12):
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+def inline_sentence(rng):
+    return (
+        f"{sentence(rng, 6)} **{rng.choice(WORDS)}** and *{rng.choice(WORDS)}* with "
+        f"`{rng.choice(WORDS)}()` and a [{rng.choice(WORDS)}](/{rng.choice(WORDS)}) "
+        f"plus ![{rng.choice(WORDS)}](/images/{rng.choice(WORDS)}.png)."
+    )
+
+
+def paragraph(rng, sentences=5):
+    return " ".join(sentence(rng) for _ in range(sentences))
+
+
+def inline_paragraph(rng, sentences=5):
+    return " ".join(inline_sentence(rng) for _ in range(sentences))
+
+
+def unordered_list(rng, items):
+    return "\n".join(f"- {sentence(rng, 8)}" for _ in range(items))
+
+
+def ordered_list(rng, items):
+    return "\n".join(f"{i + 1}. {sentence(rng, 8)}" for i in range(items))
+
+
+def quote(rng, lines):
+    return "\n".join(f"> {sentence(rng, 10)}" for _ in range(lines))
+
+
+def code_block(rng, lines):
+    body = "\n".join(f"value_{i} = compute({rng.choice(WORDS)!r}, {i})" for i in range(lines))
+    return f"```\n{body}\n```"
+
+
+def page(rng, title, blocks):
+    return f"# {title}\n\n" + "\n\n".join(blocks) + "\n"
+
+
+def mixed_blocks(rng, count):
+    makers = (
+        lambda: paragraph(rng),
+        lambda: f"## {sentence(rng, 4)}",
+        lambda: unordered_list(rng, 5),
+        lambda: ordered_list(rng, 5),
+        lambda: quote(rng, 3),
+        lambda: code_block(rng, 6),
+    )
+    return [rng.choice(makers)() for _ in range(count)]
+
+
+CORPORA = {
+    "small_pages": lambda rng, scale: [
+        (f"pages/page{i:05d}.md", page(rng, f"Page {i}", mixed_blocks(rng, 8)))
+        for i in range(200 * scale)
+    ],
+    "giant_pages": lambda rng, scale: [
+        (f"giant{i}.md", page(rng, f"Giant {i}", mixed_blocks(rng, 2000 * scale)))
+        for i in range(3)
+    ],
+    "inline_heavy": lambda rng, scale: [
+        (f"inline{i}.md", page(rng, f"Inline {i}", [inline_paragraph(rng, 10) for _ in range(100 * scale)]))
+        for i in range(5)
+    ],
+    "long_lists": lambda rng, scale: [
+        (f"lists{i}.md", page(rng, f"Lists {i}", [
+            unordered_list(rng, 200 * scale) if j % 2 else ordered_list(rng, 200 * scale)
+            for j in range(10)
+        ]))
+        for i in range(5)
+    ],
+    "large_code": lambda rng, scale: [
+        (f"code{i}.md", page(rng, f"Code {i}", [code_block(rng, 500 * scale) for _ in range(10)]))
+        for i in range(5)
+    ],
+}
+
+
+def generate_corpus(root, name, scale=1, seed=0):
+    rng = random.Random(seed)
+    pages = CORPORA[name](rng, scale)
+    for relative_path, markdown in pages:
+        path = os.path.join(root, "content", relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(markdown)
+    os.makedirs(os.path.join(root, "static"), exist_ok=True)
+    with open(os.path.join(root, "static", "index.css"), "w", encoding="utf-8") as f:
+        f.write("body { margin: 0; }\n")
+    with open(os.path.join(root, "template.html"), "w", encoding="utf-8") as f:
+        f.write(TEMPLATE)
+    return pages
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic markdown corpus")
+    parser.add_argument("root", help="Directory to write content/, static/ and template.html into")
+    parser.add_argument("--corpus", choices=sorted(CORPORA), default="small_pages")
+    parser.add_argument("--scale", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    pages = generate_corpus(args.root, args.corpus, args.scale, args.seed)
+    size = sum(len(markdown) for _, markdown in pages)
+    print(f"Wrote {len(pages)} page(s), {size / 1e6:.2f} MB of markdown to {args.root}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+import time
+import argparse
+import threading
+import http.client
+from urllib.parse import urlsplit
+
+
+def worker(host, port, paths, deadline, latencies, errors, headers):
+    connection = http.client.HTTPConnection(host, port, timeout=10)
+    i = 0
+    while time.perf_counter() < deadline:
+        path = paths[i % len(paths)]
+        i += 1
+        start = time.perf_counter()
+        try:
+            connection.request("GET", path, headers=headers)
+            response = connection.getresponse()
+            response.read()
+            if response.will_close:
+                connection.close()
+                connection = http.client.HTTPConnection(host, port, timeout=10)
+        except (OSError, http.client.HTTPException):
+            errors.append(path)
+            connection.close()
+            connection = http.client.HTTPConnection(host, port, timeout=10)
+            continue
+        latencies.append(time.perf_counter() - start)
+    connection.close()
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(len(sorted_values) * fraction))
+    return sorted_values[index]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the local static server")
+    parser.add_argument("--url", default="http://localhost:8888", help="Server base URL")
+    parser.add_argument("--paths", nargs="+", default=["/", "/index.css", "/images/rivendell.png"])
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds to run")
+    parser.add_argument("--gzip", action="store_true", help="Send Accept-Encoding: gzip, br")
+    args = parser.parse_args()
+
+    url = urlsplit(args.url)
+    headers = {"Accept-Encoding": "gzip, br"} if args.gzip else {}
+    latencies = []
+    errors = []
+    deadline = time.perf_counter() + args.duration
+    threads = [
+        threading.Thread(
+            target=worker,
+            args=(url.hostname, url.port or 80, args.paths, deadline, latencies, errors, headers),
+        )
+        for _ in range(args.concurrency)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    print(f"requests:  {len(latencies)} ({len(errors)} errors) in {elapsed:.1f}s")
+    print(f"req/s:     {len(latencies) / elapsed:.1f}")
+    print(f"p50:       {percentile(latencies, 0.50) * 1000:.2f} ms")
+    print(f"p99:       {percentile(latencies, 0.99) * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
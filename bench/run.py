@@ -0,0 +1,143 @@
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import contextlib
+import logging
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, "..", "src"))
+
+from corpus import CORPORA, generate_corpus
+from bench_startup import bench_startup
+from htmlnode import markdown_to_blocks, block_to_block_type, markdown_to_html_node
+from textnode import text_to_textnodes
+import main as generator
+
+BASELINE_PATH = os.path.join(BENCH_DIR, "baseline.json")
+
+
+def best_of(repeat, func, *args):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+@contextlib.contextmanager
+def working_directory(path):
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+def bench_corpus(name, scale, repeat):
+    results = {}
+    with tempfile.TemporaryDirectory() as root:
+        pages = generate_corpus(root, name, scale)
+        documents = [markdown for _, markdown in pages]
+        blocks = [block for markdown in documents for block in markdown_to_blocks(markdown)]
+        inline_blocks = [
+            block for block in blocks
+            if block_to_block_type(block).value in ("paragraph", "heading")
+        ]
+
+        results["markdown_to_blocks"] = best_of(
+            repeat, lambda: [markdown_to_blocks(markdown) for markdown in documents]
+        )
+        results["block_to_block_type"] = best_of(
+            repeat, lambda: [block_to_block_type(block) for block in blocks]
+        )
+        results["markdown_to_html_node"] = best_of(
+            repeat, lambda: [markdown_to_html_node(markdown).to_html() for markdown in documents]
+        )
+        results["text_to_textnodes"] = best_of(
+            repeat, lambda: [text_to_textnodes(block) for block in inline_blocks]
+        )
+
+        # opened once: a handle per timed run would leak and be timed too
+        with open(os.devnull, "w") as devnull:
+            def full_build():
+                with working_directory(root), contextlib.redirect_stdout(devnull):
+                    generator.main(clean=True, workers=1)
+
+            results["main_build"] = best_of(repeat, full_build)
+
+            def noop_build():
+                with working_directory(root), contextlib.redirect_stdout(devnull):
+                    generator.main(workers=1)
+
+            results["main_noop_build"] = best_of(repeat, noop_build)
+        shutil.rmtree(os.path.join(root, "public"), ignore_errors=True)
+    return results
+
+
+def compare(results, baseline, threshold):
+    regressions = []
+    for corpus, timings in sorted(results.items()):
+        for name, seconds in sorted(timings.items()):
+            previous = baseline.get(corpus, {}).get(name)
+            if previous is None:
+                status = "new"
+            else:
+                ratio = seconds / previous if previous else float("inf")
+                status = f"{ratio:5.2f}x"
+                if ratio > 1 + threshold:
+                    status += "  REGRESSION"
+                    regressions.append((corpus, name, ratio))
+            print(f"{corpus:<14}{name:<24}{seconds * 1000:10.2f} ms  {status}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Markdown pipeline benchmark suite")
+    parser.add_argument("--corpus", nargs="+", choices=sorted(CORPORA), default=sorted(CORPORA))
+    parser.add_argument("--scale", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Baseline JSON file")
+    parser.add_argument("--save", action="store_true", help="Store these results as the new baseline")
+    parser.add_argument(
+        "--threshold", type=float, default=0.15,
+        help="Allowed slowdown versus the baseline before failing (0.15 = 15%%)",
+    )
+    parser.add_argument(
+        "--skip-startup", action="store_true", help="Skip the CLI cold-start and import time measurements"
+    )
+    args = parser.parse_args(argv)
+
+    logging.disable(logging.INFO)
+    results = {name: bench_corpus(name, args.scale, args.repeat) for name in args.corpus}
+    if not args.skip_startup:
+        # -X importtime totals of `python -m src build --help` and friends
+        results["startup"] = bench_startup(args.repeat)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f).get(f"scale={args.scale}", {})
+    regressions = compare(results, baseline, args.threshold)
+
+    if args.save:
+        stored = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, "r", encoding="utf-8") as f:
+                stored = json.load(f)
+        stored.setdefault(f"scale={args.scale}", {}).update(results)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(stored, f, indent=2, sort_keys=True)
+        print(f"Saved baseline to {args.baseline}")
+    elif regressions:
+        print(f"{len(regressions)} regression(s) above {args.threshold:.0%}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,2 +1,2 @@
-python3 src/main.py
-python3 server.py --dir public
+python3 -m src build
+python3 -m src serve --dir public
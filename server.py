@@ -1,9 +1,107 @@
 import os
-import argparse
-from http.server import HTTPServer, SimpleHTTPRequestHandler
+import re
+import sys
+import json
+import hashlib
+import threading
+import functools
+import email.utils
+import urllib.parse
+from http import HTTPStatus
+from http.server import HTTPServer, ThreadingHTTPServer, SimpleHTTPRequestHandler
+
+LIVERELOAD_PATH = "/__livereload"
+LIVERELOAD_SCRIPT = (
+    "<script>new EventSource(\"" + LIVERELOAD_PATH + "\")"
+    ".addEventListener(\"reload\", () => location.reload());</script>"
+)
+
+
+RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+PRECOMPRESSED = (("br", ".br"), ("gzip", ".gz"))
+# written by the build's --fingerprint stage, mapping plain URLs to
+# content-addressed ones
+ASSET_MANIFEST_NAME = "asset-manifest.json"
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+class FileHashCache:
+    def __init__(self):
+        self.hashes = {}
+        self.lock = threading.Lock()
+
+    def etag(self, path, stat):
+        key = (stat.st_mtime_ns, stat.st_size)
+        with self.lock:
+            cached = self.hashes.get(path)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        digest = hashlib.blake2b(digest_size=16)
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 16), b""):
+                digest.update(chunk)
+        etag = f'"{digest.hexdigest()}"'
+        with self.lock:
+            self.hashes[path] = (key, etag)
+        return etag
+
+
+class FingerprintedAssets:
+    # only URLs the build fingerprinted may be cached forever; a name that
+    # merely looks hashed, like notes.20241015.html, may still change
+    def __init__(self):
+        self.manifests = {}
+        self.lock = threading.Lock()
+
+    def urls(self, directory):
+        path = os.path.join(directory, ASSET_MANIFEST_NAME)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return frozenset()
+        key = (stat.st_mtime_ns, stat.st_size)
+        with self.lock:
+            cached = self.manifests.get(path)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                urls = frozenset(json.load(f).values())
+        except (OSError, ValueError, AttributeError):
+            urls = frozenset()
+        with self.lock:
+            self.manifests[path] = (key, urls)
+        return urls
+
+    def is_immutable(self, directory, path):
+        return urllib.parse.unquote(path) in self.urls(directory)
+
+
+class LiveReload:
+    def __init__(self):
+        self.version = 0
+        self.condition = threading.Condition()
+
+    def notify(self):
+        with self.condition:
+            self.version += 1
+            self.condition.notify_all()
+
+    def wait(self, version, timeout):
+        with self.condition:
+            self.condition.wait_for(lambda: self.version != version, timeout)
+            return self.version
 
 
 class CORSHTTPRequestHandler(SimpleHTTPRequestHandler):
+    livereload = None
+    file_hashes = FileHashCache()
+    fingerprinted_assets = FingerprintedAssets()
+    # headers and body go out in separate writes; without this, keep-alive
+    # responses stall on Nagle + delayed ACK
+    disable_nagle_algorithm = True
+    copy_remaining = None
+
     def end_headers(self):
         self.send_header("Access-Control-Allow-Origin", "*")
         self.send_header("Access-Control-Allow-Methods", "GET, OPTIONS")
@@ -12,7 +110,231 @@ class CORSHTTPRequestHandler(SimpleHTTPRequestHandler):
 
     def do_OPTIONS(self):
         self.send_response(200, "OK")
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def send_head(self):
+        self.copy_remaining = None
+        path = self.translate_path(self.path)
+        if os.path.isdir(path):
+            index_path = os.path.join(path, "index.html")
+            if not self.path.split("?", 1)[0].endswith("/") or not os.path.isfile(index_path):
+                return super().send_head()
+            path = index_path
+        if not os.path.isfile(path):
+            return super().send_head()
+
+        content_type = self.guess_type(path)
+        served_path, encoding = self.select_encoding(path)
+        stat = os.stat(served_path)
+        etag = self.file_hashes.etag(served_path, stat)
+
+        if self.is_not_modified(etag, stat):
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_validators(etag, stat, encoding)
+            self.end_headers()
+            return None
+
+        start, end = 0, stat.st_size - 1
+        status = HTTPStatus.OK
+        byte_range = self.requested_range(etag, encoding)
+        if byte_range is not None:
+            parsed = parse_range(byte_range, stat.st_size)
+            if parsed is None:
+                self.send_response(HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE)
+                self.send_header("Content-Range", f"bytes */{stat.st_size}")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return None
+            start, end = parsed
+            status = HTTPStatus.PARTIAL_CONTENT
+
+        f = open(served_path, "rb")
+        try:
+            f.seek(start)
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(end - start + 1))
+            if status == HTTPStatus.PARTIAL_CONTENT:
+                self.send_header("Content-Range", f"bytes {start}-{end}/{stat.st_size}")
+            self.send_validators(etag, stat, encoding)
+            self.end_headers()
+        except BaseException:
+            f.close()
+            raise
+        self.copy_remaining = end - start + 1
+        return f
+
+    def select_encoding(self, path):
+        accepted = {
+            token.split(";", 1)[0].strip()
+            for token in self.headers.get("Accept-Encoding", "").split(",")
+        }
+        if self.headers.get("Range"):
+            return path, None
+        for encoding, extension in PRECOMPRESSED:
+            compressed_path = path + extension
+            if encoding in accepted and os.path.isfile(compressed_path):
+                if os.stat(compressed_path).st_mtime_ns >= os.stat(path).st_mtime_ns:
+                    return compressed_path, encoding
+        return path, None
+
+    def send_validators(self, etag, stat, encoding):
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", self.date_time_string(stat.st_mtime))
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("Vary", "Accept-Encoding")
+        if self.fingerprinted_assets.is_immutable(self.directory, self.path.split("?", 1)[0]):
+            self.send_header("Cache-Control", IMMUTABLE_CACHE_CONTROL)
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+
+    def is_not_modified(self, etag, stat):
+        if_none_match = self.headers.get("If-None-Match")
+        if if_none_match is not None:
+            tags = [tag.strip() for tag in if_none_match.split(",")]
+            return "*" in tags or etag in tags
+        if_modified_since = self.headers.get("If-Modified-Since")
+        if if_modified_since is not None:
+            try:
+                since = email.utils.parsedate_to_datetime(if_modified_since)
+            except (TypeError, ValueError, IndexError, OverflowError):
+                return False
+            return since is not None and int(stat.st_mtime) <= since.timestamp()
+        return False
+
+    def requested_range(self, etag, encoding):
+        byte_range = self.headers.get("Range")
+        if byte_range is None or encoding is not None:
+            return None
+        if_range = self.headers.get("If-Range")
+        if if_range is not None and if_range.strip() != etag:
+            return None
+        return byte_range
+
+    def copyfile(self, source, outputfile):
+        remaining = self.copy_remaining
+        self.copy_remaining = None
+        if remaining is None:
+            return super().copyfile(source, outputfile)
+        while remaining > 0:
+            chunk = source.read(min(remaining, 1 << 16))
+            if not chunk:
+                break
+            outputfile.write(chunk)
+            remaining -= len(chunk)
+
+    def do_GET(self):
+        if self.livereload is not None:
+            if self.path == LIVERELOAD_PATH:
+                return self.send_events()
+            html_path = self.html_path()
+            if html_path:
+                return self.send_html_with_livereload(html_path)
+        super().do_GET()
+
+    def html_path(self):
+        path = self.translate_path(self.path)
+        if os.path.isdir(path):
+            path = os.path.join(path, "index.html")
+        if path.endswith(".html") and os.path.isfile(path):
+            return path
+        return None
+
+    def send_html_with_livereload(self, path):
+        with open(path, "rb") as f:
+            body = f.read()
+        script = LIVERELOAD_SCRIPT.encode("utf-8")
+        if b"</body>" in body:
+            body = body.replace(b"</body>", script + b"</body>", 1)
+        else:
+            body += script
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-cache")
         self.end_headers()
+        self.wfile.write(body)
+
+    def send_events(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        version = self.livereload.version
+        try:
+            while True:
+                current = self.livereload.wait(version, timeout=15)
+                if current == version:
+                    self.wfile.write(b": keep-alive\n\n")
+                else:
+                    version = current
+                    self.wfile.write(f"event: reload\ndata: {version}\n\n".encode("ascii"))
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+def parse_range(byte_range, size):
+    match = RANGE_PATTERN.match(byte_range.strip())
+    if not match or size == 0:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        length = int(last)
+        if length == 0:
+            return None
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = int(last) if last else size - 1
+    if start >= size or end < start:
+        return None
+    return start, min(end, size - 1)
+
+
+def start_watcher(livereload, interval, workers):
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+    from main import (
+        MANIFEST_PATH, LINK_INDEX_PATH, SEARCH_INDEX_PATH, IMAGE_CACHE_DIR, CONTENT_DIR, STATIC_DIR, TEMPLATE_PATH,
+        PUBLIC_DIR, build_changed, publish_indexes, main as build
+    )
+    from images import ImagePipeline
+    from manifest import BuildManifest
+    from links import LinkIndex
+    from search import SearchIndex
+    from watch import watch
+
+    build(workers=workers)
+    manifest = BuildManifest(MANIFEST_PATH).load()
+    link_index = LinkIndex(LINK_INDEX_PATH).load()
+    search_index = SearchIndex(SEARCH_INDEX_PATH).load()
+    # the same pipeline main() uses, so watch rebuilds keep image dimensions
+    caches = {"images": ImagePipeline(STATIC_DIR, CONTENT_DIR, (), IMAGE_CACHE_DIR)}
+
+    def rebuild(changed_paths):
+        rebuilt = build_changed(changed_paths, manifest, workers, caches, link_index, search_index)
+        for index in (link_index, search_index):
+            index.prune()
+        publish_indexes(link_index, search_index, PUBLIC_DIR)
+        # the indexes are saved before the manifest, so a page the manifest
+        # calls fresh never has stale index entries
+        for index in (link_index, search_index):
+            index.save()
+        manifest.save()
+        if rebuilt:
+            print(f"Rebuilt {len(rebuilt)} file(s), reloading browsers.")
+            livereload.notify()
+
+    thread = threading.Thread(
+        target=watch,
+        args=([CONTENT_DIR, STATIC_DIR, TEMPLATE_PATH], rebuild),
+        kwargs={"interval": interval, "debounce": interval},
+        daemon=True,
+    )
+    thread.start()
+    return thread
 
 
 def run(
@@ -20,8 +342,24 @@ def run(
     handler_class=CORSHTTPRequestHandler,
     port=8000,
     directory=None,
+    watch=False,
+    poll_interval=0.025,
+    workers=1,
+    threaded=False,
 ):
-    if directory:  # Change the current working directory if directory is specified
+    if threaded or watch:
+        # persistent connections only make sense when one client can't
+        # hold the whole server hostage
+        handler_class.protocol_version = "HTTP/1.1"
+        if server_class is HTTPServer:
+            server_class = ThreadingHTTPServer
+    if watch:
+        # the watcher rebuilds from the project root, so serve the output
+        # directory through the handler instead of changing directories
+        handler_class.livereload = LiveReload()
+        start_watcher(handler_class.livereload, poll_interval, workers)
+        handler_class = functools.partial(handler_class, directory=directory)
+    elif directory:  # Change the current working directory if directory is specified
         os.chdir(directory)
     server_address = ("", port)
     httpd = server_class(server_address, handler_class)
@@ -30,11 +368,6 @@ def run(
 
 
 if __name__ == "__main__":
-    parser = argparse.ArgumentParser(description="HTTP Server with CORS")
-    parser.add_argument(
-        "--dir", type=str, help="Directory to serve files from", default="."
-    )
-    parser.add_argument("--port", type=int, help="Port to serve HTTP on", default=8888)
-    args = parser.parse_args()
-
-    run(port=args.port, directory=args.dir)
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+    from cli import main as cli_main
+    cli_main(["serve", *sys.argv[1:]])
@@ -0,0 +1,10 @@
+import os
+import sys
+
+# `python -m src` puts the project root on sys.path; the modules import each
+# other as top-level names, as they do when run as scripts
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from cli import main
+
+main()
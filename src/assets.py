@@ -0,0 +1,96 @@
+import os
+import shutil
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+
+def scan_tree(source_dir):
+    files = []
+    stack = [source_dir]
+    while stack:
+        dir_path = stack.pop()
+        with os.scandir(dir_path) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    stack.append(entry.path)
+                elif entry.is_file():
+                    files.append((entry.path, entry.stat()))
+                else:
+                    logging.warning(f"Ignoring item: {entry.path}")
+    files.sort()
+    return files
+
+
+def is_same_file(source_stat, dest_path):
+    try:
+        dest_stat = os.stat(dest_path)
+    except FileNotFoundError:
+        return False
+    return (
+        dest_stat.st_size == source_stat.st_size
+        and dest_stat.st_mtime_ns == source_stat.st_mtime_ns
+    )
+
+
+def _copy_contents(source_path, dest_path):
+    with open(source_path, "rb") as source, open(dest_path, "wb") as dest:
+        size = os.fstat(source.fileno()).st_size
+        try:
+            # copy_file_range lets the kernel share extents (reflink) on
+            # filesystems that support it and avoids user-space buffers
+            copied = 0
+            while copied < size:
+                sent = os.copy_file_range(source.fileno(), dest.fileno(), size - copied)
+                if sent == 0:
+                    break
+                copied += sent
+        except (AttributeError, OSError):
+            source.seek(0)
+            dest.seek(0)
+            dest.truncate()
+            shutil.copyfileobj(source, dest, 1 << 20)
+
+
+def copy_asset(source_path, dest_path, link=False):
+    os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+    tmp_path = dest_path + ".tmp"
+    if link:
+        try:
+            os.link(source_path, tmp_path)
+            os.replace(tmp_path, dest_path)
+            return
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+    # writing to a temporary name and renaming never touches a file that may
+    # be hardlinked back to the source tree
+    _copy_contents(source_path, tmp_path)
+    shutil.copystat(source_path, tmp_path)
+    os.replace(tmp_path, dest_path)
+
+
+def sync_directory(source_dir, dest_dir, manifest=None, workers=None, link=False):
+    if not os.path.exists(source_dir):
+        logging.error(f"Source directory '{source_dir}' does not exist.")
+        return []
+
+    jobs = []
+    for source_path, stat in scan_tree(source_dir):
+        dest_path = os.path.join(dest_dir, os.path.relpath(source_path, source_dir))
+        if manifest is not None:
+            if manifest.is_fresh(dest_path, [source_path]):
+                continue
+        elif is_same_file(stat, dest_path):
+            continue
+        jobs.append((source_path, dest_path))
+
+    if jobs:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for _ in executor.map(lambda job: copy_asset(*job, link=link), jobs):
+                pass
+
+    for source_path, dest_path in jobs:
+        if manifest is not None:
+            manifest.record(dest_path, [source_path])
+        logging.info(f"Copied file: {source_path} -> {dest_path}")
+    return [dest_path for _, dest_path in jobs]
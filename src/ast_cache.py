@@ -0,0 +1,126 @@
+import os
+import marshal
+import hashlib
+
+from htmlnode import LeafNode, ParentNode
+from manifest import generator_hash
+
+# bump when the serialized layout below changes
+AST_FORMAT = 3
+LEAF = 0
+PARENT = 1
+
+
+def dump_node(node):
+    if isinstance(node, ParentNode):
+        return (PARENT, node.tag, [dump_node(child) for child in node.children], node.props)
+    return (LEAF, node.tag, node.value, node.props)
+
+
+def load_node(data):
+    kind, tag, payload, props = data
+    if kind == PARENT:
+        node = ParentNode(tag, [load_node(child) for child in payload])
+        node.props = props
+        return node
+    return LeafNode(tag, payload, props)
+
+
+def dumps(variables, nodes, record):
+    return marshal.dumps((AST_FORMAT, variables, [dump_node(node) for node in nodes], record))
+
+
+def loads(data):
+    version, variables, nodes, record = marshal.loads(data)
+    if version != AST_FORMAT:
+        raise ValueError("Unsupported AST cache format")
+    return variables, [load_node(node) for node in nodes], record
+
+
+class AstCache:
+    def __init__(self, path, salt=None):
+        self.path = path
+        # the parser version is the generator code itself: any change to it
+        # invalidates every cached tree, a template change invalidates none
+        self.generator = salt if salt is not None else generator_hash()
+        self.salt = f"{AST_FORMAT}:{self.generator}".encode("ascii")
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(path, exist_ok=True)
+
+    def key(self, from_path):
+        digest = hashlib.blake2b(digest_size=16, key=self.salt[:64])
+        with open(from_path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 16), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def entry_path(self, key):
+        return os.path.join(self.path, key[:2], key[2:] + ".ast")
+
+    def get(self, key):
+        try:
+            with open(self.entry_path(key), "rb") as f:
+                entry = loads(f.read())
+        except (FileNotFoundError, EOFError, ValueError, TypeError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry
+
+    def put(self, key, variables, nodes, record):
+        path = self.entry_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(dumps(variables, nodes, record))
+        os.replace(tmp_path, path)
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses}
+
+    def add_stats(self, stats):
+        self.hits += stats["hits"]
+        self.misses += stats["misses"]
+
+    def config(self):
+        return (self.path, self.generator)
+
+
+class MemoryAstCache:
+    # For a long-lived build process. Trees are kept serialized, so render
+    # hooks that annotate nodes never see a previous build's changes.
+    def __init__(self):
+        self.entries = {}  # source path -> (content digest, serialized tree)
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, from_path):
+        with open(from_path, "rb") as f:
+            return from_path, hashlib.blake2b(f.read(), digest_size=16).digest()
+
+    def get(self, key):
+        from_path, digest = key
+        entry = self.entries.get(from_path)
+        if entry is None or entry[0] != digest:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return loads(entry[1])
+
+    def put(self, key, variables, nodes, record):
+        from_path, digest = key
+        self.entries[from_path] = (digest, dumps(variables, nodes, record))
+
+    def prune(self):
+        self.entries = {path: entry for path, entry in self.entries.items() if os.path.exists(path)}
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses}
+
+    def add_stats(self, stats):
+        self.hits += stats["hits"]
+        self.misses += stats["misses"]
+
+    def config(self):
+        return ()
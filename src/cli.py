@@ -0,0 +1,220 @@
+import os
+import sys
+import argparse
+
+# Only argparse is imported up front: each subcommand imports its subsystem
+# when it runs, so `build --help` or `serve` never pay for the other's code.
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(SRC_DIR)
+BENCH_DIR = os.path.join(ROOT_DIR, "bench")
+
+
+def image_widths(value):
+    return [int(width) for width in value.split(",") if width]
+
+
+def shard(value):
+    from shards import parse_shard
+    return parse_shard(value)
+
+
+def add_build_arguments(parser):
+    parser.add_argument(
+        "--clean", action="store_true", help="Delete the output directory and rebuild everything"
+    )
+    parser.add_argument(
+        "--workers", type=int, help="Number of page rendering processes (default: CPU count)"
+    )
+    parser.add_argument(
+        "--precompress", action="store_true", help="Write .gz (and .br when brotli is installed) next to text assets"
+    )
+    parser.add_argument(
+        "--link-assets", action="store_true", help="Hardlink static files into the output instead of copying"
+    )
+    parser.add_argument(
+        "--profile", metavar="PREFIX", nargs="?", const="build-profile",
+        help="Profile each build phase and write PREFIX.json and PREFIX.trace.json (Chrome trace)",
+    )
+    parser.add_argument(
+        "--profile-top", type=int, default=10, help="Number of slowest pages to highlight"
+    )
+    parser.add_argument(
+        "--render-cache", action="store_true", help="Reuse rendered HTML for repeated blocks"
+    )
+    parser.add_argument(
+        "--render-cache-dir", help="Persist the render cache in this directory between builds"
+    )
+    parser.add_argument(
+        "--render-cache-size", type=int, default=4096, help="Blocks kept in each in-memory render cache"
+    )
+    parser.add_argument(
+        "--ast-cache", metavar="DIR", help="Cache parsed page trees in DIR so template-only changes skip parsing"
+    )
+    parser.add_argument(
+        "--image-widths", metavar="W,W,...", type=image_widths,
+        default=[], help="Write downscaled PNG/JPEG variants at these widths and list them in srcset (needs Pillow)",
+    )
+    parser.add_argument(
+        "--fingerprint", action="store_true",
+        help="Write content-hashed copies of static files and point pages at them",
+    )
+    parser.add_argument(
+        "--shard", metavar="I/N", type=shard,
+        help="Render only shard I of N (pages partitioned by path hash) into shards/I-of-N/",
+    )
+    parser.add_argument(
+        "--merge", metavar="N", type=int, help="Merge the outputs of N shard builds into public/ and exit"
+    )
+    parser.add_argument(
+        "--site-url", default="", help="Prefix for the absolute URLs written to sitemap.xml"
+    )
+
+
+def add_serve_arguments(parser, watch_flag=True):
+    parser.add_argument(
+        "--dir", type=str, help="Directory to serve files from", default="."
+    )
+    parser.add_argument("--port", type=int, help="Port to serve HTTP on", default=8888)
+    parser.add_argument(
+        "--threaded", action="store_true", help="Serve each connection on its own thread"
+    )
+    if watch_flag:
+        parser.add_argument(
+            "--watch", action="store_true",
+            help="Rebuild on changes to content/, static/ and template.html and live-reload browsers",
+        )
+    parser.add_argument(
+        "--poll-interval", type=float, default=0.025, help="Seconds between file system polls in watch mode"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=1, help="Page rendering processes used by watch rebuilds"
+    )
+
+
+def run_build(args):
+    import logging
+    logging.basicConfig(level=logging.INFO)
+    if args.merge:
+        from main import CONTENT_DIR, PUBLIC_DIR, SEARCH_DIR, STATIC_DIR
+        from shards import merge_shards
+        merge_shards(
+            args.merge, PUBLIC_DIR, CONTENT_DIR, STATIC_DIR, os.path.join(PUBLIC_DIR, SEARCH_DIR), args.site_url
+        )
+        return
+
+    from main import main as build
+    build(
+        clean=args.clean,
+        workers=args.workers,
+        precompress=args.precompress,
+        link_assets=args.link_assets,
+        profile=args.profile,
+        profile_top=args.profile_top,
+        render_cache=args.render_cache,
+        render_cache_dir=args.render_cache_dir,
+        render_cache_size=args.render_cache_size,
+        ast_cache_dir=args.ast_cache,
+        image_widths=args.image_widths,
+        fingerprint=args.fingerprint,
+        shard=args.shard,
+        site_url=args.site_url,
+    )
+
+
+def run_serve(args):
+    if ROOT_DIR not in sys.path:
+        sys.path.insert(0, ROOT_DIR)
+    import server
+    server.run(
+        port=args.port,
+        directory=args.dir,
+        watch=args.watch,
+        poll_interval=args.poll_interval,
+        workers=args.workers,
+        threaded=args.threaded,
+    )
+
+
+def run_bench(args):
+    if BENCH_DIR not in sys.path:
+        sys.path.insert(0, BENCH_DIR)
+    import run
+    run.main(args.extra)
+
+
+def run_daemon(args):
+    import logging
+    from daemon import serve
+    logging.basicConfig(level=logging.INFO)
+    serve(args.socket, args.site_url)
+
+
+def run_client(args):
+    from daemon import request
+    message = {"command": args.action}
+    if args.paths:
+        # the daemon resolves paths against its own working directory
+        message["paths"] = [os.path.abspath(path) for path in args.paths]
+    try:
+        response = request(message, args.socket)
+    except (FileNotFoundError, ConnectionRefusedError):
+        sys.exit(f"No build daemon is listening on {args.socket}; start one with `python -m src daemon`.")
+    sys.stdout.write(response.get("output", ""))
+    if not response["ok"]:
+        sys.exit(response["error"])
+    if "seconds" in response:
+        print(f"Rebuilt {len(response['rebuilt'])} file(s) in {response['seconds'] * 1000:.1f} ms.")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m src", description="Static site generator")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build = commands.add_parser("build", help="Render content/ and static/ into public/")
+    add_build_arguments(build)
+    build.set_defaults(handler=run_build)
+
+    serve = commands.add_parser("serve", help="Serve a directory over HTTP with CORS")
+    add_serve_arguments(serve)
+    serve.set_defaults(handler=run_serve)
+
+    watch = commands.add_parser("watch", help="Build, then serve public/ and rebuild on changes")
+    add_serve_arguments(watch, watch_flag=False)
+    watch.set_defaults(handler=run_serve, watch=True, dir="public")
+
+    daemon = commands.add_parser(
+        "daemon", help="Build once, then keep build state in memory and rebuild on client requests"
+    )
+    daemon.add_argument("--socket", default=".build-daemon.sock", help="Unix socket to listen on")
+    daemon.add_argument(
+        "--site-url", default="", help="Prefix for the absolute URLs written to sitemap.xml"
+    )
+    daemon.set_defaults(handler=run_daemon)
+
+    client = commands.add_parser("client", help="Send a request to a running build daemon")
+    client.add_argument("action", choices=["build", "stop"])
+    client.add_argument(
+        "paths", nargs="*", help="Changed files to rebuild (default: an incremental build of the whole site)"
+    )
+    client.add_argument("--socket", default=".build-daemon.sock", help="Unix socket of the daemon")
+    client.set_defaults(handler=run_client)
+
+    bench = commands.add_parser(
+        "bench", help="Run the benchmark suite (arguments are passed to bench/run.py)", add_help=False
+    )
+    bench.set_defaults(handler=run_bench)
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    # bench forwards everything it does not know, --help included, to
+    # bench/run.py; every other command is strict
+    args, args.extra = parser.parse_known_args(argv)
+    if args.extra and args.command != "bench":
+        parser.error(f"unrecognized arguments: {' '.join(args.extra)}")
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
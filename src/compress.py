@@ -0,0 +1,92 @@
+import os
+import gzip
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+TEXT_EXTENSIONS = (".html", ".css", ".js", ".mjs", ".json", ".xml", ".svg", ".txt", ".map")
+MIN_SIZE = 1024
+
+
+def gzip_compress(data):
+    # mtime=0 keeps the output byte-for-byte reproducible across builds
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def compressors():
+    variants = [(".gz", gzip_compress)]
+    if brotli is not None:
+        variants.append((".br", lambda data: brotli.compress(data, quality=11)))
+    return variants
+
+
+def is_up_to_date(path, compressed_path):
+    try:
+        return os.stat(compressed_path).st_mtime_ns >= os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return False
+
+
+def compress_file(path, min_size=MIN_SIZE):
+    size = os.stat(path).st_size
+    written = 0
+    best = size
+    data = None
+    for extension, compress in compressors():
+        compressed_path = path + extension
+        if size < min_size:
+            if os.path.exists(compressed_path):
+                os.remove(compressed_path)
+            continue
+        if is_up_to_date(path, compressed_path):
+            best = min(best, os.stat(compressed_path).st_size)
+            continue
+        if data is None:
+            with open(path, "rb") as f:
+                data = f.read()
+        compressed = compress(data)
+        if len(compressed) >= size:
+            if os.path.exists(compressed_path):
+                os.remove(compressed_path)
+            continue
+        tmp_path = compressed_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(compressed)
+        os.replace(tmp_path, compressed_path)
+        written += 1
+        best = min(best, len(compressed))
+    return written, size - best
+
+
+def find_compressible_files(dest_dir):
+    paths = []
+    for dirpath, _, filenames in os.walk(dest_dir):
+        for name in filenames:
+            path = os.path.join(dirpath, name)
+            if name.endswith(TEXT_EXTENSIONS):
+                paths.append(path)
+            elif (
+                # only siblings of text assets are this stage's output;
+                # downloads like data.tar.gz are left alone
+                name.endswith((".gz", ".br"))
+                and name[:-3].endswith(TEXT_EXTENSIONS)
+                and not os.path.exists(path[:-3])
+            ):
+                os.remove(path)
+                logging.info(f"Removed orphaned compressed file: {path}")
+    return sorted(paths)
+
+
+def precompress(dest_dir, workers=None, min_size=MIN_SIZE):
+    paths = find_compressible_files(dest_dir)
+    # zlib and brotli release the GIL, so threads compress in parallel
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(lambda path: compress_file(path, min_size), paths))
+    written = sum(result[0] for result in results)
+    saved = sum(result[1] for result in results)
+    print(f"Precompressed {written} file(s); {saved} bytes saved across {len(paths)} text asset(s).")
+    return written, saved
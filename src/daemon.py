@@ -0,0 +1,180 @@
+import io
+import os
+import json
+import time
+import socket
+import logging
+import contextlib
+
+# Only the client half is imported by `python -m src client`, so the
+# generator modules load inside BuildDaemon, never at module level.
+SOCKET_PATH = ".build-daemon.sock"
+# state is written to disk once requests stop arriving for this long
+IDLE_SAVE_SECONDS = 1.0
+
+
+class BuildDaemon:
+    # Holds everything a cold build would reload: imported modules, parsed
+    # templates (template.load_template memoizes by mtime), page trees, the
+    # file-state manifest and the link and search indexes.
+    def __init__(self, site_url=""):
+        import main as generator
+        from ast_cache import MemoryAstCache
+        from images import ImagePipeline
+        from links import LinkIndex
+        from manifest import BuildManifest, GENERATOR_DIR
+        from search import SearchIndex
+
+        self.generator = generator
+        self.generator_dir = GENERATOR_DIR
+        self.site_url = site_url
+        self.manifest = BuildManifest(generator.MANIFEST_PATH).load()
+        self.link_index = LinkIndex(generator.LINK_INDEX_PATH).load()
+        self.search_index = SearchIndex(generator.SEARCH_INDEX_PATH).load()
+        self.caches = {
+            "ast_cache": MemoryAstCache(),
+            "images": ImagePipeline(generator.STATIC_DIR, generator.CONTENT_DIR, (), generator.IMAGE_CACHE_DIR),
+        }
+        self.code = self.code_state()
+        self.unsaved = False
+
+    def code_state(self):
+        from watch import snapshot
+        return {
+            path: state for path, state in snapshot([self.generator_dir]).items()
+            if path.endswith(".py") and not os.path.basename(path).startswith("test_")
+        }
+
+    def build(self):
+        generator = self.generator
+        # pruning removes outputs this build did not visit, so forget what
+        # earlier builds visited
+        self.manifest.seen.clear()
+        generator.copy_directory_contents(generator.STATIC_DIR, generator.PUBLIC_DIR, self.manifest)
+        # pages render in this process: worker processes would start cold
+        records = generator.generate_pages_recursive(
+            generator.CONTENT_DIR, generator.TEMPLATE_PATH, generator.PUBLIC_DIR, self.manifest, 1, None,
+            self.caches, self.link_index, self.search_index,
+        )
+        self.manifest.prune()
+        self.caches["ast_cache"].prune()
+        self.publish()
+        return [
+            generator.page_dest_path(path, generator.CONTENT_DIR, generator.PUBLIC_DIR) for path in records
+        ]
+
+    def build_paths(self, paths):
+        rebuilt = self.generator.build_changed(
+            [os.path.relpath(path) for path in paths], self.manifest, 1,
+            self.caches, self.link_index, self.search_index,
+        )
+        self.publish()
+        return rebuilt
+
+    def publish(self):
+        for index in (self.link_index, self.search_index):
+            index.prune()
+        self.generator.publish_indexes(
+            self.link_index, self.search_index, self.generator.PUBLIC_DIR, self.site_url
+        )
+        self.unsaved = True
+
+    def save(self):
+        # saved together, or a crash could leave a page the manifest calls
+        # fresh missing from the saved indexes
+        if not self.unsaved:
+            return
+        self.manifest.save()
+        self.link_index.save()
+        self.search_index.save()
+        self.unsaved = False
+
+    def handle(self, request):
+        command = request.get("command")
+        if command == "stop":
+            return {"ok": True, "stop": True}
+        if command != "build":
+            return {"ok": False, "error": f"Unknown command: {command!r}"}
+        if self.code_state() != self.code:
+            # the modules in memory no longer match the source on disk
+            return {"ok": False, "stop": True, "error": "Generator code changed; restart the daemon."}
+
+        output = io.StringIO()
+        start = time.perf_counter()
+        try:
+            with contextlib.redirect_stdout(output):
+                paths = request.get("paths")
+                rebuilt = self.build_paths(paths) if paths else self.build()
+        except Exception as e:
+            logging.exception("Build failed")
+            return {"ok": False, "error": f"{type(e).__name__}: {e}", "output": output.getvalue()}
+        return {
+            "ok": True,
+            "rebuilt": rebuilt,
+            "seconds": time.perf_counter() - start,
+            "output": output.getvalue(),
+        }
+
+
+def is_listening(socket_path):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        try:
+            client.connect(socket_path)
+        except (FileNotFoundError, ConnectionRefusedError):
+            return False
+    return True
+
+
+def serve(socket_path=SOCKET_PATH, site_url=""):
+    if os.path.exists(socket_path):
+        if is_listening(socket_path):
+            raise RuntimeError(f"A build daemon is already listening on {socket_path}")
+        # left behind by a daemon that did not shut down cleanly
+        os.remove(socket_path)
+
+    daemon = BuildDaemon(site_url)
+    daemon.build()
+    tmp_path = socket_path + ".tmp"
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        # clients wait for the socket file, so it only appears once listening
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        server.bind(tmp_path)
+        server.listen()
+        os.replace(tmp_path, socket_path)
+        print(f"Build daemon listening on {socket_path}", flush=True)
+        server.settimeout(IDLE_SAVE_SECONDS)
+        # one request at a time: builds share the manifest and indexes
+        while True:
+            try:
+                connection, _ = server.accept()
+            except socket.timeout:
+                daemon.save()
+                continue
+            with connection, connection.makefile("rb") as f:
+                line = f.readline()
+                if not line:
+                    # a liveness probe from is_listening()
+                    continue
+                try:
+                    response = daemon.handle(json.loads(line))
+                except ValueError:
+                    response = {"ok": False, "error": "Malformed request"}
+                connection.sendall(json.dumps(response).encode("utf-8") + b"\n")
+            if response.get("stop"):
+                break
+    finally:
+        server.close()
+        for path in (socket_path, tmp_path):
+            if os.path.exists(path):
+                os.remove(path)
+        daemon.save()
+
+
+def request(message, socket_path=SOCKET_PATH):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(socket_path)
+        client.sendall(json.dumps(message).encode("utf-8") + b"\n")
+        with client.makefile("rb") as f:
+            return json.loads(f.readline())
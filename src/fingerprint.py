@@ -0,0 +1,96 @@
+import os
+import re
+import copy
+import json
+import logging
+import posixpath
+
+from assets import copy_asset, scan_tree
+from manifest import write_if_changed
+
+ASSET_MANIFEST_NAME = "asset-manifest.json"
+FINGERPRINT_LENGTH = 8
+URL_ATTRIBUTE_PATTERN = re.compile(r"""\b(href|src)=(["'])([^"']*)\2""")
+URL_PROPS = ("href", "src")
+
+
+def fingerprinted_path(path, digest):
+    stem, extension = posixpath.splitext(path)
+    return f"{stem}.{digest[:FINGERPRINT_LENGTH]}{extension}"
+
+
+def fingerprint_directory(source_dir, dest_dir, manifest, link=False):
+    # every static file gets a content-addressed twin next to its plain copy;
+    # the build manifest prunes twins whose content has since changed
+    urls = {}
+    copied = 0
+    os.makedirs(dest_dir, exist_ok=True)
+    files = scan_tree(source_dir) if os.path.isdir(source_dir) else []
+    for source_path, _ in files:
+        relative_path = os.path.relpath(source_path, source_dir).replace(os.sep, "/")
+        fingerprinted = fingerprinted_path(relative_path, manifest.file_hash(source_path))
+        urls["/" + relative_path] = "/" + fingerprinted
+        dest_path = os.path.join(dest_dir, *fingerprinted.split("/"))
+        if manifest.is_fresh(dest_path, [source_path]):
+            continue
+        copy_asset(source_path, dest_path, link)
+        manifest.record(dest_path, [source_path])
+        copied += 1
+    path = os.path.join(dest_dir, ASSET_MANIFEST_NAME)
+    data = json.dumps(urls, indent=2, sort_keys=True).encode("utf-8")
+    write_if_changed(path, data)
+    manifest.record(path, [])
+    logging.info(f"Fingerprinted {len(urls)} asset(s), {copied} new.")
+    return AssetManifest(path, urls)
+
+
+class AssetManifest:
+    def __init__(self, path, urls=None):
+        self.path = path
+        if urls is None:
+            with open(path, "r", encoding="utf-8") as f:
+                urls = json.load(f)
+        self.urls = urls
+        self.templates = {}
+
+    def rewrite_url(self, url):
+        path, separator, rest = url.partition("#")
+        path, query, search = path.partition("?")
+        fingerprinted = self.urls.get(path)
+        if fingerprinted is None:
+            return url
+        return fingerprinted + query + search + separator + rest
+
+    def rewrite_html(self, html):
+        return URL_ATTRIBUTE_PATTERN.sub(
+            lambda match: f"{match[1]}={match[2]}{self.rewrite_url(match[3])}{match[2]}", html
+        )
+
+    def template(self, template):
+        rewritten = self.templates.get(template)
+        if rewritten is None:
+            rewritten = copy.copy(template)
+            rewritten.segments = [
+                self.rewrite_html(segment) if i % 2 == 0 else segment
+                for i, segment in enumerate(template.segments)
+            ]
+            self.templates = {template: rewritten}
+        return rewritten
+
+    def annotate(self, node):
+        if node.props:
+            for name in URL_PROPS:
+                if name in node.props:
+                    node.props[name] = self.rewrite_url(node.props[name])
+        if node.children:
+            for child in node.children:
+                self.annotate(child)
+
+    def stats(self):
+        return {}
+
+    def add_stats(self, stats):
+        pass
+
+    def config(self):
+        return (self.path,)
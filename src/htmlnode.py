@@ -1,5 +1,9 @@
 from enum import Enum
 
+# textnode imports this module back; plain module imports keep either
+# import order working
+import textnode
+
 class BlockTypes(Enum):
     PARAGRAPH = "paragraph"
     HEADING = "heading"
@@ -9,7 +13,29 @@ class BlockTypes(Enum):
     OL = "ordered_list"
 
 
+VOID_TAGS = frozenset(("img",))
+
+
+def escape_text(text):
+    # most text has nothing to escape; three substring scans are far cheaper
+    # than building a new string
+    if "&" in text or "<" in text or ">" in text:
+        return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+    return text
+
+
+def escape_attribute(value):
+    if "&" in value or "<" in value or ">" in value or '"' in value:
+        return (
+            value.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+            .replace('"', "&quot;")
+        )
+    return value
+
+
 class HTMLNode:
+    __slots__ = ("tag", "value", "children", "props")
+
     def __init__(self, tag=None, value=None, children=None, props=None):
         self.tag = tag
         self.value = value
@@ -18,30 +44,48 @@ class HTMLNode:
 
     def to_html(self):
         raise NotImplementedError
+
+    def iter_html(self):
+        yield self.to_html()
+
+    def write_html(self, stream):
+        for chunk in self.iter_html():
+            stream.write(chunk)
     
     def props_to_html(self):
-        props_html = ""
-        if self.props:
-            for key, value in self.props.items():
-                props_html += " " + key + f'="{value}"'
-        
-        return props_html
+        props = self.props
+        if not props:
+            return ""
+        values = [str(value) for value in props.values()]
+        # one presence check over the joined values covers the whole node;
+        # only when it finds something are the values escaped one by one
+        joined = "".join(values)
+        if "&" in joined or "<" in joined or ">" in joined or '"' in joined:
+            values = [escape_attribute(value) for value in values]
+        return "".join(f' {key}="{value}"' for key, value in zip(props, values))
     
     def __repr__(self):
         return f"HTMLNode({self.tag}, {self.value}, {self.children}, {self.props})"
     
 
 class LeafNode(HTMLNode):
+    __slots__ = ()
+
     def __init__(self, tag, value, props=None):
-        super().__init__(tag, value, None, props)
+        self.tag = tag
+        self.value = value
+        self.children = None
+        self.props = props
 
     def to_html(self):
+        if self.tag in VOID_TAGS:
+            return f"<{self.tag}{self.props_to_html()}>"
         if not self.value:
             raise ValueError
         if not self.tag:
-            return self.value
+            return escape_text(self.value)
         return (
-            f"<{self.tag}{self.props_to_html()}>{self.value}</{self.tag}>"
+            f"<{self.tag}{self.props_to_html()}>{escape_text(self.value)}</{self.tag}>"
         )
     
     def __repr__(self):
@@ -49,81 +93,166 @@ class LeafNode(HTMLNode):
 
 
 class ParentNode(HTMLNode):
+    __slots__ = ()
+
     def __init__(self, tag, children):
-        super().__init__(tag, None, children, None)
+        self.tag = tag
+        self.value = None
+        self.children = children
+        self.props = None
 
     def to_html(self):
+        return "".join(self.iter_html())
+
+    def iter_html(self):
         if not self.tag:
             raise ValueError("No required tag was provided")
         if not self.children:
             raise ValueError("No required children provided")
-        
-        children_html = ""
-        for child in self.children:
-            children_html += child.to_html()
 
-        return (
-            f"<{self.tag}{self.props_to_html()}>{children_html}</{self.tag}>"
-        )
+        yield f"<{self.tag}{self.props_to_html()}>"
+        for child in self.children:
+            if isinstance(child, ParentNode):
+                yield from child.iter_html()
+            else:
+                yield child.to_html()
+        yield f"</{self.tag}>"
     
+def iter_markdown_blocks(lines):
+    block_lines = []
+    in_code = False
+    for line in lines:
+        line = line.rstrip("\n")
+        if in_code:
+            block_lines.append(line)
+            if line.lstrip().startswith("```"):
+                in_code = False
+            continue
+        if not line.strip():
+            if block_lines:
+                yield "\n".join(block_lines).strip()
+                block_lines = []
+            continue
+        if not block_lines:
+            fence = line.strip()
+            # a fenced block keeps its blank lines until the closing fence
+            in_code = fence.startswith("```") and not (len(fence) > 3 and fence.endswith("```"))
+        block_lines.append(line)
+    if block_lines:
+        yield "\n".join(block_lines).strip()
+
 def markdown_to_blocks(markdown):
-    blocks = []
-    parts = markdown.split("\n\n")
-    for part in parts:
-        if len(part) > 0:
-            blocks.append(part.strip())
-    return blocks
+    return list(iter_markdown_blocks(markdown.split("\n")))
 
-def block_to_block_type(block):
+class Block:
+    __slots__ = ("block_type", "lines", "items")
+
+    def __init__(self, block_type, lines, items):
+        self.block_type = block_type
+        self.lines = lines
+        # parsed markers: (level, text) per heading line, item bodies for
+        # lists and quotes, the code body, or the paragraph text
+        self.items = items
+
+    def __repr__(self):
+        return f"Block({self.block_type}, {self.items})"
+
+
+def classify_block(block):
+    lines = block.split("\n")
     if block.startswith("#") and block.lstrip("#").startswith(" "):
-        return BlockTypes.HEADING
+        headings = []
+        for line in lines:
+            stripped = line.lstrip("#")
+            headings.append((min(len(line) - len(stripped), 6), stripped.strip()))
+        return Block(BlockTypes.HEADING, lines, headings)
     if block.startswith("```") and block.endswith("```"):
-        return BlockTypes.CODE
-    lines = block.split("\n")
-    if all(line.startswith(">") for line in lines):
-        return BlockTypes.QUOTE
-    if all(line.startswith(f"{i + 1}.") for i, line in enumerate(lines)):
-        return BlockTypes.OL
-    if all(line.startswith("*") or line.startswith("-") for line in lines):
-        return BlockTypes.UL
-    return BlockTypes.PARAGRAPH
+        return Block(BlockTypes.CODE, lines, "\n".join(lines[1:-1]))
 
-def markdown_to_html_node(markdown):
-    blocks = markdown_to_blocks(markdown)
-    div_node = ParentNode("div", [])  # Initialize div_node with empty children list
-    for block in blocks:
-        if block_to_block_type(block) == BlockTypes.HEADING:
-            for line in block.split("\n"):
-                level = line.count("#")
-                tag = f"h{level if level < 7 else 6}"
-                value = line.lstrip("#").strip()
-                div_node.children.append(LeafNode(tag, value))
-        elif block_to_block_type(block) == BlockTypes.CODE:
-            value = "\n".join(block.split("\n")[1:-1])
-            code_node = ParentNode("code", [LeafNode("", value)])  # Create code_node
-            div_node.children.append(ParentNode("pre", [code_node]))  # Append code_node to pre tag
-        elif block_to_block_type(block) == BlockTypes.QUOTE:
-            lines = block.split("\n")
-            inner_children = [LeafNode("p", line.lstrip("> ").strip()) for line in lines]
-            div_node.children.append(ParentNode("blockquote", inner_children))
-        elif block_to_block_type(block) == BlockTypes.UL:
-            lines = block.split("\n")
-            items = [line.lstrip("*- ").strip() for line in lines if line.strip()]
-            inner_children = [LeafNode("li", item) for item in items]
-            div_node.children.append(ParentNode("ul", inner_children))
-        elif block_to_block_type(block) == BlockTypes.OL:
-            lines = block.split("\n")
-            items = [line.split(".", 1)[1].strip() for line in lines if line.strip()]
-            inner_children = [LeafNode("li", item) for item in items]
-            div_node.children.append(ParentNode("ol", inner_children))
-        else:
-            div_node.children.append(LeafNode("p", block.strip()))
-    return div_node
+    # one sweep over the lines keeps every candidate type alive until a line
+    # rules it out; precedence matches quote > ordered > unordered
+    is_quote = is_ol = is_ul = True
+    for i, line in enumerate(lines):
+        if is_quote and not line.startswith(">"):
+            is_quote = False
+        if is_ol and not line.startswith(f"{i + 1}."):
+            is_ol = False
+        if is_ul and not (line.startswith("* ") or line.startswith("- ")):
+            is_ul = False
+        if not (is_quote or is_ol or is_ul):
+            break
+
+    if is_quote:
+        return Block(BlockTypes.QUOTE, lines, [line.lstrip("> ").strip() for line in lines])
+    if is_ol:
+        items = [line.split(".", 1)[1].strip() for line in lines if line.strip()]
+        return Block(BlockTypes.OL, lines, items)
+    if is_ul:
+        # a marker needs its space, so "**Bold** lead" stays a paragraph
+        items = [line[2:].strip() for line in lines if line.strip()]
+        return Block(BlockTypes.UL, lines, items)
+    return Block(BlockTypes.PARAGRAPH, lines, block.strip())
 
+def block_to_block_type(block):
+    return classify_block(block).block_type
 
+def iter_classified_blocks(lines, on_block=None):
+    for block in iter_markdown_blocks(lines):
+        if on_block is not None:
+            on_block(block)
+        yield classify_block(block)
 
+def inline_to_html_node(tag, text):
+    # most spans carry no markup at all; they skip tokenizing and keep the
+    # single-leaf shape of plain text
+    if "*" not in text and "`" not in text and "[" not in text:
+        return LeafNode(tag, text)
+    return ParentNode(tag, textnode.text_to_html_nodes(text))
 
+def block_to_html_nodes(block):
+    block_type = block.block_type
+    if block_type == BlockTypes.HEADING:
+        return [inline_to_html_node(f"h{level}", text) for level, text in block.items]
+    if block_type == BlockTypes.CODE:
+        code_node = ParentNode("code", [LeafNode("", block.items)])  # Create code_node
+        return [ParentNode("pre", [code_node])]  # Append code_node to pre tag
+    if block_type == BlockTypes.QUOTE:
+        inner_children = [inline_to_html_node("p", item) for item in block.items]
+        return [ParentNode("blockquote", inner_children)]
+    if block_type == BlockTypes.UL:
+        return [ParentNode("ul", [inline_to_html_node("li", item) for item in block.items])]
+    if block_type == BlockTypes.OL:
+        return [ParentNode("ol", [inline_to_html_node("li", item) for item in block.items])]
+    return [inline_to_html_node("p", block.items)]
 
+def iter_block_nodes(lines, on_block=None):
+    for block in iter_classified_blocks(lines, on_block):
+        yield from block_to_html_nodes(block)
 
-    
-        
\ No newline at end of file
+def render_block_html(block):
+    nodes = block_to_html_nodes(classify_block(block))
+    return "".join(node.to_html() for node in nodes)
+
+def iter_markdown_html(lines, cache=None, on_block=None, on_node=None):
+    yield "<div>"
+    if cache is None:
+        for node in iter_block_nodes(lines, on_block):
+            if on_node is not None:
+                on_node(node)
+            yield from node.iter_html()
+    else:
+        for block in iter_markdown_blocks(lines):
+            if on_block is not None:
+                on_block(block)
+            if on_node is not None and "](" in block:
+                # link and image props depend on files outside the block
+                # text, so these blocks are never served from the cache
+                for node in block_to_html_nodes(classify_block(block)):
+                    on_node(node)
+                    yield from node.iter_html()
+            else:
+                yield cache.render(block, render_block_html)
+    yield "</div>"
+
+def markdown_to_html_node(markdown):
+    return ParentNode("div", list(iter_block_nodes(markdown.split("\n"))))
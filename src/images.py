@@ -0,0 +1,238 @@
+import os
+import struct
+import filecmp
+import functools
+import logging
+import posixpath
+
+from assets import copy_asset
+from links import page_url, resolve_target
+from manifest import hash_file
+
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".gif")
+RESIZABLE_EXTENSIONS = (".png", ".jpg", ".jpeg")
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+# start-of-frame markers carry the frame size; C4, C8 and CC share the range
+# but are tables, not frames
+JPEG_FRAME_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+JPEG_STANDALONE_MARKERS = frozenset(range(0xD0, 0xDA)) | {0x01}
+
+
+@functools.lru_cache(maxsize=None)
+def pillow():
+    # Pillow is optional and slow to import, so it loads on first use
+    try:
+        from PIL import Image
+    except ImportError:
+        return None
+    return Image
+
+
+def png_size(f):
+    header = f.read(24)
+    if len(header) < 24 or header[:8] != PNG_SIGNATURE or header[12:16] != b"IHDR":
+        return None
+    return struct.unpack(">II", header[16:24])
+
+
+def gif_size(f):
+    header = f.read(10)
+    if len(header) < 10 or header[:6] not in (b"GIF87a", b"GIF89a"):
+        return None
+    return struct.unpack("<HH", header[6:10])
+
+
+def jpeg_size(f):
+    if f.read(2) != b"\xff\xd8":
+        return None
+    while True:
+        byte = f.read(1)
+        while byte and byte != b"\xff":
+            byte = f.read(1)
+        while byte == b"\xff":  # markers may be padded with fill bytes
+            byte = f.read(1)
+        if not byte:
+            return None
+        marker = byte[0]
+        if marker in JPEG_STANDALONE_MARKERS:
+            continue
+        length_bytes = f.read(2)
+        if len(length_bytes) < 2:
+            return None
+        length = struct.unpack(">H", length_bytes)[0]
+        if marker in JPEG_FRAME_MARKERS:
+            frame = f.read(5)
+            if len(frame) < 5:
+                return None
+            height, width = struct.unpack(">xHH", frame)
+            return width, height
+        f.seek(length - 2, os.SEEK_CUR)
+
+
+def image_size(path):
+    # only the header is read; the pixel data is never decoded
+    with open(path, "rb") as f:
+        for reader in (png_size, jpeg_size, gif_size):
+            f.seek(0)
+            size = reader(f)
+            if size is not None:
+                return size
+    return None
+
+
+def variant_path(path, width):
+    stem, extension = posixpath.splitext(path)
+    return f"{stem}-{width}w{extension}"
+
+
+def _resize_image(job):
+    source_path, cache_path, width = job
+    Image = pillow()
+    with Image.open(source_path) as image:
+        height = round(image.height * width / image.width)
+        resized = image.resize((width, height), Image.LANCZOS)
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        resized.save(tmp_path, format=image.format, optimize=True)
+    os.replace(tmp_path, cache_path)
+    return cache_path
+
+
+class ImagePipeline:
+    def __init__(self, static_dir, content_dir, widths=(), cache_dir=None):
+        self.static_dir = static_dir
+        self.content_dir = content_dir
+        self.widths = tuple(sorted(widths))
+        self.cache_dir = cache_dir
+        self.sizes = {}  # static path -> ((mtime_ns, size), (width, height))
+        self.probes = 0
+
+    def dimensions(self, path):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        key = (stat.st_mtime_ns, stat.st_size)
+        cached = self.sizes.get(path)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        self.probes += 1
+        size = image_size(path)
+        self.sizes[path] = (key, size)
+        return size
+
+    def static_path(self, url, from_path):
+        path = resolve_target(url, page_url(from_path, self.content_dir))
+        if path is None:
+            return None
+        return os.path.join(self.static_dir, *path.strip("/").split("/"))
+
+    def image_props(self, url, from_path):
+        static_path = self.static_path(url, from_path)
+        if static_path is None or not static_path.lower().endswith(IMAGE_EXTENSIONS):
+            return {}
+        size = self.dimensions(static_path)
+        if size is None:
+            return {}
+        width, height = size
+        props = {"width": str(width), "height": str(height), "loading": "lazy"}
+        widths = self.variant_widths(static_path, width)
+        if widths:
+            base = url.split("#", 1)[0].split("?", 1)[0]
+            candidates = [f"{variant_path(base, w)} {w}w" for w in widths]
+            props["srcset"] = ", ".join(candidates + [f"{base} {width}w"])
+        return props
+
+    def sources(self, urls, from_path):
+        # the files a page's <img> sizes were read from
+        paths = set()
+        for url in urls:
+            static_path = self.static_path(url, from_path)
+            if static_path is not None and static_path.lower().endswith(IMAGE_EXTENSIONS):
+                paths.add(static_path)
+        return sorted(paths)
+
+    def settings(self):
+        # srcset lists only the widths this build resizes to
+        if not self.widths or pillow() is None:
+            return ""
+        return "image-widths=" + ",".join(str(width) for width in self.widths)
+
+    def variant_widths(self, static_path, width):
+        if not self.widths or not static_path.lower().endswith(RESIZABLE_EXTENSIONS) or pillow() is None:
+            return []
+        return [w for w in self.widths if w < width]
+
+    def annotate(self, node, from_path):
+        if node.tag == "img":
+            props = node.props or {}
+            node.props = dict(props, **self.image_props(props.get("src", ""), from_path))
+        elif node.children:
+            for child in node.children:
+                self.annotate(child, from_path)
+
+    def generate_variants(self, dest_dir, workers=None, manifest=None):
+        if not self.widths:
+            return []
+        if pillow() is None:
+            logging.warning("Pillow is not installed; skipping responsive image variants.")
+            return []
+
+        copies = []
+        jobs = []
+        for dirpath, _, filenames in os.walk(self.static_dir):
+            for name in sorted(filenames):
+                if not name.lower().endswith(RESIZABLE_EXTENSIONS):
+                    continue
+                source_path = os.path.join(dirpath, name)
+                size = self.dimensions(source_path)
+                if size is None:
+                    continue
+                digest = None
+                for width in self.variant_widths(source_path, size[0]):
+                    if digest is None:
+                        digest = hash_file(source_path) if manifest is None else manifest.file_hash(source_path)
+                    dest_path = variant_path(
+                        os.path.join(dest_dir, os.path.relpath(source_path, self.static_dir)), width
+                    )
+                    # the cache is keyed by content, so renamed or touched
+                    # images are never resized again
+                    cache_path = os.path.join(
+                        self.cache_dir, digest[:2], f"{digest[2:]}-{width}w{os.path.splitext(name)[1]}"
+                    )
+                    if not os.path.exists(cache_path):
+                        jobs.append((source_path, cache_path, width))
+                    copies.append((cache_path, dest_path))
+
+        if len(jobs) > 1 and workers != 1:
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                list(executor.map(_resize_image, jobs))
+        else:
+            for job in jobs:
+                _resize_image(job)
+
+        written = []
+        for cache_path, dest_path in copies:
+            # recorded variants are pruned once their source or width goes away
+            if manifest is not None:
+                if manifest.is_fresh(dest_path, [cache_path]):
+                    continue
+            elif os.path.exists(dest_path) and filecmp.cmp(cache_path, dest_path, shallow=False):
+                continue
+            copy_asset(cache_path, dest_path, link=True)
+            if manifest is not None:
+                manifest.record(dest_path, [cache_path])
+            written.append(dest_path)
+        logging.info(f"Resized {len(jobs)} image variant(s), updated {len(written)} in {dest_dir}.")
+        return written
+
+    def stats(self):
+        return {"probes": self.probes}
+
+    def add_stats(self, stats):
+        self.probes += stats["probes"]
+
+    def config(self):
+        return (self.static_dir, self.content_dir, self.widths, self.cache_dir)
@@ -0,0 +1,192 @@
+import os
+import json
+import logging
+import posixpath
+from urllib.parse import urlsplit, unquote
+
+from textnode import extract_markdown_images, extract_markdown_links
+
+LINK_INDEX_VERSION = 2
+# link targets live in one namespace, so a changed file can be matched
+# against the targets each page depends on
+PAGE_TARGET = "content/"
+STATIC_TARGET = "static/"
+
+
+def new_page_record():
+    return {"links": [], "images": []}
+
+
+def collect_links(block, record):
+    if block.startswith("```") or "](" not in block:
+        return
+    record["images"].extend(url for _, url in extract_markdown_images(block))
+    record["links"].extend(url for _, url in extract_markdown_links(block))
+
+
+def page_url(source_path, content_dir):
+    relative_path = os.path.relpath(source_path, content_dir).replace(os.sep, "/")
+    url = "/" + posixpath.splitext(relative_path)[0]
+    if url == "/index" or url.endswith("/index"):
+        url = url[: -len("index")]
+    return url
+
+
+def resolve_target(target, base_url):
+    parts = urlsplit(target.strip())
+    if parts.scheme or parts.netloc or not parts.path:
+        # external URLs, mailto: links and same-page anchors are not checked
+        return None
+    path = unquote(parts.path)
+    if not path.startswith("/"):
+        base_dir = base_url if base_url.endswith("/") else posixpath.dirname(base_url) + "/"
+        path = posixpath.join(base_dir, path)
+    resolved = posixpath.normpath(path)
+    if path.endswith("/") and resolved != "/":
+        resolved += "/"
+    return resolved
+
+
+def target_keys(kind, path):
+    relative_path = path.strip("/")
+    keys = [STATIC_TARGET + relative_path]
+    if kind == "links":
+        keys.extend(PAGE_TARGET + candidate for candidate in page_candidates(path))
+        keys.append(STATIC_TARGET + posixpath.join(relative_path, "index.html"))
+    return keys
+
+
+def page_candidates(path):
+    stripped = path.strip("/")
+    if not stripped:
+        return ["index.md"]
+    if stripped.endswith(".html"):
+        stripped = stripped[: -len(".html")]
+    return [stripped + ".md", posixpath.join(stripped, "index.md")]
+
+
+class LinkIndex:
+    def __init__(self, path):
+        self.path = path
+        # source path -> {"url", "links", "images"}, plus "refs" and "broken"
+        # once checked
+        self.pages = {}
+        self.page_targets = None  # target keys of the last check
+        self.static_targets = None
+        self.site_url = None  # of the last published sitemap
+        self.dirty = set()  # pages to check again
+        self.checked = set()  # pages the last check resolved
+        self.pages_changed = False
+        self.unsaved = False
+        self.unpublished = False
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return self
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            logging.warning(f"Ignoring unreadable link index '{self.path}'.")
+            return self
+        if data.get("version") == LINK_INDEX_VERSION:
+            self.pages = data.get("pages", {})
+            targets = data.get("targets")
+            if targets is not None:
+                self.page_targets = set(targets["pages"])
+                self.static_targets = set(targets["static"])
+            self.site_url = data.get("site_url")
+        return self
+
+    def save(self):
+        if not self.unsaved and os.path.exists(self.path):
+            return
+        targets = None
+        if self.page_targets is not None:
+            targets = {"pages": sorted(self.page_targets), "static": sorted(self.static_targets)}
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            # dumps() runs the C encoder; dump() to a stream does not
+            f.write(json.dumps(
+                {"version": LINK_INDEX_VERSION, "pages": self.pages, "targets": targets, "site_url": self.site_url},
+                separators=(",", ":"), sort_keys=True,
+            ))
+        os.replace(tmp_path, self.path)
+        self.unsaved = False
+
+    def update(self, source_path, url, record):
+        page = {"url": url, "links": record["links"], "images": record["images"]}
+        previous = self.pages.get(source_path)
+        if previous is not None and all(previous[key] == page[key] for key in page):
+            # keeps the previous check result
+            return
+        self.pages[source_path] = page
+        self.dirty.add(source_path)
+        self.pages_changed = self.pages_changed or previous is None
+        self.unsaved = self.unpublished = True
+
+    def prune(self):
+        pages = {path: page for path, page in self.pages.items() if os.path.exists(path)}
+        if len(pages) != len(self.pages):
+            self.pages = pages
+            self.pages_changed = self.unsaved = self.unpublished = True
+
+    def resolve(self, page, targets):
+        refs = set()
+        broken = []
+        for kind in ("links", "images"):
+            for target in page[kind]:
+                path = resolve_target(target, page["url"])
+                if path is None:
+                    continue
+                keys = target_keys(kind, path)
+                refs.update(keys)
+                if targets.isdisjoint(keys):
+                    broken.append([kind[:-1], target])
+        return sorted(refs), broken
+
+    def check(self, content_dir, static_dir):
+        if self.pages_changed or self.page_targets is None:
+            page_targets = {
+                PAGE_TARGET + os.path.relpath(path, content_dir).replace(os.sep, "/") for path in self.pages
+            }
+        else:
+            page_targets = self.page_targets
+        static_targets = set()
+        for dirpath, _, filenames in os.walk(static_dir):
+            for name in filenames:
+                relative_path = os.path.relpath(os.path.join(dirpath, name), static_dir)
+                static_targets.add(STATIC_TARGET + relative_path.replace(os.sep, "/"))
+
+        if self.page_targets is None:
+            changed = None
+        else:
+            changed = (page_targets ^ self.page_targets) | (static_targets ^ self.static_targets)
+        targets = page_targets | static_targets
+        self.checked = set()
+        for source_path, page in self.pages.items():
+            # only pages whose own links changed, or whose targets appeared
+            # or disappeared, are resolved again
+            if (
+                changed is None
+                or source_path in self.dirty
+                or "broken" not in page
+                or (changed and not changed.isdisjoint(page["refs"]))
+            ):
+                page["refs"], page["broken"] = self.resolve(page, targets)
+                self.checked.add(source_path)
+        if self.checked or changed:
+            self.unsaved = True
+        self.page_targets, self.static_targets = page_targets, static_targets
+        self.dirty.clear()
+        self.pages_changed = False
+        return self.broken(self.checked)
+
+    def broken(self, source_paths=None):
+        if source_paths is None:
+            source_paths = self.pages
+        return [
+            (source_path, kind, target)
+            for source_path in sorted(source_paths)
+            for kind, target in self.pages[source_path]["broken"]
+        ]
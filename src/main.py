@@ -1,72 +1,498 @@
+import io
 import os
-import shutil
+import sys
+import time
 import logging
-from htmlnode import markdown_to_html_node 
+from htmlnode import (
+    ParentNode,
+    iter_markdown_html, iter_markdown_blocks, iter_block_nodes, classify_block, block_to_html_nodes
+)
+from manifest import BuildManifest
+from template import load_template
+from assets import copy_asset, sync_directory
+from images import ImagePipeline
+from links import LinkIndex, new_page_record, collect_links, page_url
+from search import SearchIndex, collect_terms
+from sitemap import SITEMAP_NAME, write_sitemap
 
-def copy_directory_contents(source_dir, dest_dir):
-    if not os.path.exists(source_dir):
-        logging.error(f"Source directory '{source_dir}' does not exist.")
-        return
+MANIFEST_PATH = ".build-manifest.json"
+LINK_INDEX_PATH = ".link-index.json"
+SEARCH_INDEX_PATH = ".search-index.json"
+SEARCH_DIR = "search"
+IMAGE_CACHE_DIR = ".image-cache"
+CONTENT_DIR = "content"
+STATIC_DIR = "static"
+TEMPLATE_PATH = "template.html"
+PUBLIC_DIR = "public"
 
-    if not os.path.exists(dest_dir):
-        os.makedirs(dest_dir)
-    
-    for item in os.listdir(source_dir):
-        source_item = os.path.join(source_dir, item)
-        dest_item = os.path.join(dest_dir, item)
-        
-        if os.path.isdir(source_item):
-            copy_directory_contents(source_item, dest_item)
-        elif os.path.isfile(source_item):
-            shutil.copy(source_item, dest_item)
-            logging.info(f"Copied file: {source_item} -> {dest_item}")
-        else:
-            logging.warning(f"Ignoring item: {source_item}")
+def copy_file(source_item, dest_item, manifest=None, link=False):
+    if manifest is not None and manifest.is_fresh(dest_item, [source_item]):
+        return False
+    copy_asset(source_item, dest_item, link)
+    if manifest is not None:
+        manifest.record(dest_item, [source_item])
+    logging.info(f"Copied file: {source_item} -> {dest_item}")
+    return True
+
+def copy_directory_contents(source_dir, dest_dir, manifest=None, workers=None, link=False):
+    return sync_directory(source_dir, dest_dir, manifest, workers, link)
 
 def extract_title(markdown):
-    lines = markdown.split("\n")
+    lines = markdown.split("\n") if isinstance(markdown, str) else markdown
     for line in lines:
         if line.startswith("# "):
             return line.lstrip("# ").strip()
     raise ValueError("No h1 header found in the markdown.")
 
 
-def generate_page(from_path, template_path, dest_path):
-    print(f"Generating page from {from_path} to {dest_path} using {template_path}.")
+def read_front_matter(f):
+    first_line = f.readline()
+    if first_line.strip() != "---":
+        f.seek(0)
+        return {}
+    variables = {}
+    for line in iter(f.readline, ""):
+        if line.strip() == "---":
+            return variables
+        key, separator, value = line.partition(":")
+        if separator:
+            variables[key.strip()] = value.strip()
+    raise ValueError("No closing '---' found for the front matter.")
+
+
+def read_page(f):
+    variables = read_front_matter(f)
+    body_start = f.tell()
+    if "Title" not in variables:
+        variables["Title"] = variables.get("title") or extract_title(f)
+        f.seek(body_start)
+    return variables
+
+
+def collect_page_data(block, record):
+    collect_links(block, record)
+    collect_terms(block, record)
+
+
+def page_sources(from_path, template_path, assets=None):
+    # fingerprinted URLs are baked into the page, so a changed asset
+    # manifest makes every page stale
+    if assets is None:
+        return [from_path, template_path]
+    return [from_path, template_path, assets.path]
+
+
+def page_dependencies(from_path, record, images=None):
+    # image sizes and srcsets are baked into the page, so the files they were
+    # read from and the widths setting are inputs too
+    if images is None:
+        return [], ""
+    return images.sources(record["images"], from_path), images.settings()
+
+
+def page_node_hook(from_path, images=None, assets=None):
+    # images resolve their files from the original URLs, so they go first
+    if images is None and assets is None:
+        return None
+
+    def on_node(node):
+        if images is not None:
+            images.annotate(node, from_path)
+        if assets is not None:
+            assets.annotate(node)
+    return on_node
 
-    with open(from_path, "r", encoding="utf-8") as f:
-        markdown_content = f.read()
 
-    html_content = markdown_to_html_node(markdown_content).to_html()
+def load_page_ast(from_path, ast_cache):
+    key = ast_cache.key(from_path)
+    entry = ast_cache.get(key)
+    if entry is None:
+        record = new_page_record()
+        with open(from_path, "r", encoding="utf-8") as f:
+            variables = read_page(f)
+            nodes = list(iter_block_nodes(f, lambda block: collect_page_data(block, record)))
+        ast_cache.put(key, variables, nodes, record)
+        entry = (variables, nodes, record)
+    return entry
 
-    title = extract_title(markdown_content)
 
-    with open(template_path, "r", encoding="utf-8") as f:
-        template_content = f.read()
+def generate_page(
+    from_path, template_path, dest_path, manifest=None, cache=None, ast_cache=None, images=None,
+    assets=None,
+):
+    sources = page_sources(from_path, template_path, assets)
+    settings = images.settings() if images is not None else ""
+    if manifest is not None and manifest.is_fresh(dest_path, sources, settings):
+        return False
 
-    template_content = template_content.replace("{{ Title }}", title)
-    template_content = template_content.replace("{{ Content }}", html_content)
+    print(f"Generating page from {from_path} to {dest_path} using {template_path}.")
+
+    template = load_template(template_path)
+    if assets is not None:
+        template = assets.template(template)
 
     os.makedirs(os.path.dirname(dest_path), exist_ok=True)
 
-    with open(dest_path, "w", encoding="utf-8") as f:
-        f.write(template_content)
+    # The source is read line by line and the body is streamed block by block
+    # into the output, so memory stays flat regardless of page size.
+    tmp_path = dest_path + ".tmp"
+    record = new_page_record()
+    on_node = page_node_hook(from_path, images, assets)
+    try:
+        if ast_cache is not None:
+            # a cached tree skips markdown parsing entirely, e.g. when only
+            # the template changed
+            variables, nodes, record = load_page_ast(from_path, ast_cache)
+            if on_node is not None:
+                for node in nodes:
+                    on_node(node)
+            variables = dict(variables, Content=ParentNode("div", nodes).iter_html())
+            with open(tmp_path, "w", encoding="utf-8") as out:
+                template.write(out, variables)
+        else:
+            with open(from_path, "r", encoding="utf-8") as f, open(tmp_path, "w", encoding="utf-8") as out:
+                variables = read_page(f)
+                variables["Content"] = iter_markdown_html(
+                    f, cache, lambda block: collect_page_data(block, record), on_node
+                )
+                template.write(out, variables)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    os.replace(tmp_path, dest_path)
 
+    record["title"] = variables.get("Title")
+    if manifest is not None:
+        manifest.record(dest_path, sources, *page_dependencies(from_path, record, images))
+    return record
 
-def main():
-    source_dir = "static"
-    dest_dir = "public"
-    
-    if os.path.exists(dest_dir):
-        shutil.rmtree(dest_dir)
-        logging.info(f"Deleted contents of {dest_dir}")
+
+def profile_page(from_path, template_path, dest_path, profiler, images=None, assets=None):
+    page = from_path
+    with profiler.phase("read", page):
+        with open(from_path, "r", encoding="utf-8") as f:
+            markdown_lines = f.readlines()
+
+    # Block-level phases are summed per page and per block type; in the trace
+    # they are laid out back to back starting where block splitting began.
+    block_phases = {}
+
+    def timed(name, func, *args):
+        allocated = sys.getallocatedblocks()
+        start = time.perf_counter()
+        result = func(*args)
+        duration = time.perf_counter() - start
+        totals = block_phases.setdefault(name, [start, 0.0, 0])
+        totals[1] += duration
+        totals[2] += sys.getallocatedblocks() - allocated
+        return result, duration
+
+    source = io.StringIO("".join(markdown_lines))
+    variables = read_front_matter(source)
+    blocks, _ = timed("block_split", lambda: list(iter_markdown_blocks(source)))
+    record = new_page_record()
+    on_node = page_node_hook(from_path, images, assets)
+    body_html = ["<div>"]
+    for block in blocks:
+        collect_page_data(block, record)
+        classified, duration = timed("block_typing", classify_block, block)
+        block_type = classified.block_type
+        profiler.record_block(block_type.value, "block_typing", duration)
+        nodes, duration = timed("inline_parsing", block_to_html_nodes, classified)
+        profiler.record_block(block_type.value, "inline_parsing", duration)
+        if on_node is not None:
+            for node in nodes:
+                on_node(node)
+        html, duration = timed("serialize", lambda: "".join(node.to_html() for node in nodes))
+        profiler.record_block(block_type.value, "serialize", duration)
+        body_html.append(html)
+    body_html.append("</div>")
+
+    cursor = None
+    for name, (start, duration, allocations) in block_phases.items():
+        cursor = start if cursor is None else cursor
+        profiler.record(name, page, cursor, duration, allocations)
+        cursor += duration
+
+    with profiler.phase("templating", page):
+        if "Title" not in variables:
+            variables["Title"] = variables.get("title") or extract_title(markdown_lines)
+        variables["Content"] = body_html
+        template = load_template(template_path)
+        if assets is not None:
+            template = assets.template(template)
+        html = template.render(variables)
+        record["title"] = variables["Title"]
+
+    with profiler.phase("write", page):
+        os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+        with open(dest_path, "w", encoding="utf-8") as f:
+            f.write(html)
+    return record
+
+
+def find_markdown_files(dir_path):
+    markdown_files = []
+    for item in sorted(os.listdir(dir_path)):
+        item_path = os.path.join(dir_path, item)
+        if os.path.isdir(item_path):
+            markdown_files.extend(find_markdown_files(item_path))
+        elif item.endswith(".md"):
+            markdown_files.append(item_path)
+    return markdown_files
+
+
+def page_dest_path(from_path, dir_path_content, dest_dir_path):
+    relative_path = os.path.relpath(from_path, dir_path_content)
+    return os.path.join(dest_dir_path, os.path.splitext(relative_path)[0] + ".html")
+
+
+_worker_caches = {}
+
+
+def _init_worker(cache_configs):
+    # classes travel by reference, so a worker imports only the cache
+    # modules this build actually uses
+    for name, (cache_type, config) in cache_configs.items():
+        _worker_caches[name] = cache_type(*config)
+
+
+def _generate_page_job(job):
+    before = {name: cache.stats() for name, cache in _worker_caches.items()}
+    record = generate_page(*job, **_worker_caches)
+    return record, {
+        name: {key: value - before[name][key] for key, value in cache.stats().items()}
+        for name, cache in _worker_caches.items()
+    }
+
+
+def generate_pages_recursive(
+    dir_path_content, template_path, dest_dir_path, manifest=None, workers=None, profiler=None,
+    caches=None, link_index=None, search_index=None, shard=None,
+):
+    caches = caches or {}
+    images = caches.get("images")
+    settings = images.settings() if images is not None else ""
+    if shard is not None:
+        from shards import shard_of
+    jobs = []
+    for from_path in find_markdown_files(dir_path_content):
+        if shard is not None and shard_of(os.path.relpath(from_path, dir_path_content), shard[1]) != shard[0]:
+            continue
+        dest_path = page_dest_path(from_path, dir_path_content, dest_dir_path)
+        # a profiling run measures every page, and a page missing from an
+        # index must be rendered again to collect its links and terms
+        if (
+            manifest is not None
+            and profiler is None
+            and (link_index is None or from_path in link_index.pages)
+            and (search_index is None or from_path in search_index.pages)
+            and manifest.is_fresh(dest_path, page_sources(from_path, template_path, caches.get("assets")), settings)
+        ):
+            continue
+        jobs.append((from_path, template_path, dest_path))
+
+    records = {}
+    workers = workers or os.cpu_count() or 1
+    if profiler is not None:
+        for job in jobs:
+            records[job[0]] = profile_page(*job, profiler, caches.get("images"), caches.get("assets"))
+    elif workers == 1 or len(jobs) < 2:
+        for job in jobs:
+            records[job[0]] = generate_page(*job, **caches)
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        chunksize = max(1, len(jobs) // (workers * 4))
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(jobs)),
+            initializer=_init_worker,
+            initargs=({name: (type(cache), cache.config()) for name, cache in caches.items()},),
+        ) as executor:
+            # map() yields in submission order, so failures surface deterministically
+            for job, (record, stats) in zip(jobs, executor.map(_generate_page_job, jobs, chunksize=chunksize)):
+                records[job[0]] = record
+                for name, delta in stats.items():
+                    caches[name].add_stats(delta)
+
+    if manifest is not None:
+        for from_path, template_path, dest_path in jobs:
+            manifest.record(
+                dest_path, page_sources(from_path, template_path, caches.get("assets")),
+                *page_dependencies(from_path, records[from_path], images),
+            )
+    for index in (link_index, search_index):
+        if index is not None:
+            for from_path, record in records.items():
+                index.update(from_path, page_url(from_path, dir_path_content), record)
+    return records
+
+
+def is_inside(path, dir_path):
+    return os.path.commonpath([os.path.abspath(path), os.path.abspath(dir_path)]) == os.path.abspath(dir_path)
+
+
+def build_changed(changed_paths, manifest, workers=1, caches=None, link_index=None, search_index=None):
+    caches = caches or {}
+    indexes = [index for index in (link_index, search_index) if index is not None]
+    rebuilt = []
+    if any(os.path.abspath(path) == os.path.abspath(TEMPLATE_PATH) for path in changed_paths):
+        records = generate_pages_recursive(
+            CONTENT_DIR, TEMPLATE_PATH, PUBLIC_DIR, manifest, workers, None, caches, link_index, search_index
+        )
+        rebuilt.extend(page_dest_path(path, CONTENT_DIR, PUBLIC_DIR) for path in records)
+
+    pages = []
+    static_paths = set()
+    for path in changed_paths:
+        if is_inside(path, CONTENT_DIR) and path.endswith(".md"):
+            if not os.path.exists(path):
+                # deleted pages leave the indexes when the caller prunes them
+                manifest.discard(page_dest_path(path, CONTENT_DIR, PUBLIC_DIR))
+                continue
+            pages.append(path)
+        elif is_inside(path, STATIC_DIR):
+            static_paths.add(os.path.normpath(path))
+            dest_path = os.path.join(PUBLIC_DIR, os.path.relpath(path, STATIC_DIR))
+            if not os.path.exists(path):
+                manifest.discard(dest_path)
+            elif copy_file(path, dest_path, manifest):
+                rebuilt.append(dest_path)
+
+    if static_paths:
+        # pages annotated from a changed image render again
+        dependents = {
+            output_path for output_path, sources in manifest.dependencies.items()
+            if not static_paths.isdisjoint(sources)
+        }
+        if dependents:
+            pages.extend(
+                path for path in find_markdown_files(CONTENT_DIR)
+                if page_dest_path(path, CONTENT_DIR, PUBLIC_DIR) in dependents and path not in pages
+            )
+
+    for path in pages:
+        dest_path = page_dest_path(path, CONTENT_DIR, PUBLIC_DIR)
+        record = generate_page(path, TEMPLATE_PATH, dest_path, manifest, **caches)
+        if record:
+            rebuilt.append(dest_path)
+            for index in indexes:
+                index.update(path, page_url(path, CONTENT_DIR), record)
+
+    return rebuilt
+
+
+def publish_indexes(link_index, search_index, dest_dir, site_url=""):
+    # everything here is incremental: a build that changed no page record
+    # and no static file writes nothing
+    search_index.write(os.path.join(dest_dir, SEARCH_DIR))
+    if (
+        link_index.unpublished
+        or link_index.site_url != site_url
+        or not os.path.exists(os.path.join(dest_dir, SITEMAP_NAME))
+    ):
+        write_sitemap([page["url"] for page in link_index.pages.values()], dest_dir, site_url)
+        link_index.site_url = site_url
+        link_index.unsaved = True
+        link_index.unpublished = False
+    # only pages checked again are reported; the others were reported by the
+    # build that last checked them
+    broken = link_index.check(CONTENT_DIR, STATIC_DIR)
+    for source_path, kind, target in broken:
+        logging.warning(f"Broken {kind} in {source_path}: {target}")
+    return broken
+
+
+def main(
+    clean=False, workers=None, precompress=False, link_assets=False, profile=None, profile_top=10,
+    render_cache=False, render_cache_dir=None, render_cache_size=4096, ast_cache_dir=None,
+    image_widths=(), fingerprint=False, shard=None, site_url="",
+):
+    source_dir = STATIC_DIR
+    if shard is None:
+        dest_dir, manifest_path = PUBLIC_DIR, MANIFEST_PATH
+        link_index_path, search_index_path = LINK_INDEX_PATH, SEARCH_INDEX_PATH
+    else:
+        # a shard renders a stable subset of pages into its own tree; a
+        # later merge assembles the shards into public/
+        from shards import shard_paths, write_shard_sitemap
+        dest_dir, manifest_path, link_index_path, search_index_path = shard_paths(*shard)
     
-    copy_directory_contents(source_dir, dest_dir)
+    if clean:
+        if os.path.exists(dest_dir):
+            import shutil
+            shutil.rmtree(dest_dir)
+            logging.info(f"Deleted contents of {dest_dir}")
+        if os.path.exists(manifest_path):
+            os.remove(manifest_path)
+    if shard is not None:
+        # a shard that gets no pages is still a valid, empty result
+        os.makedirs(dest_dir, exist_ok=True)
+
+    manifest = BuildManifest(manifest_path).load()
+
+    profiler = None
+    if profile:
+        from profiler import BuildProfiler
+        profiler = BuildProfiler()
+
+    if profiler is not None:
+        with profiler.phase("asset_copy"):
+            copy_directory_contents(source_dir, dest_dir, manifest, link=link_assets)
+    else:
+        copy_directory_contents(source_dir, dest_dir, manifest, link=link_assets)
+
+    caches = {}
+    if render_cache or render_cache_dir:
+        from render_cache import RenderCache
+        caches["cache"] = RenderCache(render_cache_size, render_cache_dir)
+    if ast_cache_dir:
+        from ast_cache import AstCache
+        caches["ast_cache"] = AstCache(ast_cache_dir)
+    if fingerprint:
+        from fingerprint import fingerprint_directory
+        caches["assets"] = fingerprint_directory(source_dir, dest_dir, manifest, link_assets)
+    images = ImagePipeline(STATIC_DIR, CONTENT_DIR, image_widths, IMAGE_CACHE_DIR)
+    images.generate_variants(dest_dir, workers, manifest)
+    caches["images"] = images
+
+    link_index = LinkIndex(link_index_path).load()
+    search_index = SearchIndex(search_index_path).load()
+    generate_pages_recursive(
+        CONTENT_DIR, TEMPLATE_PATH, dest_dir, manifest, workers, profiler, caches,
+        link_index, search_index, shard,
+    )
+    for index in (link_index, search_index):
+        index.prune()
+    if shard is not None:
+        # links may point into other shards, so checking waits for the merge
+        write_shard_sitemap(*shard, link_index)
+    else:
+        publish_indexes(link_index, search_index, dest_dir, site_url)
+    # saved after publishing: an interrupted build leaves the indexes
+    # behind the output, never ahead of it
+    for index in (link_index, search_index):
+        index.save()
+
+    if "cache" in caches:
+        stats = caches["cache"].stats()
+        print(f"Render cache: {stats['hits']} memory hit(s), {stats['disk_hits']} disk hit(s), {stats['misses']} miss(es).")
+    if "ast_cache" in caches:
+        stats = caches["ast_cache"].stats()
+        print(f"AST cache: {stats['hits']} hit(s), {stats['misses']} miss(es).")
+
+    manifest.prune()
+    manifest.save()
 
-    markdown_file = os.path.join("content", "index.md")
+    if precompress:
+        from compress import precompress as precompress_directory
+        precompress_directory(dest_dir, workers)
 
-    generate_page(markdown_file, "template.html", "public/index.html")
+    if profiler is not None:
+        profiler.print_summary(profile_top)
+        for path in profiler.write(profile, profile_top):
+            print(f"Wrote profile: {path}")
 
 if __name__ == "__main__":
-    logging.basicConfig(level=logging.INFO)
-    main()
+    from cli import main as cli_main
+    cli_main(["build", *sys.argv[1:]])
@@ -0,0 +1,151 @@
+import os
+import json
+import hashlib
+import logging
+
+MANIFEST_VERSION = 1
+GENERATOR_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def hash_bytes(data):
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def hash_file(path):
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def generator_hash(code_dir=GENERATOR_DIR):
+    digest = hashlib.blake2b(digest_size=16)
+    for name in sorted(os.listdir(code_dir)):
+        if name.endswith(".py") and not name.startswith("test_"):
+            digest.update(name.encode("utf-8"))
+            digest.update(hash_file(os.path.join(code_dir, name)).encode("ascii"))
+    return digest.hexdigest()
+
+
+class BuildManifest:
+    def __init__(self, path, generator=None):
+        self.path = path
+        self.generator = generator if generator is not None else generator_hash()
+        self.files = {}    # source path -> [mtime_ns, size, hash]
+        self.outputs = {}  # output path -> combined hash of its inputs
+        # output path -> sources found while building it, e.g. the images a
+        # page was annotated from
+        self.dependencies = {}
+        self.previous_outputs = {}
+        self.seen = set()
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return self
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            logging.warning(f"Ignoring unreadable build manifest '{self.path}'.")
+            return self
+        if data.get("version") != MANIFEST_VERSION:
+            return self
+        self.files = data.get("files", {})
+        self.dependencies = data.get("dependencies", {})
+        self.previous_outputs = data.get("outputs", {})
+        if data.get("generator") == self.generator:
+            self.outputs = dict(self.previous_outputs)
+        return self
+
+    def save(self):
+        data = {
+            "version": MANIFEST_VERSION,
+            "generator": self.generator,
+            "files": self.files,
+            "outputs": self.outputs,
+            "dependencies": self.dependencies,
+        }
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(json.dumps(data, separators=(",", ":"), sort_keys=True))
+        os.replace(tmp_path, self.path)
+
+    def file_hash(self, path):
+        stat = os.stat(path)
+        entry = self.files.get(path)
+        if entry and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+            return entry[2]
+        digest = hash_file(path)
+        self.files[path] = [stat.st_mtime_ns, stat.st_size, digest]
+        return digest
+
+    def inputs_hash(self, sources, settings=""):
+        # a missing source still counts, so the output is rebuilt once it appears
+        parts = [
+            f"{path}:{self.file_hash(path) if os.path.exists(path) else 'missing'}" for path in sources
+        ]
+        if settings:
+            parts.insert(0, settings)
+        return hash_bytes("\0".join(parts).encode("utf-8"))
+
+    def is_fresh(self, output_path, sources, settings=""):
+        self.seen.add(output_path)
+        if output_path not in self.outputs or not os.path.exists(output_path):
+            return False
+        sources = list(sources) + self.dependencies.get(output_path, [])
+        return self.outputs[output_path] == self.inputs_hash(sources, settings)
+
+    def record(self, output_path, sources, dependencies=(), settings=""):
+        self.seen.add(output_path)
+        if dependencies:
+            self.dependencies[output_path] = list(dependencies)
+        else:
+            self.dependencies.pop(output_path, None)
+        self.outputs[output_path] = self.inputs_hash(list(sources) + list(dependencies), settings)
+
+    def discard(self, output_path):
+        self.outputs.pop(output_path, None)
+        self.dependencies.pop(output_path, None)
+        self.previous_outputs.pop(output_path, None)
+        if os.path.isfile(output_path):
+            os.remove(output_path)
+            remove_empty_parents(output_path)
+            logging.info(f"Removed stale output: {output_path}")
+
+    def prune(self):
+        removed = []
+        for output_path in sorted(set(self.previous_outputs) | set(self.outputs)):
+            if output_path in self.seen:
+                continue
+            if os.path.isfile(output_path):
+                removed.append(output_path)
+            self.discard(output_path)
+        live_sources = {path for path in self.files if os.path.exists(path)}
+        self.files = {path: self.files[path] for path in live_sources}
+        return removed
+
+
+def remove_empty_parents(path):
+    parent = os.path.dirname(path)
+    while parent:
+        try:
+            os.rmdir(parent)
+        except OSError:
+            return
+        parent = os.path.dirname(parent)
+
+
+def write_if_changed(path, data):
+    # an unchanged file keeps its mtime, so ETags and browser caches stay valid
+    try:
+        with open(path, "rb") as f:
+            if f.read() == data:
+                return False
+    except FileNotFoundError:
+        pass
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    return True
@@ -0,0 +1,112 @@
+import os
+import sys
+import json
+import time
+from contextlib import contextmanager
+
+
+class BuildProfiler:
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.events = []
+        self.phases = {}      # phase -> [seconds, net allocated blocks, calls]
+        self.pages = {}       # page -> {phase: [seconds, net allocated blocks]}
+        self.block_types = {} # block type -> {phase: [seconds, blocks]}
+
+    @contextmanager
+    def phase(self, name, page=None):
+        allocated = sys.getallocatedblocks()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            self.record(name, page, start, duration, sys.getallocatedblocks() - allocated)
+
+    def record(self, name, page, start, duration, allocations):
+        totals = self.phases.setdefault(name, [0.0, 0, 0])
+        totals[0] += duration
+        totals[1] += allocations
+        totals[2] += 1
+        if page is not None:
+            page_totals = self.pages.setdefault(page, {}).setdefault(name, [0.0, 0])
+            page_totals[0] += duration
+            page_totals[1] += allocations
+        self.events.append((name, page, start, duration, allocations))
+
+    def record_block(self, block_type, name, duration):
+        totals = self.block_types.setdefault(block_type, {}).setdefault(name, [0.0, 0])
+        totals[0] += duration
+        totals[1] += 1
+
+    def page_seconds(self, page):
+        return sum(seconds for seconds, _ in self.pages[page].values())
+
+    def slowest_pages(self, top):
+        return sorted(self.pages, key=self.page_seconds, reverse=True)[:top]
+
+    def to_json(self, top=10):
+        def phase_table(table):
+            return {
+                name: {"seconds": round(values[0], 6), "allocated_blocks": values[1]}
+                for name, values in sorted(table.items())
+            }
+
+        return {
+            "total_seconds": round(time.perf_counter() - self.origin, 6),
+            "phases": {
+                name: {"seconds": round(seconds, 6), "allocated_blocks": blocks, "calls": calls}
+                for name, (seconds, blocks, calls) in sorted(self.phases.items())
+            },
+            "block_types": {
+                block_type: {
+                    name: {"seconds": round(seconds, 6), "blocks": count}
+                    for name, (seconds, count) in sorted(phases.items())
+                }
+                for block_type, phases in sorted(self.block_types.items())
+            },
+            "pages": {
+                page: {"seconds": round(self.page_seconds(page), 6), "phases": phase_table(phases)}
+                for page, phases in sorted(self.pages.items())
+            },
+            "slowest_pages": [
+                {"page": page, "seconds": round(self.page_seconds(page), 6)}
+                for page in self.slowest_pages(top)
+            ],
+        }
+
+    def to_trace(self, top=10):
+        slowest = set(self.slowest_pages(top))
+        trace_events = []
+        for name, page, start, duration, allocations in self.events:
+            event = {
+                "name": name,
+                "cat": "page" if page is not None else "build",
+                "ph": "X",
+                "ts": round((start - self.origin) * 1e6, 3),
+                "dur": round(duration * 1e6, 3),
+                "pid": os.getpid(),
+                "tid": 0,
+                "args": {"page": page, "allocated_blocks": allocations},
+            }
+            if page in slowest:
+                event["cname"] = "terrible"
+            trace_events.append(event)
+        return {"traceEvents": trace_events, "displayTimeUnit": "ms"}
+
+    def write(self, path_prefix, top=10):
+        json_path = path_prefix + ".json"
+        trace_path = path_prefix + ".trace.json"
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(self.to_json(top), f, indent=2)
+        with open(trace_path, "w", encoding="utf-8") as f:
+            json.dump(self.to_trace(top), f)
+        return json_path, trace_path
+
+    def print_summary(self, top=10):
+        print(f"{'phase':<16}{'seconds':>10}{'alloc blocks':>14}")
+        for name, (seconds, blocks, _) in sorted(self.phases.items(), key=lambda item: -item[1][0]):
+            print(f"{name:<16}{seconds:>10.4f}{blocks:>14}")
+        print(f"Slowest {min(top, len(self.pages))} page(s):")
+        for page in self.slowest_pages(top):
+            print(f"  {self.page_seconds(page):.4f}s  {page}")
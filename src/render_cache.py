@@ -0,0 +1,80 @@
+import os
+import hashlib
+from collections import OrderedDict
+
+from manifest import generator_hash
+
+
+class RenderCache:
+    def __init__(self, maxsize=4096, path=None, salt=None):
+        self.maxsize = maxsize
+        self.path = path
+        # rendered HTML depends on the generator code, so a code change must
+        # never be served stale entries from the on-disk store
+        self.salt = (salt if salt is not None else generator_hash()).encode("ascii")
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        if path:
+            os.makedirs(path, exist_ok=True)
+
+    def key(self, block):
+        return hashlib.blake2b(block.encode("utf-8"), digest_size=16, key=self.salt[:64]).hexdigest()
+
+    def disk_path(self, key):
+        return os.path.join(self.path, key[:2], key[2:] + ".html")
+
+    def get(self, key):
+        html = self.entries.get(key)
+        if html is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return html
+        if self.path:
+            try:
+                with open(self.disk_path(key), "r", encoding="utf-8") as f:
+                    html = f.read()
+            except FileNotFoundError:
+                html = None
+            if html is not None:
+                self.disk_hits += 1
+                self.remember(key, html)
+                return html
+        self.misses += 1
+        return None
+
+    def remember(self, key, html):
+        self.entries[key] = html
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def put(self, key, html):
+        self.remember(key, html)
+        if self.path:
+            path = self.disk_path(key)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(html)
+            os.replace(tmp_path, path)
+
+    def render(self, block, render_block):
+        key = self.key(block)
+        html = self.get(key)
+        if html is None:
+            html = render_block(block)
+            self.put(key, html)
+        return html
+
+    def stats(self):
+        return {"hits": self.hits, "disk_hits": self.disk_hits, "misses": self.misses}
+
+    def add_stats(self, stats):
+        self.hits += stats["hits"]
+        self.disk_hits += stats["disk_hits"]
+        self.misses += stats["misses"]
+
+    def config(self):
+        return (self.maxsize, self.path, self.salt.decode("ascii"))
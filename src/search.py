@@ -0,0 +1,187 @@
+import os
+import re
+import json
+import logging
+
+from manifest import write_if_changed
+
+SEARCH_INDEX_VERSION = 1
+# shard names are alphanumeric or "_", so the leading underscore keeps the
+# page table from ever colliding with a shard
+META_NAME = "_index.json"
+TERM_PATTERN = re.compile(r"[^\W_]+")
+# link and image targets are markup, not prose
+LINK_TARGET_PATTERN = re.compile(r"\]\([^)]*\)")
+MAX_TERM_LENGTH = 32
+
+
+def collect_terms(block, record):
+    terms = record.setdefault("terms", {})
+    position = record.get("words", 0)
+    if block.startswith("```"):
+        block = block.strip("`")
+    elif "](" in block:
+        block = LINK_TARGET_PATTERN.sub("]", block)
+    for match in TERM_PATTERN.finditer(block.lower()):
+        term = match.group()
+        if len(term) <= MAX_TERM_LENGTH:
+            terms.setdefault(term, []).append(position)
+        position += 1
+    record["words"] = position
+
+
+def shard_name(term, prefix_length):
+    prefix = term[:prefix_length]
+    if prefix.isascii() and prefix.isalnum():
+        return prefix
+    # keep shard file names portable; non-ASCII prefixes share one shard
+    return "_"
+
+
+def encode_positions(positions):
+    previous = 0
+    deltas = []
+    for position in positions:
+        deltas.append(position - previous)
+        previous = position
+    return deltas
+
+
+def decode_positions(deltas):
+    position = 0
+    positions = []
+    for delta in deltas:
+        position += delta
+        positions.append(position)
+    return positions
+
+
+class SearchIndex:
+    def __init__(self, path, prefix_length=2):
+        self.path = path
+        self.prefix_length = prefix_length
+        self.pages = {}  # source path -> {"url", "title", "terms"}
+        # what the last write() produced, so a long-lived index can rewrite
+        # only the shards its updates touched
+        self.written = None  # (page table, shard names)
+        self.dirty = set()
+        self.encoded = {}  # source path -> {shard name: [(term, deltas)]}
+        self.unsaved = False
+        self.unpublished = False
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return self
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            logging.warning(f"Ignoring unreadable search index '{self.path}'.")
+            return self
+        if data.get("version") == SEARCH_INDEX_VERSION:
+            self.pages = data.get("pages", {})
+        return self
+
+    def save(self):
+        if not self.unsaved and os.path.exists(self.path):
+            return
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            # dumps() runs the C encoder; dump() to a stream does not
+            f.write(json.dumps(
+                {"version": SEARCH_INDEX_VERSION, "pages": self.pages}, separators=(",", ":"), sort_keys=True,
+            ))
+        os.replace(tmp_path, self.path)
+        self.unsaved = False
+
+    def update(self, source_path, url, record):
+        page = {"url": url, "title": record.get("title"), "terms": record.get("terms", {})}
+        previous = self.pages.get(source_path)
+        if previous == page:
+            return
+        self.pages[source_path] = page
+        self.mark_dirty(page)
+        if previous is not None:
+            self.mark_dirty(previous)
+        self.encoded.pop(source_path, None)
+        self.unsaved = self.unpublished = True
+
+    def mark_dirty(self, page):
+        self.dirty.update(shard_name(term, self.prefix_length) for term in page["terms"])
+
+    def prune(self):
+        pages = {}
+        for path, page in self.pages.items():
+            if os.path.exists(path):
+                pages[path] = page
+            else:
+                self.mark_dirty(page)
+                self.encoded.pop(path, None)
+                self.unsaved = self.unpublished = True
+        self.pages = pages
+
+    def page_table(self):
+        pages = sorted(self.pages.items(), key=lambda item: item[1]["url"])
+        return [source_path for source_path, _ in pages], [[page["url"], page["title"]] for _, page in pages]
+
+    def page_postings(self, source_path):
+        postings = self.encoded.get(source_path)
+        if postings is None:
+            postings = {}
+            for term, positions in self.pages[source_path]["terms"].items():
+                postings.setdefault(shard_name(term, self.prefix_length), []).append(
+                    (term, encode_positions(positions))
+                )
+            self.encoded[source_path] = postings
+        return postings
+
+    def shards(self, names=None):
+        source_paths, page_table = self.page_table()
+        shards = {}
+        for page_id, source_path in enumerate(source_paths):
+            for name, postings in self.page_postings(source_path).items():
+                if names is not None and name not in names:
+                    continue
+                shard = shards.setdefault(name, {})
+                for term, deltas in postings:
+                    shard.setdefault(term, []).append([page_id, deltas])
+        return page_table, shards
+
+    def write(self, dest_dir):
+        if not self.unpublished and os.path.exists(os.path.join(dest_dir, META_NAME)):
+            # nothing was updated or pruned since the output was written
+            return []
+        # page ids follow URL order, so only an unchanged page table lets
+        # the shards nobody touched keep their bytes
+        partial = (
+            self.written is not None
+            and os.path.isdir(dest_dir)
+            and self.written[0] == self.page_table()[1]
+        )
+        page_table, shards = self.shards(self.dirty if partial else None)
+        shard_names = set(shards)
+        if partial:
+            shard_names |= self.written[1] - self.dirty
+        os.makedirs(dest_dir, exist_ok=True)
+        meta = {
+            "version": SEARCH_INDEX_VERSION,
+            "prefix": self.prefix_length,
+            "pages": page_table,
+            "shards": sorted(shard_names),
+        }
+        written = []
+        files = {META_NAME: meta}
+        files.update((f"{name}.json", shard) for name, shard in shards.items())
+        for name, content in files.items():
+            path = os.path.join(dest_dir, name)
+            data = json.dumps(content, separators=(",", ":"), sort_keys=True, ensure_ascii=False).encode("utf-8")
+            if write_if_changed(path, data):
+                written.append(path)
+        expected = {META_NAME} | {f"{name}.json" for name in shard_names}
+        for name in os.listdir(dest_dir):
+            if name.endswith(".json") and name not in expected:
+                os.remove(os.path.join(dest_dir, name))
+        self.written = (page_table, shard_names)
+        self.dirty.clear()
+        self.unpublished = False
+        return written
@@ -0,0 +1,94 @@
+import os
+import hashlib
+import logging
+
+from assets import scan_tree, sync_directory
+from links import LinkIndex
+from manifest import remove_empty_parents
+from search import SearchIndex
+from sitemap import SITEMAP_NAME, load_fragment, write_fragment, write_sitemap
+
+SHARDS_DIR = "shards"
+SHARD_PUBLIC_DIR = "public"
+SHARD_MANIFEST = "build-manifest.json"
+SHARD_LINK_INDEX = "link-index.json"
+SHARD_SEARCH_INDEX = "search-index.json"
+SHARD_SITEMAP = "sitemap.json"
+
+
+def parse_shard(value):
+    index, _, count = value.partition("/")
+    index, count = int(index), int(count)
+    if count < 1 or not 0 <= index < count:
+        raise ValueError(f"Shard index must be in 0..{count - 1}")
+    return index, count
+
+
+def shard_of(relative_path, count):
+    # a content hash of the path, not hash(): it must agree across processes
+    # and machines
+    digest = hashlib.blake2b(relative_path.replace(os.sep, "/").encode("utf-8"), digest_size=8)
+    return int.from_bytes(digest.digest(), "big") % count
+
+
+def shard_root(index, count):
+    return os.path.join(SHARDS_DIR, f"{index}-of-{count}")
+
+
+def shard_paths(index, count):
+    root = shard_root(index, count)
+    return (
+        os.path.join(root, SHARD_PUBLIC_DIR),
+        os.path.join(root, SHARD_MANIFEST),
+        os.path.join(root, SHARD_LINK_INDEX),
+        os.path.join(root, SHARD_SEARCH_INDEX),
+    )
+
+
+def write_shard_sitemap(index, count, link_index):
+    root = shard_root(index, count)
+    os.makedirs(os.path.join(root, SHARD_PUBLIC_DIR), exist_ok=True)
+    write_fragment([page["url"] for page in link_index.pages.values()], os.path.join(root, SHARD_SITEMAP))
+
+
+def merge_shards(count, dest_dir, content_dir, static_dir, search_dir, site_url=""):
+    roots = [shard_root(index, count) for index in range(count)]
+    missing = [root for root in roots if not os.path.isdir(os.path.join(root, SHARD_PUBLIC_DIR))]
+    if missing:
+        raise FileNotFoundError(f"Missing shard output: {', '.join(missing)}")
+
+    os.makedirs(dest_dir, exist_ok=True)
+    link_index = LinkIndex(None)
+    search_index = SearchIndex(None)
+    urls = []
+    expected = set()
+    for root in roots:
+        shard_public = os.path.join(root, SHARD_PUBLIC_DIR)
+        # shards render disjoint pages and identical static files, so
+        # overlaying them never conflicts
+        sync_directory(shard_public, dest_dir, link=True)
+        expected.update(os.path.relpath(path, shard_public) for path, _ in scan_tree(shard_public))
+        link_index.pages.update(LinkIndex(os.path.join(root, SHARD_LINK_INDEX)).load().pages)
+        # update() marks the shards it touches, so write() publishes them
+        for source_path, page in SearchIndex(os.path.join(root, SHARD_SEARCH_INDEX)).load().pages.items():
+            search_index.update(source_path, page["url"], page)
+        urls.extend(load_fragment(os.path.join(root, SHARD_SITEMAP)))
+
+    generated = os.path.relpath(search_dir, dest_dir)
+    for path, _ in scan_tree(dest_dir):
+        relative_path = os.path.relpath(path, dest_dir)
+        if relative_path in expected or relative_path == SITEMAP_NAME:
+            continue
+        if relative_path.startswith(generated + os.sep):
+            continue
+        os.remove(path)
+        remove_empty_parents(path)
+        logging.info(f"Removed stale output: {path}")
+
+    search_index.write(search_dir)
+    write_sitemap(urls, dest_dir, site_url)
+    broken = link_index.check(content_dir, static_dir)
+    for source_path, kind, target in broken:
+        logging.warning(f"Broken {kind} in {source_path}: {target}")
+    print(f"Merged {count} shard(s), {len(link_index.pages)} page(s) into {dest_dir}.")
+    return broken
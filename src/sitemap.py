@@ -0,0 +1,36 @@
+import os
+import json
+
+from manifest import write_if_changed
+
+SITEMAP_NAME = "sitemap.xml"
+
+
+def escape_xml(text):
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+def sitemap_xml(urls, site_url=""):
+    lines = [
+        '<?xml version="1.0" encoding="UTF-8"?>',
+        '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">',
+    ]
+    for url in sorted(urls):
+        lines.append(f"  <url><loc>{escape_xml(site_url.rstrip('/') + url)}</loc></url>")
+    lines.append("</urlset>")
+    return "\n".join(lines) + "\n"
+
+
+def write_sitemap(urls, dest_dir, site_url=""):
+    path = os.path.join(dest_dir, SITEMAP_NAME)
+    write_if_changed(path, sitemap_xml(urls, site_url).encode("utf-8"))
+    return path
+
+
+def write_fragment(urls, path):
+    write_if_changed(path, json.dumps(sorted(urls), indent=0).encode("utf-8"))
+
+
+def load_fragment(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
@@ -0,0 +1,65 @@
+import os
+import re
+
+from htmlnode import escape_text
+
+SLOT_PATTERN = re.compile(r"{{\s*(\w+)\s*}}")
+
+_templates = {}
+
+
+class Template:
+    def __init__(self, source):
+        # segments alternate literal text and slot names: [text, name, text, ...]
+        self.segments = []
+        self.slots = []
+        position = 0
+        for match in SLOT_PATTERN.finditer(source):
+            self.segments.append(source[position:match.start()])
+            self.segments.append(match.group(1))
+            self.slots.append(match.group(0))
+            position = match.end()
+        self.segments.append(source[position:])
+
+    def iter_render(self, variables):
+        segments = self.segments
+        for i, segment in enumerate(segments):
+            if i % 2 == 0:
+                if segment:
+                    yield segment
+                continue
+            value = variables.get(segment)
+            if value is None:
+                yield self.slots[i // 2]
+            elif isinstance(value, str):
+                # plain values such as the title and front matter are text
+                yield escape_text(value)
+            else:
+                # pre-rendered HTML arrives as an iterable of chunks
+                yield from value
+
+    def render(self, variables):
+        return "".join(self.iter_render(variables))
+
+    def write(self, stream, variables):
+        for chunk in self.iter_render(variables):
+            stream.write(chunk)
+
+    def __repr__(self):
+        return f"Template({self.segments})"
+
+
+def load_template(path):
+    stat = os.stat(path)
+    key = (stat.st_mtime_ns, stat.st_size)
+    cached = _templates.get(path)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    with open(path, "r", encoding="utf-8") as f:
+        template = Template(f.read())
+    _templates[path] = (key, template)
+    return template
+
+
+def clear_template_cache():
+    _templates.clear()
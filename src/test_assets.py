@@ -0,0 +1,58 @@
+import os
+import tempfile
+import unittest
+
+from assets import scan_tree, sync_directory
+
+
+class TestAssets(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.source_dir = os.path.join(self.tmp.name, "static")
+        self.dest_dir = os.path.join(self.tmp.name, "public")
+        self.write("index.css", "body {}")
+        self.write("images/a.png", "a" * 4096)
+        self.write("images/icons/b.svg", "<svg/>")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, relative_path, content):
+        path = os.path.join(self.source_dir, relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(content)
+
+    def test_scan_tree(self):
+        paths = [os.path.relpath(path, self.source_dir) for path, _ in scan_tree(self.source_dir)]
+        self.assertEqual(
+            paths,
+            [os.path.join("images", "a.png"), os.path.join("images", "icons", "b.svg"), "index.css"],
+        )
+
+    def test_sync_copies_and_skips_unchanged(self):
+        copied = sync_directory(self.source_dir, self.dest_dir, workers=2)
+        self.assertEqual(len(copied), 3)
+        with open(os.path.join(self.dest_dir, "images", "a.png"), encoding="utf-8") as f:
+            self.assertEqual(f.read(), "a" * 4096)
+        self.assertEqual(sync_directory(self.source_dir, self.dest_dir, workers=2), [])
+
+        self.write("index.css", "body { margin: 0; }")
+        self.assertEqual(
+            sync_directory(self.source_dir, self.dest_dir, workers=2),
+            [os.path.join(self.dest_dir, "index.css")],
+        )
+
+    def test_sync_hardlinks(self):
+        sync_directory(self.source_dir, self.dest_dir, link=True)
+        source_stat = os.stat(os.path.join(self.source_dir, "index.css"))
+        dest_stat = os.stat(os.path.join(self.dest_dir, "index.css"))
+        self.assertEqual(source_stat.st_ino, dest_stat.st_ino)
+
+    def test_missing_source(self):
+        with self.assertLogs(level="ERROR"):
+            self.assertEqual(sync_directory(os.path.join(self.tmp.name, "missing"), self.dest_dir), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import os
+import tempfile
+import unittest
+
+from ast_cache import AstCache, MemoryAstCache, dumps, loads
+from htmlnode import markdown_to_html_node
+from main import generate_page
+
+MARKDOWN = "# Title\n\nText\n\n```\ncode()\n```\n\n> quote\n\n1. one\n2. two"
+
+
+class TestAstCache(unittest.TestCase):
+    def test_round_trip(self):
+        nodes = markdown_to_html_node(MARKDOWN).children
+        record = {"links": ["/about"], "images": []}
+        variables, loaded, loaded_record = loads(dumps({"Title": "Title"}, nodes, record))
+        self.assertEqual(variables, {"Title": "Title"})
+        self.assertEqual(loaded_record, record)
+        self.assertEqual(
+            "".join(node.to_html() for node in loaded),
+            "".join(node.to_html() for node in nodes),
+        )
+
+    def test_template_change_reuses_parsed_tree(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            from_path = os.path.join(tmp, "index.md")
+            template_path = os.path.join(tmp, "template.html")
+            dest_path = os.path.join(tmp, "public", "index.html")
+            with open(from_path, "w", encoding="utf-8") as f:
+                f.write(MARKDOWN)
+            with open(template_path, "w", encoding="utf-8") as f:
+                f.write("{{ Title }}|{{ Content }}")
+
+            cache = AstCache(os.path.join(tmp, "cache"), salt="test")
+            generate_page(from_path, template_path, dest_path, ast_cache=cache)
+            with open(dest_path, encoding="utf-8") as f:
+                first = f.read()
+
+            with open(template_path, "w", encoding="utf-8") as f:
+                f.write("<b>{{ Title }}</b>{{ Content }}")
+            generate_page(from_path, template_path, dest_path, ast_cache=cache)
+            with open(dest_path, encoding="utf-8") as f:
+                second = f.read()
+
+            self.assertEqual(cache.stats(), {"hits": 1, "misses": 1})
+            self.assertEqual(second, "<b>Title</b>" + first[len("Title|"):])
+            self.assertEqual(first, "Title|" + markdown_to_html_node(MARKDOWN).to_html())
+
+            other = AstCache(os.path.join(tmp, "cache"), salt="new parser")
+            self.assertIsNone(other.get(other.key(from_path)))
+
+    def test_memory_cache_hands_out_fresh_trees(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            from_path = os.path.join(tmp, "index.md")
+            with open(from_path, "w", encoding="utf-8") as f:
+                f.write(MARKDOWN)
+            cache = MemoryAstCache()
+            key = cache.key(from_path)
+            self.assertIsNone(cache.get(key))
+            cache.put(key, {"Title": "Title"}, markdown_to_html_node(MARKDOWN).children, {})
+
+            _, nodes, _ = cache.get(key)
+            nodes[0].props = {"id": "changed"}
+            _, nodes, _ = cache.get(cache.key(from_path))
+            self.assertIsNone(nodes[0].props)
+
+            with open(from_path, "a", encoding="utf-8") as f:
+                f.write("\n\nMore")
+            self.assertIsNone(cache.get(cache.key(from_path)))
+            os.remove(from_path)
+            cache.prune()
+            self.assertEqual((cache.entries, cache.stats()), ({}, {"hits": 2, "misses": 2}))
+
+
+if __name__ == "__main__":
+    unittest.main()
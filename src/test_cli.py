@@ -0,0 +1,52 @@
+import os
+import sys
+import unittest
+import subprocess
+
+from cli import build_parser
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# generous enough for a loaded CI machine; importing the generator alone
+# costs several times this
+IMPORT_BUDGET_US = 60000
+HEAVY_MODULES = ("main", "htmlnode", "json", "http.server", "concurrent.futures", "multiprocessing")
+
+
+def import_times(*args):
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        cwd=ROOT_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, check=True,
+    )
+    modules = {}
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "self [us]" not in line:
+            self_us, _, name = line[len("import time:"):].split("|")
+            modules[name.strip()] = int(self_us)
+    return modules
+
+
+class TestCli(unittest.TestCase):
+    def test_subcommands(self):
+        parser = build_parser()
+        args = parser.parse_args(["build", "--shard", "1/3", "--image-widths", "320,640"])
+        self.assertEqual((args.command, args.shard, args.image_widths), ("build", (1, 3), [320, 640]))
+        args = parser.parse_args(["watch", "--port", "9000"])
+        self.assertEqual((args.watch, args.dir, args.port), (True, "public", 9000))
+        self.assertFalse(parser.parse_args(["serve"]).watch)
+
+    def test_build_help_stays_lazy(self):
+        modules = import_times("-m", "src", "build", "--help")
+        self.assertIn("cli", modules)
+        for name in HEAVY_MODULES:
+            self.assertNotIn(name, modules)
+
+    def test_build_help_import_budget(self):
+        # only count what the CLI adds on top of the bare interpreter
+        interpreter = import_times("-c", "pass")
+        modules = import_times("-m", "src", "build", "--help")
+        total = sum(us for name, us in modules.items() if name not in interpreter)
+        self.assertLess(total, IMPORT_BUDGET_US)
+
+
+if __name__ == "__main__":
+    unittest.main()
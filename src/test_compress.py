@@ -0,0 +1,66 @@
+import os
+import gzip
+import tempfile
+import unittest
+
+from compress import precompress, compress_file
+
+
+class TestCompress(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, name, content):
+        path = os.path.join(self.root, name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(content)
+        return path
+
+    def test_compress_file_round_trip(self):
+        path = self.write("index.html", "<p>repeat</p>" * 500)
+        written, saved = compress_file(path, min_size=0)
+        self.assertGreaterEqual(written, 1)
+        self.assertGreater(saved, 0)
+        with gzip.open(path + ".gz", "rt", encoding="utf-8") as f:
+            self.assertEqual(f.read(), "<p>repeat</p>" * 500)
+
+    def test_up_to_date_sibling_is_skipped(self):
+        path = self.write("index.css", "body { color: red; }\n" * 200)
+        compress_file(path, min_size=0)
+        written, saved = compress_file(path, min_size=0)
+        self.assertEqual(written, 0)
+        self.assertGreater(saved, 0)
+
+    def test_small_and_binary_files_skipped(self):
+        self.write("small.css", "a{}")
+        self.write("image.png", "x" * 5000)
+        written, _ = precompress(self.root, workers=2, min_size=100)
+        self.assertEqual(written, 0)
+        self.assertEqual(sorted(os.listdir(self.root)), ["image.png", "small.css"])
+
+    def test_orphaned_sibling_removed(self):
+        path = self.write("page.html", "<p>text</p>" * 500)
+        precompress(self.root, workers=2, min_size=0)
+        os.remove(path)
+        precompress(self.root, workers=2, min_size=0)
+        self.assertEqual(os.listdir(self.root), [])
+
+    def test_static_archives_kept(self):
+        os.makedirs(os.path.join(self.root, "downloads"))
+        archive = os.path.join(self.root, "downloads", "data.tar.gz")
+        with open(archive, "wb") as f:
+            f.write(gzip.compress(b"archive" * 500))
+        with open(os.path.join(self.root, "font.woff2.br"), "wb") as f:
+            f.write(b"binary")
+        precompress(self.root, workers=2, min_size=0)
+        precompress(self.root, workers=2, min_size=0)
+        self.assertTrue(os.path.exists(archive))
+        self.assertEqual(sorted(os.listdir(self.root)), ["downloads", "font.woff2.br"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import os
+import sys
+import time
+import tempfile
+import unittest
+import subprocess
+
+from daemon import request
+
+CLI = os.path.join(os.path.dirname(os.path.abspath(__file__)), "__main__.py")
+
+
+class TestDaemon(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        self.socket_path = os.path.join(self.root, "daemon.sock")
+        os.makedirs(os.path.join(self.root, "static"))
+        with open(os.path.join(self.root, "template.html"), "w", encoding="utf-8") as f:
+            f.write("<title>{{ Title }}</title>{{ Content }}")
+        for name in ("index", "about", "contact"):
+            self.write_page(name, f"# {name.title()}\n\nSee the [home page](/).")
+        self.daemon = subprocess.Popen(
+            [sys.executable, CLI, "daemon", "--socket", self.socket_path],
+            cwd=self.root, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        deadline = time.monotonic() + 30
+        while not os.path.exists(self.socket_path):
+            self.assertIsNone(self.daemon.poll())
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.01)
+
+    def tearDown(self):
+        if self.daemon.poll() is None:
+            self.daemon.kill()
+        self.daemon.wait()
+        self.tmp.cleanup()
+
+    def path(self, *parts):
+        return os.path.join(self.root, *parts)
+
+    def write_page(self, name, markdown):
+        os.makedirs(self.path("content"), exist_ok=True)
+        with open(self.path("content", f"{name}.md"), "w", encoding="utf-8") as f:
+            f.write(markdown)
+
+    def read(self, *parts):
+        with open(self.path(*parts), encoding="utf-8") as f:
+            return f.read()
+
+    def test_rebuilds_only_requested_paths(self):
+        self.assertIn("<h1>About</h1>", self.read("public", "about.html"))
+        self.write_page("about", "# About us\n\nWritten by quokkas.")
+        response = request({"command": "build", "paths": [self.path("content", "about.md")]}, self.socket_path)
+        self.assertTrue(response["ok"])
+        self.assertEqual(response["rebuilt"], [os.path.join("public", "about.html")])
+        self.assertIn("<title>About us</title>", self.read("public", "about.html"))
+        self.assertIn("qu.json", os.listdir(self.path("public", "search")))
+
+        # an incremental build of the whole site finds nothing else to do
+        response = request({"command": "build"}, self.socket_path)
+        self.assertEqual((response["ok"], response["rebuilt"]), (True, []))
+
+        os.remove(self.path("content", "contact.md"))
+        request({"command": "build", "paths": [self.path("content", "contact.md")]}, self.socket_path)
+        self.assertFalse(os.path.exists(self.path("public", "contact.html")))
+        self.assertNotIn("/contact", self.read("public", "sitemap.xml"))
+
+    def test_stop_saves_state_for_cold_builds(self):
+        self.write_page("about", "# About us")
+        request({"command": "build", "paths": [self.path("content", "about.md")]}, self.socket_path)
+        self.assertEqual(request({"command": "stop"}, self.socket_path), {"ok": True, "stop": True})
+        self.assertEqual(self.daemon.wait(timeout=30), 0)
+        self.assertFalse(os.path.exists(self.socket_path))
+
+        result = subprocess.run(
+            [sys.executable, CLI, "build", "--workers", "1"],
+            cwd=self.root, capture_output=True, text=True, check=True,
+        )
+        self.assertNotIn("Generating page", result.stdout)
+
+    def test_unknown_command(self):
+        response = request({"command": "deploy"}, self.socket_path)
+        self.assertEqual(response, {"ok": False, "error": "Unknown command: 'deploy'"})
+
+
+if __name__ == "__main__":
+    unittest.main()
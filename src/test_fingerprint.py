@@ -0,0 +1,89 @@
+import os
+import json
+import tempfile
+import unittest
+
+from fingerprint import AssetManifest, fingerprint_directory, fingerprinted_path
+from htmlnode import LeafNode, ParentNode
+from main import generate_page
+from manifest import BuildManifest
+from template import Template
+
+
+class TestFingerprint(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        self.static_dir = os.path.join(self.root, "static")
+        self.dest_dir = os.path.join(self.root, "public")
+        os.makedirs(os.path.join(self.static_dir, "images"))
+        self.write("static/index.css", "body { margin: 0; }")
+        self.write("static/images/logo.png", "png")
+        self.manifest = BuildManifest(os.path.join(self.root, "manifest.json"), generator="test")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, relative_path, content):
+        with open(os.path.join(self.root, relative_path), "w", encoding="utf-8") as f:
+            f.write(content)
+
+    def test_fingerprinted_path(self):
+        self.assertEqual(fingerprinted_path("css/site.css", "3fa9c1d2e4"), "css/site.3fa9c1d2.css")
+
+    def test_fingerprint_directory_writes_copies_and_manifest(self):
+        assets = fingerprint_directory(self.static_dir, self.dest_dir, self.manifest)
+        css_url = assets.urls["/index.css"]
+        self.assertRegex(css_url, r"^/index\.[0-9a-f]{8}\.css$")
+        with open(os.path.join(self.dest_dir, css_url[1:]), encoding="utf-8") as f:
+            self.assertEqual(f.read(), "body { margin: 0; }")
+        with open(os.path.join(self.dest_dir, "asset-manifest.json"), encoding="utf-8") as f:
+            self.assertEqual(json.load(f), assets.urls)
+
+        self.write("static/index.css", "body { margin: 1em; }")
+        self.manifest.save()
+        manifest = BuildManifest(self.manifest.path, generator="test").load()
+        changed = fingerprint_directory(self.static_dir, self.dest_dir, manifest)
+        self.assertNotEqual(changed.urls["/index.css"], css_url)
+        manifest.prune()
+        self.assertFalse(os.path.exists(os.path.join(self.dest_dir, css_url[1:])))
+
+    def test_rewrite_props_and_template(self):
+        assets = AssetManifest("unused.json", {"/index.css": "/index.abcdef12.css", "/a.png": "/a.12345678.png"})
+        link = LeafNode("a", "style", {"href": "/index.css#top"})
+        image = LeafNode("img", "", {"src": "/a.png?v=1", "alt": "a"})
+        other = LeafNode("a", "page", {"href": "/about"})
+        assets.annotate(ParentNode("p", [link, image, other]))
+        self.assertEqual(link.props["href"], "/index.abcdef12.css#top")
+        self.assertEqual(image.props["src"], "/a.12345678.png?v=1")
+        self.assertEqual(other.props["href"], "/about")
+
+        template = Template('<link href="/index.css"><img src=\'/a.png\'>{{ Content }}')
+        rewritten = assets.template(template)
+        self.assertIs(assets.template(template), rewritten)
+        self.assertEqual(
+            rewritten.render({"Content": "x"}),
+            '<link href="/index.abcdef12.css"><img src=\'/a.12345678.png\'>x',
+        )
+
+    def test_asset_change_rerenders_pages(self):
+        os.makedirs(os.path.join(self.root, "content"))
+        self.write("content/index.md", "# Home")
+        self.write("template.html", '<link href="/index.css">{{ Content }}')
+        from_path = os.path.join(self.root, "content", "index.md")
+        template_path = os.path.join(self.root, "template.html")
+        dest_path = os.path.join(self.dest_dir, "index.html")
+
+        assets = fingerprint_directory(self.static_dir, self.dest_dir, self.manifest)
+        self.assertTrue(generate_page(from_path, template_path, dest_path, self.manifest, assets=assets))
+        self.assertFalse(generate_page(from_path, template_path, dest_path, self.manifest, assets=assets))
+
+        self.write("static/index.css", "body { margin: 1em; }")
+        assets = fingerprint_directory(self.static_dir, self.dest_dir, self.manifest)
+        self.assertTrue(generate_page(from_path, template_path, dest_path, self.manifest, assets=assets))
+        with open(dest_path, encoding="utf-8") as f:
+            self.assertIn(assets.urls["/index.css"], f.read())
+
+
+if __name__ == "__main__":
+    unittest.main()
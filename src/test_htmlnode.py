@@ -1,10 +1,22 @@
+import io
+import sys
 import unittest
+import tracemalloc
 from htmlnode import (
     HTMLNode, LeafNode, ParentNode, 
     BlockTypes, 
-    markdown_to_blocks, block_to_block_type, markdown_to_html_node
+    markdown_to_blocks, block_to_block_type, markdown_to_html_node,
+    iter_markdown_blocks, iter_classified_blocks, classify_block
 )
 
+def bytes_per_node(factory, count=10000):
+    tracemalloc.start()
+    nodes = [factory() for _ in range(count)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return (size - sys.getsizeof(nodes)) / count
+
+
 class TestHTMLNode(unittest.TestCase):
     def test_props(self):
         node = HTMLNode("a", "some link", None, {"href": "https://www.google.com", "target": "_blank"})
@@ -78,6 +90,40 @@ class TestHTMLNode(unittest.TestCase):
             "<h2><b>Bold text</b>Normal text<i>italic text</i>Normal text</h2>",
         )
 
+    def test_iter_html_yields_chunks(self):
+        node = ParentNode("div", [ParentNode("p", [LeafNode("b", "x")]), LeafNode(None, "y")])
+        chunks = list(node.iter_html())
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual("".join(chunks), node.to_html())
+
+    def test_write_html(self):
+        node = ParentNode("ul", [LeafNode("li", "one"), LeafNode("li", "two")])
+        stream = io.StringIO()
+        node.write_html(stream)
+        self.assertEqual(stream.getvalue(), "<ul><li>one</li><li>two</li></ul>")
+
+    def test_write_html_no_children(self):
+        node = ParentNode("div", [])
+        with self.assertRaises(ValueError):
+            node.write_html(io.StringIO())
+
+    def test_nodes_are_slotted(self):
+        for node in (HTMLNode("p"), LeafNode("p", "x"), ParentNode("div", [])):
+            self.assertFalse(hasattr(node, "__dict__"))
+
+    def test_node_memory_footprint(self):
+        class DictLeafNode:
+            def __init__(self, tag, value, props=None):
+                self.tag = tag
+                self.value = value
+                self.children = None
+                self.props = props
+
+        slotted = bytes_per_node(lambda: LeafNode("p", "text"))
+        unslotted = bytes_per_node(lambda: DictLeafNode("p", "text"))
+        self.assertLess(slotted, unslotted)
+        self.assertLessEqual(slotted, 8 * 8 + 16)
+
     
     # Test markdown_to_blocks function
     def test_markdown_to_blocks(self):
@@ -96,6 +142,41 @@ class TestHTMLNode(unittest.TestCase):
         except Exception as e:
             self.fail(f"An error occurred: {e}")
 
+    def test_markdown_to_blocks_fenced_code_keeps_blank_lines(self):
+        markdown = "Intro\n\n```\nfirst()\n\nsecond()\n```\n\nOutro"
+        self.assertEqual(
+            markdown_to_blocks(markdown),
+            ["Intro", "```\nfirst()\n\nsecond()\n```", "Outro"],
+        )
+
+    def test_iter_markdown_blocks_from_file(self):
+        with open("src/test_markdowns/test_1.md", "r") as file:
+            blocks = list(iter_markdown_blocks(file))
+        self.assertEqual(len(blocks), 3)
+        self.assertEqual(blocks[2], "* This is a list item\n* This is another list item")
+
+    def test_iter_classified_blocks(self):
+        lines = ["# Title", "", "> quote", "", "1. one", "2. two", ""]
+        self.assertEqual(
+            [block.block_type for block in iter_classified_blocks(lines)],
+            [BlockTypes.HEADING, BlockTypes.QUOTE, BlockTypes.OL],
+        )
+
+    def test_classify_heading_levels(self):
+        block = classify_block("# Title\n### C# tips\n######## Deep")
+        self.assertEqual(block.block_type, BlockTypes.HEADING)
+        self.assertEqual(block.items, [(1, "Title"), (3, "C# tips"), (6, "Deep")])
+
+    def test_classify_list_items(self):
+        self.assertEqual(classify_block("* a\n- b").items, ["a", "b"])
+        self.assertEqual(classify_block("1. a\n2. b.c").items, ["a", "b.c"])
+        self.assertEqual(classify_block("> a\n>b").items, ["a", "b"])
+
+    def test_classify_code_body(self):
+        block = classify_block("```\nx = 1\n\ny = 2\n```")
+        self.assertEqual(block.block_type, BlockTypes.CODE)
+        self.assertEqual(block.items, "x = 1\n\ny = 2")
+
     
     # Test block_to_block_type function
     def test_block_to_paragraph_type(self):
@@ -184,5 +265,69 @@ class TestHTMLNode(unittest.TestCase):
         expected_html = "<div><p>This is a paragraph.</p><p>This is another paragraph.</p></div>"
         self.assertEqual(html_node.to_html(), expected_html)
 
+    def test_inline_markup_in_every_block_type(self):
+        markdown = (
+            "## A **bold** heading\n\n"
+            "> quoted *italic*\n\n"
+            "* **Term**: defined\n- plain item\n\n"
+            "1. see [docs](/docs)\n\n"
+            "Text with `code` and ![logo](/logo.png)\n\n"
+            "```\n**not bold**\n```"
+        )
+        expected_html = (
+            "<div><h2>A <b>bold</b> heading</h2>"
+            "<blockquote><p>quoted <i>italic</i></p></blockquote>"
+            "<ul><li><b>Term</b>: defined</li><li>plain item</li></ul>"
+            '<ol><li>see <a href="/docs">docs</a></li></ol>'
+            '<p>Text with <code>code</code> and <img src="/logo.png" alt="logo"></p>'
+            "<pre><code>**not bold**</code></pre></div>"
+        )
+        self.assertEqual(markdown_to_html_node(markdown).to_html(), expected_html)
+
+    def test_serializer_escapes_text_and_attributes(self):
+        node = ParentNode("p", [
+            LeafNode(None, "a < b & c > d \"quoted\""),
+            LeafNode("a", "x", {"href": '/search?q=1&r="2"', "title": "plain"}),
+        ])
+        self.assertEqual(
+            node.to_html(),
+            '<p>a &lt; b &amp; c &gt; d "quoted"'
+            '<a href="/search?q=1&amp;r=&quot;2&quot;" title="plain">x</a></p>',
+        )
+
+    def test_code_block_is_escaped(self):
+        markdown = "```\nif (a < b && c) {}\n```"
+        self.assertEqual(
+            markdown_to_html_node(markdown).to_html(),
+            "<div><pre><code>if (a &lt; b &amp;&amp; c) {}</code></pre></div>",
+        )
+
+    def test_plain_span_keeps_single_leaf(self):
+        paragraph = markdown_to_html_node("No markup here.").children[0]
+        self.assertIsInstance(paragraph, LeafNode)
+
+    def test_stray_delimiters_render_as_text(self):
+        cases = {
+            "Price is 5 * 3 dollars": "<p>Price is 5 * 3 dollars</p>",
+            "snake_case * wildcard": "<p>snake_case * wildcard</p>",
+            "Run `make and wait": "<p>Run `make and wait</p>",
+            "* a ** b": "<ul><li>a ** b</li></ul>",
+        }
+        for markdown, expected in cases.items():
+            self.assertEqual(markdown_to_html_node(markdown).to_html(), f"<div>{expected}</div>")
+
+    def test_paragraph_starting_with_bold_is_not_a_list(self):
+        self.assertEqual(
+            markdown_to_html_node("**Bold** lead and more\nsecond line").to_html(),
+            "<div><p><b>Bold</b> lead and more\nsecond line</p></div>",
+        )
+        self.assertEqual(
+            markdown_to_html_node("*Italic* lead").to_html(), "<div><p><i>Italic</i> lead</p></div>"
+        )
+
+    def test_empty_spans_render_as_text(self):
+        self.assertEqual(markdown_to_html_node("a `` b").to_html(), "<div><p>a `` b</p></div>")
+        self.assertEqual(markdown_to_html_node("## x **** y").to_html(), "<div><h2>x **** y</h2></div>")
+
 if __name__ == "__main__":
     unittest.main()
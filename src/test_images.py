@@ -0,0 +1,143 @@
+import os
+import struct
+import tempfile
+import unittest
+
+from htmlnode import LeafNode, ParentNode, iter_markdown_html
+from images import ImagePipeline, image_size, pillow, variant_path
+from manifest import BuildManifest
+from render_cache import RenderCache
+
+
+def png_header(width, height):
+    return (
+        b"\x89PNG\r\n\x1a\n" + struct.pack(">I", 13) + b"IHDR"
+        + struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0)
+    )
+
+
+def jpeg_header(width, height):
+    app0 = b"\xff\xe0" + struct.pack(">H", 16) + b"JFIF\x00" + b"\x00" * 9
+    sof0 = b"\xff\xc0" + struct.pack(">HBHHB", 11, 8, height, width, 1) + b"\x01\x11\x00"
+    return b"\xff\xd8" + app0 + b"\xff" + sof0 + b"\xff\xd9"
+
+
+class TestImages(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.static_dir = os.path.join(self.tmp.name, "static")
+        self.content_dir = os.path.join(self.tmp.name, "content")
+        os.makedirs(os.path.join(self.static_dir, "images"))
+        self.write("images/wide.png", png_header(1600, 900))
+        self.write("images/photo.jpg", jpeg_header(640, 480))
+        self.write("images/anim.gif", b"GIF89a" + struct.pack("<HH", 32, 16))
+        self.write("images/broken.png", b"not an image")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, relative_path, data):
+        with open(os.path.join(self.static_dir, relative_path), "wb") as f:
+            f.write(data)
+
+    def test_image_size_reads_headers(self):
+        images_dir = os.path.join(self.static_dir, "images")
+        self.assertEqual(image_size(os.path.join(images_dir, "wide.png")), (1600, 900))
+        self.assertEqual(image_size(os.path.join(images_dir, "photo.jpg")), (640, 480))
+        self.assertEqual(image_size(os.path.join(images_dir, "anim.gif")), (32, 16))
+        self.assertIsNone(image_size(os.path.join(images_dir, "broken.png")))
+
+    def test_variant_path(self):
+        self.assertEqual(variant_path("/images/wide.png", 480), "/images/wide-480w.png")
+
+    def test_annotate_injects_dimensions(self):
+        pipeline = ImagePipeline(self.static_dir, self.content_dir)
+        from_path = os.path.join(self.content_dir, "blog", "post.md")
+        absolute = LeafNode("img", "", {"src": "/images/photo.jpg", "alt": "photo"})
+        relative = LeafNode("img", "", {"src": "../images/anim.gif", "alt": "anim"})
+        external = LeafNode("img", "", {"src": "https://example.com/a.png", "alt": "remote"})
+        pipeline.annotate(ParentNode("p", [absolute, ParentNode("b", [relative]), external]), from_path)
+        self.assertEqual(
+            absolute.props,
+            {"src": "/images/photo.jpg", "alt": "photo", "width": "640", "height": "480", "loading": "lazy"},
+        )
+        self.assertEqual((relative.props["width"], relative.props["height"]), ("32", "16"))
+        self.assertEqual(external.props, {"src": "https://example.com/a.png", "alt": "remote"})
+
+        pipeline.annotate(LeafNode("img", "", {"src": "/images/photo.jpg"}), from_path)
+        self.assertEqual(pipeline.stats(), {"probes": 2})
+
+    def test_image_blocks_bypass_render_cache(self):
+        pipeline = ImagePipeline(self.static_dir, self.content_dir)
+        from_path = os.path.join(self.content_dir, "index.md")
+        cache = RenderCache(salt="test")
+        lines = ["Plain text", "", "![wide](/images/wide.png)"]
+        html = "".join(iter_markdown_html(lines, cache, on_node=lambda node: pipeline.annotate(node, from_path)))
+        self.assertEqual(
+            html,
+            '<div><p>Plain text</p><p><img src="/images/wide.png" alt="wide" '
+            'width="1600" height="900" loading="lazy"></p></div>',
+        )
+        self.assertEqual(cache.stats()["misses"], 1)
+
+
+@unittest.skipUnless(pillow(), "Pillow is not installed")
+class TestImageVariants(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.static_dir = os.path.join(self.tmp.name, "static")
+        self.dest_dir = os.path.join(self.tmp.name, "public")
+        self.cache_dir = os.path.join(self.tmp.name, "cache")
+        self.manifest_path = os.path.join(self.tmp.name, "manifest.json")
+        os.makedirs(os.path.join(self.static_dir, "images"))
+        self.source_path = os.path.join(self.static_dir, "images", "wide.png")
+        pillow().new("RGB", (64, 32), "teal").save(self.source_path)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def variant(self, width):
+        return os.path.join(self.dest_dir, "images", f"wide-{width}w.png")
+
+    def generate(self, widths):
+        manifest = BuildManifest(self.manifest_path, generator="test").load()
+        pipeline = ImagePipeline(self.static_dir, "content", widths, self.cache_dir)
+        written = pipeline.generate_variants(self.dest_dir, 1, manifest)
+        manifest.prune()
+        manifest.save()
+        return written
+
+    def cached_files(self):
+        return {
+            os.path.join(dirpath, name): os.stat(os.path.join(dirpath, name)).st_mtime_ns
+            for dirpath, _, filenames in os.walk(self.cache_dir) for name in filenames
+        }
+
+    def test_resizes_and_reuses_cache(self):
+        # no variant is wider than the source
+        self.assertEqual(self.generate((16, 32, 128)), [self.variant(16), self.variant(32)])
+        self.assertEqual(image_size(self.variant(16)), (16, 8))
+        self.assertEqual(image_size(self.variant(32)), (32, 16))
+        self.assertFalse(os.path.exists(self.variant(128)))
+        self.assertEqual(self.generate((16, 32, 128)), [])
+
+        # a lost output is copied back from the cache without resizing again
+        cached = self.cached_files()
+        self.assertEqual(len(cached), 2)
+        os.remove(self.variant(16))
+        self.assertEqual(self.generate((16, 32)), [self.variant(16)])
+        self.assertEqual(self.cached_files(), cached)
+
+    def test_stale_variants_are_pruned(self):
+        self.generate((16, 32))
+        self.generate((32,))
+        self.assertFalse(os.path.exists(self.variant(16)))
+        self.assertTrue(os.path.exists(self.variant(32)))
+
+        os.remove(self.source_path)
+        self.generate((32,))
+        self.assertFalse(os.path.exists(os.path.join(self.dest_dir, "images")))
+
+
+if __name__ == "__main__":
+    unittest.main()
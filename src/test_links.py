@@ -0,0 +1,94 @@
+import os
+import tempfile
+import unittest
+
+from links import LinkIndex, collect_links, new_page_record, page_url, resolve_target
+from main import generate_pages_recursive
+
+
+class TestLinks(unittest.TestCase):
+    def test_page_url(self):
+        self.assertEqual(page_url(os.path.join("content", "index.md"), "content"), "/")
+        self.assertEqual(page_url(os.path.join("content", "blog", "index.md"), "content"), "/blog/")
+        self.assertEqual(page_url(os.path.join("content", "blog", "post.md"), "content"), "/blog/post")
+
+    def test_resolve_target(self):
+        self.assertIsNone(resolve_target("https://example.com/x", "/"))
+        self.assertIsNone(resolve_target("mailto:someone@example.com", "/"))
+        self.assertIsNone(resolve_target("#section", "/"))
+        self.assertEqual(resolve_target("/about", "/blog/post"), "/about")
+        self.assertEqual(resolve_target("other#part", "/blog/post"), "/blog/other")
+        self.assertEqual(resolve_target("../images/a.png", "/blog/"), "/images/a.png")
+        self.assertEqual(resolve_target("sub/", "/blog/"), "/blog/sub/")
+
+    def test_collect_links_skips_code_blocks(self):
+        record = new_page_record()
+        collect_links("See [about](/about) and ![logo](/logo.png)", record)
+        collect_links("```\n[not a link](/nowhere)\n```", record)
+        self.assertEqual(record, {"links": ["/about"], "images": ["/logo.png"]})
+
+    def test_check_reports_broken_links(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            content_dir = os.path.join(tmp, "content")
+            static_dir = os.path.join(tmp, "static")
+            os.makedirs(os.path.join(content_dir, "blog"))
+            os.makedirs(os.path.join(static_dir, "images"))
+            with open(os.path.join(static_dir, "images", "logo.png"), "wb") as f:
+                f.write(b"png")
+            pages = {
+                "index.md": "# Home\n\n[blog](/blog/) [post](blog/post) [gone](/missing)\n\n"
+                            "![logo](/images/logo.png) ![lost](/images/lost.png)",
+                "blog/index.md": "# Blog\n\n[home](../) [external](https://example.com)",
+                "blog/post.md": "# Post\n\n```\n[ignored](/nowhere)\n```",
+            }
+            for name, markdown in pages.items():
+                with open(os.path.join(content_dir, name), "w", encoding="utf-8") as f:
+                    f.write(markdown)
+            template_path = os.path.join(tmp, "template.html")
+            with open(template_path, "w", encoding="utf-8") as f:
+                f.write("{{ Content }}")
+
+            index = LinkIndex(os.path.join(tmp, "links.json"))
+            generate_pages_recursive(
+                content_dir, template_path, os.path.join(tmp, "public"), workers=1, link_index=index
+            )
+            index.save()
+            reloaded = LinkIndex(index.path).load()
+            source = os.path.join(content_dir, "index.md")
+            self.assertEqual(
+                reloaded.check(content_dir, static_dir),
+                [(source, "link", "/missing"), (source, "image", "/images/lost.png")],
+            )
+
+            # nothing changed: no page is resolved again, results persist
+            reloaded.save()
+            reloaded = LinkIndex(index.path).load()
+            self.assertEqual(reloaded.check(content_dir, static_dir), [])
+            self.assertEqual(reloaded.checked, set())
+            self.assertEqual(len(reloaded.broken()), 2)
+
+            # an added target re-checks only the page that links to it
+            with open(os.path.join(static_dir, "images", "lost.png"), "wb") as f:
+                f.write(b"png")
+            self.assertEqual(reloaded.check(content_dir, static_dir), [(source, "link", "/missing")])
+            self.assertEqual(reloaded.checked, {source})
+
+            # so does a removed one
+            os.remove(os.path.join(static_dir, "images", "logo.png"))
+            self.assertEqual(
+                reloaded.check(content_dir, static_dir),
+                [(source, "link", "/missing"), (source, "image", "/images/logo.png")],
+            )
+
+            # a changed record re-checks that page alone
+            post = os.path.join(content_dir, "blog", "post.md")
+            reloaded.update(post, "/blog/post", {"links": ["/gone"], "images": []})
+            reloaded.update(source, reloaded.pages[source]["url"], {
+                "links": reloaded.pages[source]["links"], "images": reloaded.pages[source]["images"],
+            })
+            self.assertEqual(reloaded.check(content_dir, static_dir), [(post, "link", "/gone")])
+            self.assertEqual(reloaded.checked, {post})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,233 @@
+import io
+import os
+import struct
+import tempfile
+import unittest
+import contextlib
+
+from images import ImagePipeline
+from links import LinkIndex
+from manifest import BuildManifest
+from search import SearchIndex
+from main import (
+    extract_title, read_front_matter, find_markdown_files,
+    generate_page, generate_pages_recursive, build_changed,
+)
+
+
+class TestMain(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        self.content_dir = os.path.join(self.root, "content")
+        self.template_path = os.path.join(self.root, "template.html")
+        with open(self.template_path, "w", encoding="utf-8") as f:
+            f.write("<title>{{ Title }}</title>{{ Content }}")
+        self.write("content/index.md", "# Home\n\nWelcome home.")
+        self.write("content/blog/first.md", "# First\n\n* one\n* two")
+        self.write("content/blog/nested/deep.md", "# Deep\n\n> quoted")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, relative_path, content):
+        path = os.path.join(self.root, relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(content)
+
+    def read_tree(self, dir_path):
+        tree = {}
+        for dirpath, _, filenames in os.walk(dir_path):
+            for name in filenames:
+                path = os.path.join(dirpath, name)
+                with open(path, encoding="utf-8") as f:
+                    tree[os.path.relpath(path, dir_path)] = f.read()
+        return tree
+
+    def test_extract_title(self):
+        self.assertEqual(extract_title("intro\n# Hello \n## Sub"), "Hello")
+
+    def test_extract_title_missing(self):
+        with self.assertRaises(ValueError):
+            extract_title("## Only a subheading")
+
+    def test_read_front_matter(self):
+        self.write("content/post.md", "---\ntitle: From front matter\nAuthor: Someone\n---\n# Heading\n")
+        with open(os.path.join(self.content_dir, "post.md"), encoding="utf-8") as f:
+            variables = read_front_matter(f)
+            self.assertEqual(f.readline(), "# Heading\n")
+        self.assertEqual(variables, {"title": "From front matter", "Author": "Someone"})
+
+    def test_read_front_matter_absent(self):
+        with open(os.path.join(self.content_dir, "index.md"), encoding="utf-8") as f:
+            self.assertEqual(read_front_matter(f), {})
+            self.assertEqual(f.readline(), "# Home\n")
+
+    def test_generate_page_front_matter_variables(self):
+        self.write("content/post.md", "---\nAuthor: Someone\n---\n# Post\n\nBody")
+        with open(self.template_path, "w", encoding="utf-8") as f:
+            f.write("{{ Title }} by {{ Author }}:{{ Content }}")
+        dest_path = os.path.join(self.root, "public", "post.html")
+        generate_page(os.path.join(self.content_dir, "post.md"), self.template_path, dest_path)
+        with open(dest_path, encoding="utf-8") as f:
+            self.assertEqual(f.read(), "Post by Someone:<div><h1>Post</h1><p>Body</p></div>")
+
+    def test_generate_page_escapes_title_and_front_matter(self):
+        self.write("content/post.md", "---\nAuthor: <b>Someone</b>\n---\n# Tom & Jerry <script>x</script>\n")
+        with open(self.template_path, "w", encoding="utf-8") as f:
+            f.write("<title>{{ Title }}</title>{{ Author }}:{{ Content }}")
+        dest_path = os.path.join(self.root, "public", "post.html")
+        generate_page(os.path.join(self.content_dir, "post.md"), self.template_path, dest_path)
+        with open(dest_path, encoding="utf-8") as f:
+            self.assertEqual(
+                f.read(),
+                "<title>Tom &amp; Jerry &lt;script&gt;x&lt;/script&gt;</title>&lt;b&gt;Someone&lt;/b&gt;:"
+                "<div><h1>Tom &amp; Jerry &lt;script&gt;x&lt;/script&gt;</h1></div>",
+            )
+
+    def test_find_markdown_files_sorted(self):
+        relative = [
+            os.path.relpath(path, self.content_dir)
+            for path in find_markdown_files(self.content_dir)
+        ]
+        self.assertEqual(
+            relative,
+            [
+                os.path.join("blog", "first.md"),
+                os.path.join("blog", "nested", "deep.md"),
+                "index.md",
+            ],
+        )
+
+    def test_generate_pages_recursive_mirrors_tree(self):
+        dest_dir = os.path.join(self.root, "public")
+        generate_pages_recursive(self.content_dir, self.template_path, dest_dir, workers=1)
+        tree = self.read_tree(dest_dir)
+        self.assertEqual(
+            sorted(tree),
+            sorted([
+                "index.html",
+                os.path.join("blog", "first.html"),
+                os.path.join("blog", "nested", "deep.html"),
+            ]),
+        )
+        self.assertEqual(
+            tree[os.path.join("blog", "first.html")],
+            "<title>First</title><div><h1>First</h1><ul><li>one</li><li>two</li></ul></div>",
+        )
+
+    def test_parallel_output_matches_sequential(self):
+        sequential_dir = os.path.join(self.root, "sequential")
+        parallel_dir = os.path.join(self.root, "parallel")
+        generate_pages_recursive(self.content_dir, self.template_path, sequential_dir, workers=1)
+        generate_pages_recursive(self.content_dir, self.template_path, parallel_dir, workers=3)
+        self.assertEqual(self.read_tree(sequential_dir), self.read_tree(parallel_dir))
+
+
+class TestBuildChanged(unittest.TestCase):
+    # build_changed works on the project layout relative to the working
+    # directory, as the watcher and daemon run it
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(self.tmp.name)
+        self.write("template.html", "<title>{{ Title }}</title>{{ Content }}")
+        self.write("static/style.css", "body {}")
+        self.write("content/index.md", "# Home\n\nSee [about](/about).")
+        self.write("content/about.md", "# About\n\nWritten by wombats.\n\n![logo](/logo.png)")
+        self.write_png("static/logo.png", 100, 50)
+        self.caches = {"images": ImagePipeline("static", "content")}
+        self.manifest = BuildManifest(".build-manifest.json")
+        self.link_index = LinkIndex(".link-index.json")
+        self.search_index = SearchIndex(".search-index.json")
+        self.build_changed(
+            self.paths("content/index.md", "content/about.md", "static/style.css", "static/logo.png")
+        )
+
+    def write(self, path, content):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(content)
+
+    def write_png(self, path, width, height):
+        with open(path, "wb") as f:
+            f.write(
+                b"\x89PNG\r\n\x1a\n" + struct.pack(">I", 13) + b"IHDR"
+                + struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0)
+            )
+
+    def read(self, path):
+        with open(path, encoding="utf-8") as f:
+            return f.read()
+
+    def paths(self, *paths):
+        return [os.path.join(*path.split("/")) for path in paths]
+
+    def terms(self):
+        return {term for page in self.search_index.pages.values() for term in page["terms"]}
+
+    def build_changed(self, changed_paths):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return build_changed(
+                changed_paths, self.manifest, 1, self.caches, self.link_index, self.search_index
+            )
+
+    def test_page_edit(self):
+        self.write("content/about.md", "# About us\n\nWritten by quokkas.")
+        self.assertEqual(self.build_changed(self.paths("content/about.md")), self.paths("public/about.html"))
+        self.assertIn("<title>About us</title>", self.read(os.path.join("public", "about.html")))
+        self.assertEqual(self.link_index.pages[os.path.join("content", "about.md")]["url"], "/about")
+        self.assertIn("quokkas", self.terms())
+        self.assertNotIn("wombats", self.terms())
+        # unchanged sources are left alone
+        self.assertEqual(self.build_changed(self.paths("content/about.md", "content/index.md")), [])
+
+    def test_page_deletion(self):
+        os.remove(os.path.join("content", "about.md"))
+        self.assertEqual(self.build_changed(self.paths("content/about.md")), [])
+        self.manifest.prune()
+        self.assertFalse(os.path.exists(os.path.join("public", "about.html")))
+        self.link_index.prune()
+        self.search_index.prune()
+        self.assertNotIn(os.path.join("content", "about.md"), self.link_index.pages)
+        self.assertNotIn("wombats", self.terms())
+        self.assertEqual(
+            self.link_index.check("content", "static"),
+            [(os.path.join("content", "index.md"), "link", "/about")],
+        )
+
+    def test_static_change(self):
+        self.write("static/style.css", "body { color: red }")
+        self.write("static/app.js", "run()")
+        self.assertEqual(
+            sorted(self.build_changed(self.paths("static/style.css", "static/app.js"))),
+            self.paths("public/app.js", "public/style.css"),
+        )
+        self.assertEqual(self.read(os.path.join("public", "style.css")), "body { color: red }")
+        os.remove(os.path.join("static", "app.js"))
+        self.assertEqual(self.build_changed(self.paths("static/app.js")), [])
+        self.manifest.prune()
+        self.assertFalse(os.path.exists(os.path.join("public", "app.js")))
+
+    def test_image_change(self):
+        self.assertIn('width="100" height="50"', self.read(os.path.join("public", "about.html")))
+        self.write_png("static/logo.png", 400, 300)
+        # only the page showing the image renders again
+        self.assertEqual(
+            self.build_changed(self.paths("static/logo.png")), self.paths("public/logo.png", "public/about.html")
+        )
+        self.assertIn('width="400" height="300"', self.read(os.path.join("public", "about.html")))
+
+    def test_template_change(self):
+        self.write("template.html", "<main>{{ Content }}</main>")
+        self.assertEqual(
+            sorted(self.build_changed(["template.html"])),
+            self.paths("public/about.html", "public/index.html"),
+        )
+        self.assertTrue(self.read(os.path.join("public", "index.html")).startswith("<main><div><h1>Home"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+import os
+import struct
+import tempfile
+import unittest
+
+from images import ImagePipeline
+from manifest import BuildManifest
+from main import copy_directory_contents, generate_page
+
+
+class TestBuildManifest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        self.manifest_path = os.path.join(self.root, "manifest.json")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, relative_path, content):
+        path = os.path.join(self.root, relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(content)
+        return path
+
+    def read(self, path):
+        with open(path, encoding="utf-8") as f:
+            return f.read()
+
+    def build(self, markdown_path, template_path, dest_path, images=None):
+        manifest = BuildManifest(self.manifest_path, generator="test").load()
+        generated = generate_page(markdown_path, template_path, dest_path, manifest, images=images)
+        manifest.prune()
+        manifest.save()
+        return generated
+
+    def test_unchanged_page_is_skipped(self):
+        markdown_path = self.write("content/index.md", "# Title\n\nBody")
+        template_path = self.write("template.html", "{{ Title }}|{{ Content }}")
+        dest_path = os.path.join(self.root, "public", "index.html")
+        self.assertTrue(self.build(markdown_path, template_path, dest_path))
+        self.assertFalse(self.build(markdown_path, template_path, dest_path))
+
+    def test_changed_template_regenerates_page(self):
+        markdown_path = self.write("content/index.md", "# Title\n\nBody")
+        template_path = self.write("template.html", "{{ Title }}|{{ Content }}")
+        dest_path = os.path.join(self.root, "public", "index.html")
+        self.build(markdown_path, template_path, dest_path)
+        self.write("template.html", "<h1>{{ Title }}</h1>{{ Content }}")
+        self.assertTrue(self.build(markdown_path, template_path, dest_path))
+        with open(dest_path, encoding="utf-8") as f:
+            self.assertTrue(f.read().startswith("<h1>Title</h1>"))
+
+    def test_changed_generator_regenerates_page(self):
+        markdown_path = self.write("content/index.md", "# Title\n\nBody")
+        template_path = self.write("template.html", "{{ Title }}|{{ Content }}")
+        dest_path = os.path.join(self.root, "public", "index.html")
+        self.build(markdown_path, template_path, dest_path)
+        manifest = BuildManifest(self.manifest_path, generator="other").load()
+        self.assertFalse(manifest.is_fresh(dest_path, [markdown_path, template_path]))
+
+    def test_changed_image_regenerates_page(self):
+        markdown_path = self.write("content/index.md", "# Title\n\n![logo](/logo.png)")
+        template_path = self.write("template.html", "{{ Content }}")
+        dest_path = os.path.join(self.root, "public", "index.html")
+        images = ImagePipeline(os.path.join(self.root, "static"), os.path.join(self.root, "content"))
+        self.assertTrue(self.build(markdown_path, template_path, dest_path, images))
+        self.assertNotIn("width=", self.read(dest_path))
+
+        # the image appearing, changing size and going away each count
+        os.makedirs(os.path.join(self.root, "static"))
+        for width, height in ((100, 50), (400, 300)):
+            with open(os.path.join(self.root, "static", "logo.png"), "wb") as f:
+                f.write(
+                    b"\x89PNG\r\n\x1a\n" + struct.pack(">I", 13) + b"IHDR"
+                    + struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0)
+                )
+            self.assertTrue(self.build(markdown_path, template_path, dest_path, images))
+            self.assertIn(f'width="{width}" height="{height}"', self.read(dest_path))
+            self.assertFalse(self.build(markdown_path, template_path, dest_path, images))
+        os.remove(os.path.join(self.root, "static", "logo.png"))
+        self.assertTrue(self.build(markdown_path, template_path, dest_path, images))
+        self.assertNotIn("width=", self.read(dest_path))
+
+    def test_changed_settings_are_stale(self):
+        markdown_path = self.write("content/index.md", "# Title")
+        output_path = self.write("public/index.html", "<h1>Title</h1>")
+        manifest = BuildManifest(self.manifest_path, generator="test")
+        manifest.record(output_path, [markdown_path], settings="image-widths=320")
+        self.assertTrue(manifest.is_fresh(output_path, [markdown_path], "image-widths=320"))
+        self.assertFalse(manifest.is_fresh(output_path, [markdown_path], "image-widths=320,640"))
+        self.assertFalse(manifest.is_fresh(output_path, [markdown_path]))
+
+    def test_removed_source_deletes_output(self):
+        source_dir = os.path.join(self.root, "static")
+        dest_dir = os.path.join(self.root, "public")
+        self.write("static/keep.css", "body {}")
+        removed = self.write("static/images/old.png", "png")
+
+        manifest = BuildManifest(self.manifest_path, generator="test").load()
+        copy_directory_contents(source_dir, dest_dir, manifest)
+        manifest.prune()
+        manifest.save()
+        self.assertTrue(os.path.exists(os.path.join(dest_dir, "images", "old.png")))
+
+        os.remove(removed)
+        manifest = BuildManifest(self.manifest_path, generator="test").load()
+        copy_directory_contents(source_dir, dest_dir, manifest)
+        manifest.prune()
+        manifest.save()
+        self.assertFalse(os.path.exists(os.path.join(dest_dir, "images")))
+        self.assertTrue(os.path.exists(os.path.join(dest_dir, "keep.css")))
+
+
+if __name__ == "__main__":
+    unittest.main()
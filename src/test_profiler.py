@@ -0,0 +1,52 @@
+import os
+import tempfile
+import unittest
+
+from profiler import BuildProfiler
+from main import profile_page
+
+
+class TestBuildProfiler(unittest.TestCase):
+    def test_phase_records_page_and_totals(self):
+        profiler = BuildProfiler()
+        with profiler.phase("read", "a.md"):
+            pass
+        with profiler.phase("read", "b.md"):
+            sum(range(10000))
+        report = profiler.to_json(top=1)
+        self.assertEqual(report["phases"]["read"]["calls"], 2)
+        self.assertEqual(set(report["pages"]), {"a.md", "b.md"})
+        self.assertEqual(len(report["slowest_pages"]), 1)
+
+    def test_profile_page(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            from_path = os.path.join(tmp, "index.md")
+            template_path = os.path.join(tmp, "template.html")
+            dest_path = os.path.join(tmp, "public", "index.html")
+            with open(from_path, "w", encoding="utf-8") as f:
+                f.write("# Title\n\n* a\n* b\n\n> quote")
+            with open(template_path, "w", encoding="utf-8") as f:
+                f.write("{{ Title }}{{ Content }}")
+
+            profiler = BuildProfiler()
+            profile_page(from_path, template_path, dest_path, profiler)
+            with open(dest_path, encoding="utf-8") as f:
+                self.assertEqual(
+                    f.read(),
+                    "Title<div><h1>Title</h1><ul><li>a</li><li>b</li></ul>"
+                    "<blockquote><p>quote</p></blockquote></div>",
+                )
+
+        report = profiler.to_json()
+        self.assertEqual(
+            set(report["pages"][from_path]["phases"]),
+            {"read", "block_split", "block_typing", "inline_parsing", "serialize", "templating", "write"},
+        )
+        self.assertEqual(set(report["block_types"]), {"heading", "unordered_list", "quote"})
+        trace = profiler.to_trace()
+        self.assertTrue(all(event["ph"] == "X" for event in trace["traceEvents"]))
+        self.assertEqual(trace["traceEvents"][0]["cname"], "terrible")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+import tempfile
+import unittest
+
+from htmlnode import iter_markdown_html, render_block_html
+from render_cache import RenderCache
+
+MARKDOWN = "# Title\n\nShared footer.\n\n* a\n* b\n\nShared footer."
+
+
+class TestRenderCache(unittest.TestCase):
+    def test_output_matches_uncached(self):
+        cache = RenderCache(salt="test")
+        lines = MARKDOWN.split("\n")
+        self.assertEqual(
+            "".join(iter_markdown_html(lines, cache)),
+            "".join(iter_markdown_html(lines)),
+        )
+
+    def test_repeated_block_hits(self):
+        cache = RenderCache(salt="test")
+        "".join(iter_markdown_html(MARKDOWN.split("\n"), cache))
+        self.assertEqual(cache.stats(), {"hits": 1, "disk_hits": 0, "misses": 3})
+
+    def test_lru_eviction(self):
+        cache = RenderCache(maxsize=2, salt="test")
+        for block in ("one", "two", "one", "three"):
+            cache.render(block, render_block_html)
+        self.assertEqual(list(cache.entries), [cache.key("one"), cache.key("three")])
+
+    def test_disk_store_survives_between_builds(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            RenderCache(path=tmp, salt="test").render("Footer", render_block_html)
+            cache = RenderCache(path=tmp, salt="test")
+            self.assertEqual(cache.render("Footer", render_block_html), "<p>Footer</p>")
+            self.assertEqual(cache.stats(), {"hits": 0, "disk_hits": 1, "misses": 0})
+
+            other = RenderCache(path=tmp, salt="changed generator")
+            other.render("Footer", render_block_html)
+            self.assertEqual(other.stats()["misses"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
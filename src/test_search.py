@@ -0,0 +1,116 @@
+import os
+import json
+import tempfile
+import unittest
+
+from main import generate_pages_recursive
+from search import SearchIndex, collect_terms, decode_positions, encode_positions, shard_name
+
+
+class TestSearch(unittest.TestCase):
+    def test_collect_terms_positions(self):
+        record = {}
+        collect_terms("# The Shire", record)
+        collect_terms("Back to [the shire](/shire) and ![map](/images/map.png)", record)
+        self.assertEqual(
+            record["terms"],
+            {"the": [0, 4], "shire": [1, 5], "back": [2], "to": [3], "and": [6], "map": [7]},
+        )
+        self.assertEqual(record["words"], 8)
+
+    def test_collect_terms_code_block(self):
+        record = {}
+        collect_terms("```\nprint(value)\n```", record)
+        self.assertEqual(record["terms"], {"print": [0], "value": [1]})
+
+    def test_shard_name(self):
+        self.assertEqual(shard_name("rings", 2), "ri")
+        self.assertEqual(shard_name("a", 2), "a")
+        self.assertEqual(shard_name("élan", 2), "_")
+
+    def test_encode_positions(self):
+        self.assertEqual(encode_positions([3, 7, 20]), [3, 4, 13])
+        self.assertEqual(decode_positions(encode_positions([3, 7, 20])), [3, 7, 20])
+
+    def test_parallel_index_matches_sequential(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            content_dir = os.path.join(tmp, "content")
+            os.makedirs(os.path.join(content_dir, "blog"))
+            pages = {
+                "index.md": "# Home\n\nRings and rivers.",
+                "blog/index.md": "# Blog\n\nRivers of the shire.",
+                "blog/post.md": "# Post\n\n* ring\n* river",
+            }
+            for name, markdown in pages.items():
+                with open(os.path.join(content_dir, name), "w", encoding="utf-8") as f:
+                    f.write(markdown)
+            template_path = os.path.join(tmp, "template.html")
+            with open(template_path, "w", encoding="utf-8") as f:
+                f.write("{{ Content }}")
+
+            outputs = []
+            for workers in (1, 3):
+                index = SearchIndex(os.path.join(tmp, f"search-{workers}.json"))
+                generate_pages_recursive(
+                    content_dir, template_path, os.path.join(tmp, f"public-{workers}"),
+                    workers=workers, search_index=index,
+                )
+                search_dir = os.path.join(tmp, f"search-{workers}")
+                index.write(search_dir)
+                files = {}
+                for name in sorted(os.listdir(search_dir)):
+                    with open(os.path.join(search_dir, name), encoding="utf-8") as f:
+                        files[name] = f.read()
+                outputs.append(files)
+            self.assertEqual(outputs[0], outputs[1])
+
+            meta = json.loads(outputs[0]["_index.json"])
+            self.assertEqual(meta["pages"], [["/", "Home"], ["/blog/", "Blog"], ["/blog/post", "Post"]])
+            self.assertEqual(json.loads(outputs[0]["ri.json"])["rivers"], [[0, [3]], [1, [1]]])
+            self.assertEqual(json.loads(outputs[0]["ri.json"])["ring"], [[2, [1]]])
+
+            self.assertEqual(index.write(search_dir), [])
+            os.remove(os.path.join(content_dir, "blog", "post.md"))
+            index.prune()
+            index.write(search_dir)
+            self.assertNotIn("po.json", os.listdir(search_dir))
+
+    def read_dir(self, dir_path):
+        files = {}
+        for name in os.listdir(dir_path):
+            with open(os.path.join(dir_path, name), encoding="utf-8") as f:
+                files[name] = f.read()
+        return files
+
+    def test_incremental_write_matches_full_write(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            index = SearchIndex(None)
+            for name, text in (("a", "Rings and rivers"), ("b", "Rivers of the shire"), ("c", "Post about zebras")):
+                record = {"title": name}
+                collect_terms(text, record)
+                index.update(name, f"/{name}", record)
+            search_dir = os.path.join(tmp, "search")
+            index.write(search_dir)
+
+            record = {"title": "b"}
+            collect_terms("Rivers of the shire and quokkas", record)
+            index.update("b", "/b", record)
+            record = {"title": "c"}
+            collect_terms("Post about rivers", record)
+            index.update("c", "/c", record)
+            self.assertEqual(index.dirty, {"ri", "of", "th", "sh", "an", "qu", "po", "ab", "ze"})
+            written = index.write(search_dir)
+            # the other dirty shards encode to the same bytes
+            self.assertEqual(
+                sorted(os.path.basename(path) for path in written), ["_index.json", "an.json", "qu.json", "ri.json"]
+            )
+
+            full = SearchIndex(None)
+            full.pages = dict(index.pages)
+            full.write(os.path.join(tmp, "full"))
+            self.assertEqual(self.read_dir(search_dir), self.read_dir(os.path.join(tmp, "full")))
+            self.assertNotIn("ze.json", os.listdir(search_dir))
+
+
+if __name__ == "__main__":
+    unittest.main()
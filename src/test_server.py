@@ -0,0 +1,246 @@
+import os
+import sys
+import gzip
+import json
+import tempfile
+import threading
+import unittest
+import functools
+import http.client
+import email.utils
+from http.server import ThreadingHTTPServer
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from server import (
+    LIVERELOAD_PATH, IMMUTABLE_CACHE_CONTROL, ASSET_MANIFEST_NAME,
+    CORSHTTPRequestHandler, LiveReload, parse_range,
+)
+
+BODY = b"0123456789" * 10
+
+
+class QuietHandler(CORSHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+class TestParseRange(unittest.TestCase):
+    def test_ranges(self):
+        self.assertEqual(parse_range("bytes=0-9", 100), (0, 9))
+        self.assertEqual(parse_range("bytes=90-", 100), (90, 99))
+        self.assertEqual(parse_range("bytes=95-200", 100), (95, 99))
+        self.assertEqual(parse_range("bytes=-10", 100), (90, 99))
+        self.assertEqual(parse_range("bytes=-500", 100), (0, 99))
+
+    def test_unsatisfiable(self):
+        for byte_range in ("bytes=100-", "bytes=9-3", "bytes=-0", "bytes=-", "bytes=0-1,5-6", "items=0-9"):
+            self.assertIsNone(parse_range(byte_range, 100), byte_range)
+        self.assertIsNone(parse_range("bytes=0-9", 0))
+
+
+class TestServer(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        self.write("page.txt", BODY)
+        self.httpd = ThreadingHTTPServer(
+            ("127.0.0.1", 0), functools.partial(QuietHandler, directory=self.root)
+        )
+        self.thread = threading.Thread(target=self.httpd.serve_forever, args=(0.01,), daemon=True)
+        self.thread.start()
+
+    def tearDown(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        self.thread.join()
+        self.tmp.cleanup()
+
+    def write(self, name, data, mtime=None):
+        path = os.path.join(self.root, name)
+        with open(path, "wb") as f:
+            f.write(data)
+        if mtime is not None:
+            os.utime(path, (mtime, mtime))
+        return path
+
+    def get(self, path="/page.txt", **headers):
+        connection = http.client.HTTPConnection(*self.httpd.server_address, timeout=10)
+        try:
+            connection.request("GET", path, headers={k.replace("_", "-"): v for k, v in headers.items()})
+            response = connection.getresponse()
+            return response, response.read()
+        finally:
+            connection.close()
+
+    def test_full_response_headers(self):
+        response, body = self.get()
+        self.assertEqual((response.status, body), (200, BODY))
+        self.assertEqual(response.getheader("Content-Length"), str(len(BODY)))
+        self.assertEqual(response.getheader("Accept-Ranges"), "bytes")
+        self.assertEqual(response.getheader("Vary"), "Accept-Encoding")
+        self.assertIsNone(response.getheader("Content-Encoding"))
+        self.assertTrue(response.getheader("ETag"))
+
+    def test_not_modified_from_etag(self):
+        etag = self.get()[0].getheader("ETag")
+        response, body = self.get(If_None_Match=etag)
+        self.assertEqual((response.status, body), (304, b""))
+        self.assertEqual(response.getheader("ETag"), etag)
+        self.assertEqual(response.getheader("Vary"), "Accept-Encoding")
+        response, body = self.get(If_None_Match='"stale"')
+        self.assertEqual((response.status, body), (200, BODY))
+
+    def test_not_modified_since(self):
+        last_modified = self.get()[0].getheader("Last-Modified")
+        self.assertEqual(self.get(If_Modified_Since=last_modified)[0].status, 304)
+        earlier = email.utils.formatdate(
+            email.utils.parsedate_to_datetime(last_modified).timestamp() - 60, usegmt=True
+        )
+        self.assertEqual(self.get(If_Modified_Since=earlier)[0].status, 200)
+        # If-None-Match takes precedence over the date
+        self.assertEqual(self.get(If_Modified_Since=last_modified, If_None_Match='"stale"')[0].status, 200)
+
+    def test_partial_content(self):
+        response, body = self.get(Range="bytes=10-19")
+        self.assertEqual((response.status, body), (206, BODY[10:20]))
+        self.assertEqual(response.getheader("Content-Range"), f"bytes 10-19/{len(BODY)}")
+        self.assertEqual(response.getheader("Content-Length"), "10")
+
+    def test_suffix_range(self):
+        response, body = self.get(Range="bytes=-5")
+        self.assertEqual((response.status, body), (206, BODY[-5:]))
+        self.assertEqual(response.getheader("Content-Range"), f"bytes 95-99/{len(BODY)}")
+
+    def test_unsatisfiable_range(self):
+        response, body = self.get(Range="bytes=500-")
+        self.assertEqual((response.status, body), (416, b""))
+        self.assertEqual(response.getheader("Content-Range"), f"bytes */{len(BODY)}")
+
+    def test_if_range(self):
+        etag = self.get()[0].getheader("ETag")
+        response, body = self.get(Range="bytes=0-4", If_Range=etag)
+        self.assertEqual((response.status, body), (206, BODY[:5]))
+        # the client's copy is stale: send the whole new file instead
+        response, body = self.get(Range="bytes=0-4", If_Range='"stale"')
+        self.assertEqual((response.status, body), (200, BODY))
+        self.assertIsNone(response.getheader("Content-Range"))
+
+    def test_precompressed_sibling(self):
+        source = os.stat(os.path.join(self.root, "page.txt")).st_mtime
+        self.write("page.txt.gz", gzip.compress(BODY), mtime=source + 1)
+        response, body = self.get(Accept_Encoding="gzip, deflate")
+        self.assertEqual(response.status, 200)
+        self.assertEqual(response.getheader("Content-Encoding"), "gzip")
+        self.assertEqual(response.getheader("Vary"), "Accept-Encoding")
+        self.assertEqual(response.getheader("Content-Type"), "text/plain")
+        self.assertEqual(gzip.decompress(body), BODY)
+
+        # clients that do not accept gzip get the source
+        response, body = self.get(Accept_Encoding="br")
+        self.assertEqual(body, BODY)
+        self.assertIsNone(response.getheader("Content-Encoding"))
+
+    def test_stale_precompressed_sibling_ignored(self):
+        source = os.stat(os.path.join(self.root, "page.txt")).st_mtime
+        self.write("page.txt.gz", gzip.compress(b"old contents"), mtime=source - 60)
+        response, body = self.get(Accept_Encoding="gzip")
+        self.assertEqual(body, BODY)
+        self.assertIsNone(response.getheader("Content-Encoding"))
+
+    def test_range_skips_precompressed_sibling(self):
+        source = os.stat(os.path.join(self.root, "page.txt")).st_mtime
+        self.write("page.txt.gz", gzip.compress(BODY), mtime=source + 1)
+        response, body = self.get(Accept_Encoding="gzip", Range="bytes=0-9")
+        self.assertEqual((response.status, body), (206, BODY[:10]))
+        self.assertIsNone(response.getheader("Content-Encoding"))
+
+    def test_immutable_only_for_fingerprinted_assets(self):
+        self.write("style.0123abcd.css", b"body {}")
+        self.write("notes.20241015.html", b"<h1>Notes</h1>")
+        self.write(ASSET_MANIFEST_NAME, json.dumps({"/style.css": "/style.0123abcd.css"}).encode("utf-8"))
+        response, _ = self.get("/style.0123abcd.css")
+        self.assertEqual(response.getheader("Cache-Control"), IMMUTABLE_CACHE_CONTROL)
+        self.assertEqual(self.get("/style.0123abcd.css?v=1")[0].getheader("Cache-Control"), IMMUTABLE_CACHE_CONTROL)
+        for path in ("/notes.20241015.html", "/page.txt", "/style.css"):
+            self.assertIsNone(self.get(path)[0].getheader("Cache-Control"), path)
+
+        # the manifest is read again once the build rewrites it
+        mtime = os.stat(os.path.join(self.root, ASSET_MANIFEST_NAME)).st_mtime
+        self.write(
+            ASSET_MANIFEST_NAME, json.dumps({"/notes.html": "/notes.20241015.html"}).encode("utf-8"), mtime=mtime + 1,
+        )
+        self.assertIsNone(self.get("/style.0123abcd.css")[0].getheader("Cache-Control"))
+        self.assertEqual(self.get("/notes.20241015.html")[0].getheader("Cache-Control"), IMMUTABLE_CACHE_CONTROL)
+
+    def test_no_asset_manifest(self):
+        self.write("style.0123abcd.css", b"body {}")
+        self.assertIsNone(self.get("/style.0123abcd.css")[0].getheader("Cache-Control"))
+
+    def test_directory_index(self):
+        os.makedirs(os.path.join(self.root, "blog"))
+        self.write(os.path.join("blog", "index.html"), b"<h1>Blog</h1>")
+        response, body = self.get("/blog/")
+        self.assertEqual((response.status, body), (200, b"<h1>Blog</h1>"))
+        self.assertTrue(response.getheader("ETag"))
+        self.assertEqual(self.get("/blog")[0].status, 301)
+        self.assertEqual(self.get("/missing.txt")[0].status, 404)
+
+
+class TestLiveReload(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        with open(os.path.join(self.tmp.name, "index.html"), "w", encoding="utf-8") as f:
+            f.write("<h1>Home</h1></body>")
+        handler_class = type("LiveReloadHandler", (QuietHandler,), {"livereload": LiveReload()})
+        self.livereload = handler_class.livereload
+        self.httpd = ThreadingHTTPServer(
+            ("127.0.0.1", 0), functools.partial(handler_class, directory=self.tmp.name)
+        )
+        self.thread = threading.Thread(target=self.httpd.serve_forever, args=(0.01,), daemon=True)
+        self.thread.start()
+
+    def tearDown(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        self.thread.join()
+        self.tmp.cleanup()
+
+    def test_pages_load_the_client(self):
+        connection = http.client.HTTPConnection(*self.httpd.server_address, timeout=10)
+        connection.request("GET", "/")
+        body = connection.getresponse().read().decode("utf-8")
+        connection.close()
+        self.assertIn(LIVERELOAD_PATH, body)
+        self.assertTrue(body.endswith("</script></body>"))
+
+    def test_notify_reaches_connected_client(self):
+        connection = http.client.HTTPConnection(*self.httpd.server_address, timeout=10)
+        self.addCleanup(connection.close)
+        connection.request("GET", LIVERELOAD_PATH)
+        response = connection.getresponse()
+        self.assertEqual(response.getheader("Content-Type"), "text/event-stream")
+
+        # the handler may not be waiting yet, so keep notifying until the
+        # event arrives
+        received = threading.Event()
+
+        def notify():
+            while not received.wait(0.02):
+                self.livereload.notify()
+
+        notifier = threading.Thread(target=notify, daemon=True)
+        notifier.start()
+        try:
+            line = response.fp.readline()
+        finally:
+            received.set()
+            notifier.join()
+        self.assertEqual(line, b"event: reload\n")
+        self.assertTrue(response.fp.readline().startswith(b"data: "))
+
+
+if __name__ == "__main__":
+    unittest.main()
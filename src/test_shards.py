@@ -0,0 +1,115 @@
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+import subprocess
+
+from shards import parse_shard, shard_of
+
+MAIN = os.path.join(os.path.dirname(os.path.abspath(__file__)), "main.py")
+
+
+class TestShards(unittest.TestCase):
+    def test_parse_shard(self):
+        self.assertEqual(parse_shard("2/4"), (2, 4))
+        for value in ("4/4", "-1/4", "1/0", "x/2"):
+            with self.assertRaises(ValueError):
+                parse_shard(value)
+
+    def test_shard_of_is_stable_and_spread(self):
+        paths = [f"blog/post{i}.md" for i in range(300)]
+        assignments = [shard_of(path, 4) for path in paths]
+        self.assertEqual(assignments, [shard_of(path, 4) for path in paths])
+        self.assertEqual(shard_of(os.path.join("blog", "post1.md"), 4), shard_of("blog/post1.md", 4))
+        for index in range(4):
+            self.assertGreater(assignments.count(index), 40)
+
+    def read_tree(self, dir_path):
+        tree = {}
+        for dirpath, _, filenames in os.walk(dir_path):
+            for name in filenames:
+                path = os.path.join(dirpath, name)
+                with open(path, "rb") as f:
+                    tree[os.path.relpath(path, dir_path)] = f.read()
+        return tree
+
+    def run_main(self, root, *args):
+        return subprocess.Popen(
+            [sys.executable, MAIN, "--workers", "1", *args],
+            cwd=root, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+
+    def test_merged_shards_match_single_build(self):
+        with tempfile.TemporaryDirectory() as root:
+            os.makedirs(os.path.join(root, "static"))
+            with open(os.path.join(root, "static", "index.css"), "w", encoding="utf-8") as f:
+                f.write("body { margin: 0; }")
+            with open(os.path.join(root, "template.html"), "w", encoding="utf-8") as f:
+                f.write('<title>{{ Title }}</title><link href="/index.css">{{ Content }}')
+            for i in range(12):
+                path = os.path.join(root, "content", f"section{i % 3}", f"page{i}.md")
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path, "w", encoding="utf-8") as f:
+                    f.write(f"# Page {i}\n\nSee [next](/section{(i + 1) % 3}/page{(i + 1) % 12}) and **page {i}**.")
+
+            self.assertEqual(self.run_main(root).wait(), 0)
+            single = self.read_tree(os.path.join(root, "public"))
+            shutil.rmtree(os.path.join(root, "public"))
+
+            # each shard is a separate process, as on separate CI runners
+            processes = [self.run_main(root, "--shard", f"{index}/3") for index in range(3)]
+            self.assertEqual([process.wait() for process in processes], [0, 0, 0])
+            self.assertEqual(self.run_main(root, "--merge", "3").wait(), 0)
+            merged = self.read_tree(os.path.join(root, "public"))
+
+            self.assertEqual(sorted(merged), sorted(single))
+            self.assertEqual(merged, single)
+            self.assertIn("sitemap.xml", merged)
+            self.assertIn(os.path.join("search", "_index.json"), merged)
+
+    def write_page(self, root, relative_path, markdown):
+        path = os.path.join(root, "content", relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(markdown)
+
+    def build_shards(self, root, count):
+        processes = [self.run_main(root, "--shard", f"{index}/{count}") for index in range(count)]
+        self.assertEqual([process.wait() for process in processes], [0] * count)
+        self.assertEqual(self.run_main(root, "--merge", str(count)).wait(), 0)
+        return self.read_tree(os.path.join(root, "public"))
+
+    def test_merge_publishes_changed_search_terms(self):
+        with tempfile.TemporaryDirectory() as root:
+            os.makedirs(os.path.join(root, "static"))
+            with open(os.path.join(root, "template.html"), "w", encoding="utf-8") as f:
+                f.write("<title>{{ Title }}</title>{{ Content }}")
+            self.write_page(root, "index.md", "# Home\n\nA zebra.")
+            self.write_page(root, "about.md", "# About\n\nA wombat.")
+            self.build_shards(root, 2)
+
+            self.write_page(root, "index.md", "# Home\n\nA zebra quokka.")
+            merged = self.build_shards(root, 2)
+            self.assertIn(b"quokka", merged["index.html"])
+            search = [data for path, data in merged.items() if path.startswith("search" + os.sep)]
+            self.assertTrue(any(b"quokka" in data for data in search))
+
+    def test_more_shards_than_pages(self):
+        with tempfile.TemporaryDirectory() as root:
+            os.makedirs(os.path.join(root, "static"))
+            with open(os.path.join(root, "template.html"), "w", encoding="utf-8") as f:
+                f.write("<title>{{ Title }}</title>{{ Content }}")
+            self.write_page(root, "index.md", "# Home\n\nSee [about](/about).")
+            self.write_page(root, "about.md", "# About")
+
+            self.assertEqual(self.run_main(root).wait(), 0)
+            single = self.read_tree(os.path.join(root, "public"))
+            shutil.rmtree(os.path.join(root, "public"))
+
+            # at least three of the five shards render nothing
+            self.assertEqual(self.build_shards(root, 5), single)
+
+
+if __name__ == "__main__":
+    unittest.main()
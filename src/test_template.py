@@ -0,0 +1,62 @@
+import os
+import tempfile
+import unittest
+
+from template import Template, load_template, clear_template_cache
+
+
+class TestTemplate(unittest.TestCase):
+    def test_segments(self):
+        template = Template("<title>{{ Title }}</title>{{Content}}!")
+        self.assertEqual(template.segments, ["<title>", "Title", "</title>", "Content", "!"])
+
+    def test_render(self):
+        template = Template("<h1>{{ Title }}</h1><p>{{ Author }}</p>")
+        self.assertEqual(
+            template.render({"Title": "Hello", "Author": "Me"}),
+            "<h1>Hello</h1><p>Me</p>",
+        )
+
+    def test_render_missing_variable_kept(self):
+        template = Template("{{ Title }} by {{ Author }}")
+        self.assertEqual(template.render({"Title": "Hello"}), "Hello by {{ Author }}")
+
+    def test_render_streamed_value(self):
+        template = Template("<body>{{ Content }}</body>")
+        chunks = (chunk for chunk in ["<p>", "streamed", "</p>"])
+        self.assertEqual(template.render({"Content": chunks}), "<body><p>streamed</p></body>")
+
+    def test_plain_values_are_escaped(self):
+        template = Template("<title>{{ Title }}</title>{{ Content }}")
+        self.assertEqual(
+            template.render({"Title": "Tom & Jerry <script>x</script>", "Content": ["<p>x</p>"]}),
+            "<title>Tom &amp; Jerry &lt;script&gt;x&lt;/script&gt;</title><p>x</p>",
+        )
+
+    def test_value_is_not_rescanned(self):
+        template = Template("{{ Title }}|{{ Content }}")
+        self.assertEqual(
+            template.render({"Title": "T", "Content": "{{ Title }}"}),
+            "T|{{ Title }}",
+        )
+
+    def test_load_template_cached_until_modified(self):
+        clear_template_cache()
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "template.html")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("{{ Title }}")
+            first = load_template(path)
+            self.assertIs(load_template(path), first)
+
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("<b>{{ Title }}</b>")
+            stat = os.stat(path)
+            os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+            second = load_template(path)
+            self.assertIsNot(second, first)
+            self.assertEqual(second.render({"Title": "x"}), "<b>x</b>")
+
+
+if __name__ == "__main__":
+    unittest.main()
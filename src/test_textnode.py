@@ -5,7 +5,7 @@ from textnode import (
     split_nodes_delimiter, 
     extract_markdown_images, extract_markdown_links,
     split_nodes_image, split_nodes_link,
-    text_to_textnodes
+    text_to_textnodes, text_to_html_nodes, text_node_to_html,
 )
 
 
@@ -41,6 +41,12 @@ class TestTextNode(unittest.TestCase):
         self.assertNotEqual(node, node2)
     
 
+    def test_slotted(self):
+        node = TextNode("This is a text node", TextTypes.TEXT)
+        self.assertFalse(hasattr(node, "__dict__"))
+        with self.assertRaises(AttributeError):
+            node.extra = True
+
     def test_split_single_node(self):
         node = TextNode("This is text with a `code block` word", TextTypes.TEXT)
         new_nodes = split_nodes_delimiter([node], "`", TextTypes.CODE)
@@ -181,6 +187,53 @@ class TestTextNode(unittest.TestCase):
         ]
         self.assertEqual(actual_nodes, expected_nodes)
 
+    def test_text_to_textnodes_star_inside_code(self):
+        actual_nodes = text_to_textnodes("Use `a * b` or `**kwargs` here")
+        expected_nodes = [
+            TextNode("Use ", TextTypes.TEXT),
+            TextNode("a * b", TextTypes.CODE),
+            TextNode(" or ", TextTypes.TEXT),
+            TextNode("**kwargs", TextTypes.CODE),
+            TextNode(" here", TextTypes.TEXT),
+        ]
+        self.assertEqual(actual_nodes, expected_nodes)
+
+    def test_text_to_textnodes_no_empty_text_nodes(self):
+        actual_nodes = text_to_textnodes("**Bold** then *italic*")
+        expected_nodes = [
+            TextNode("Bold", TextTypes.BOLD),
+            TextNode(" then ", TextTypes.TEXT),
+            TextNode("italic", TextTypes.ITALIC),
+        ]
+        self.assertEqual(actual_nodes, expected_nodes)
+
+    def test_text_to_textnodes_plain_text(self):
+        self.assertEqual(
+            text_to_textnodes("Nothing to see"),
+            [TextNode("Nothing to see", TextTypes.TEXT)],
+        )
+
+    def test_text_to_textnodes_unmatched_delimiter(self):
+        self.assertEqual(
+            text_to_textnodes("This is **unclosed"), [TextNode("This is **unclosed", TextTypes.TEXT)]
+        )
+        self.assertEqual(
+            text_to_textnodes("5 * 3 and *it*"),
+            [TextNode("5 * 3 and ", TextTypes.TEXT), TextNode("it", TextTypes.ITALIC)],
+        )
+
+    def test_text_to_html_nodes_matches_textnode_path(self):
+        text = "A **b** *i* `c` [l](/u) ![a](/p.png) tail"
+        self.assertEqual(
+            [node.to_html() for node in text_to_html_nodes(text)],
+            [text_node_to_html(node).to_html() for node in text_to_textnodes(text)],
+        )
+        for text in ("**unclosed", "a `` b", "5 * 3 * 4", "[](/u) x"):
+            self.assertEqual(
+                [node.to_html() for node in text_to_html_nodes(text)],
+                [text_node_to_html(node).to_html() for node in text_to_textnodes(text)],
+            )
+
         
 if __name__ == "__main__":
     unittest.main()
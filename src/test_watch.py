@@ -0,0 +1,65 @@
+import os
+import tempfile
+import threading
+import unittest
+
+from watch import snapshot, changed_paths, watch
+
+
+class TestWatch(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        self.path = os.path.join(self.root, "nested", "page.md")
+        os.makedirs(os.path.dirname(self.path))
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write("# Page")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_snapshot_walks_tree(self):
+        self.assertEqual(list(snapshot([self.root])), [self.path])
+
+    def test_changed_paths(self):
+        before = snapshot([self.root])
+        added = os.path.join(self.root, "added.md")
+        with open(added, "w", encoding="utf-8") as f:
+            f.write("new")
+        os.remove(self.path)
+        self.assertEqual(changed_paths(before, snapshot([self.root])), {added, self.path})
+
+    def test_watch_debounces_burst(self):
+        batches = []
+        stop_event = threading.Event()
+        changed = threading.Event()
+
+        def on_change(paths):
+            batches.append(paths)
+            changed.set()
+
+        thread = threading.Thread(
+            target=watch,
+            args=([self.root], on_change),
+            kwargs={
+                "interval": 0.01,
+                "debounce": 0.1,
+                "stop_event": stop_event,
+                "previous": snapshot([self.root]),
+            },
+        )
+        thread.start()
+        try:
+            for i in range(3):
+                with open(os.path.join(self.root, f"burst{i}.md"), "w", encoding="utf-8") as f:
+                    f.write(str(i))
+            self.assertTrue(changed.wait(5))
+        finally:
+            stop_event.set()
+            thread.join()
+        self.assertEqual(len(batches), 1)
+        self.assertEqual(len(batches[0]), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
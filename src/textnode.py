@@ -1,5 +1,5 @@
 import re
-from htmlnode import LeafNode
+import htmlnode
 from enum import Enum
 
 class TextTypes(Enum):
@@ -12,6 +12,8 @@ class TextTypes(Enum):
 
 
 class TextNode:
+    __slots__ = ("text", "text_type", "url")
+
     def __init__(self, text, text_type, url=None):
         self.text = text
         self.text_type = text_type
@@ -30,17 +32,17 @@ class TextNode:
 
 def text_node_to_html(text_node):
     if text_node.text_type == TextTypes.TEXT:
-        return LeafNode(None, text_node.text)
+        return htmlnode.LeafNode(None, text_node.text)
     elif text_node.text_type == TextTypes.BOLD:
-        return LeafNode("b", text_node.text)
+        return htmlnode.LeafNode("b", text_node.text)
     elif text_node.text_type == TextTypes.ITALIC:
-        return LeafNode("i", text_node.text)
+        return htmlnode.LeafNode("i", text_node.text)
     elif text_node.text_type == TextTypes.CODE:
-        return LeafNode("code", text_node.text)
+        return htmlnode.LeafNode("code", text_node.text)
     elif text_node.text_type == TextTypes.LINK:
-        return LeafNode("a", text_node.text, {"href": text_node.url})
+        return htmlnode.LeafNode("a", text_node.text, {"href": text_node.url})
     elif text_node.text_type == TextTypes.IMAGE:
-        return LeafNode("img", "", {"src": text_node.url, "alt": text_node.text})
+        return htmlnode.LeafNode("img", "", {"src": text_node.url, "alt": text_node.text})
     else:
         raise Exception("Such text type is not supported!")
 
@@ -74,7 +76,7 @@ def extract_markdown_images(text):
     return images
 
 def extract_markdown_links(text):
-    links = re.findall(r"\[(.*?)\]\((.*?)\)", text)
+    links = re.findall(r"(?<!!)\[(.*?)\]\((.*?)\)", text)
     return links
 
 def split_nodes(old_nodes, extract_func, text_type):
@@ -103,11 +105,67 @@ def split_nodes_image(old_nodes):
 def split_nodes_link(old_nodes):
     return split_nodes(old_nodes, extract_markdown_links, TextTypes.LINK)
 
+INLINE_PATTERN = re.compile(
+    r"!\[(?P<image>.*?)\]\((?P<image_url>.*?)\)"
+    r"|\[(?P<link>.*?)\]\((?P<link_url>.*?)\)"
+    r"|`(?P<code>(?s:.*?))`"
+    # emphasis must hug its text, so "5 * 3 * 4" stays arithmetic
+    r"|\*\*(?P<bold>(?![\s*])(?s:.*?)(?<!\s))\*\*"
+    r"|\*(?P<italic>(?![\s*])(?s:.*?)(?<!\s))\*"
+)
+INLINE_TAGS = {"code": "code", "bold": "b", "italic": "i"}
+INLINE_TYPES = {"code": TextTypes.CODE, "bold": TextTypes.BOLD, "italic": TextTypes.ITALIC}
+
+
+def _append_text(nodes, text):
+    if text:
+        nodes.append(TextNode(text, TextTypes.TEXT))
+
+
 def text_to_textnodes(text):
-    nodes = [TextNode(text, TextTypes.TEXT)]
-    nodes = split_nodes_image(nodes)
-    nodes = split_nodes_link(nodes)
-    nodes = split_nodes_delimiter(nodes, "**", TextTypes.BOLD)
-    nodes = split_nodes_delimiter(nodes, "*", TextTypes.ITALIC)
-    nodes = split_nodes_delimiter(nodes, "`", TextTypes.CODE)
+    # One left-to-right sweep: the earliest span wins, so `*` inside a code
+    # span or link text stays literal instead of being split by a later pass.
+    # A delimiter without a partner, or around an empty span, is just text.
+    nodes = []
+    position = 0
+    for match in INLINE_PATTERN.finditer(text):
+        kind = match.lastgroup
+        if kind == "image_url":
+            node = TextNode(match["image"], TextTypes.IMAGE, match["image_url"])
+        elif kind == "link_url":
+            node = TextNode(match["link"], TextTypes.LINK, match["link_url"]) if match["link"] else None
+        else:
+            node = TextNode(match[kind], INLINE_TYPES[kind]) if match[kind] else None
+        if node is None:
+            continue
+        _append_text(nodes, text[position:match.start()])
+        nodes.append(node)
+        position = match.end()
+    _append_text(nodes, text[position:])
+    return nodes
+
+
+def text_to_html_nodes(text):
+    # The same sweep as text_to_textnodes, building leaves directly: block
+    # rendering never needs the intermediate TextNodes.
+    LeafNode = htmlnode.LeafNode
+    nodes = []
+    position = 0
+    for match in INLINE_PATTERN.finditer(text):
+        kind = match.lastgroup
+        if kind == "image_url":
+            node = LeafNode("img", "", {"src": match["image_url"], "alt": match["image"]})
+        elif kind == "link_url":
+            node = LeafNode("a", match["link"], {"href": match["link_url"]}) if match["link"] else None
+        else:
+            node = LeafNode(INLINE_TAGS[kind], match[kind]) if match[kind] else None
+        if node is None:
+            continue
+        start = match.start()
+        if start > position:
+            nodes.append(LeafNode(None, text[position:start]))
+        nodes.append(node)
+        position = match.end()
+    if position < len(text):
+        nodes.append(LeafNode(None, text[position:]))
     return nodes
@@ -0,0 +1,55 @@
+import os
+import time
+import logging
+
+
+def snapshot(paths):
+    state = {}
+    stack = list(paths)
+    while stack:
+        path = stack.pop()
+        try:
+            if os.path.isdir(path):
+                with os.scandir(path) as entries:
+                    for entry in entries:
+                        if entry.is_dir():
+                            stack.append(entry.path)
+                        elif entry.is_file():
+                            stat = entry.stat()
+                            state[entry.path] = (stat.st_mtime_ns, stat.st_size)
+            elif os.path.isfile(path):
+                stat = os.stat(path)
+                state[path] = (stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            continue
+    return state
+
+
+def changed_paths(previous, current):
+    changed = {path for path, state in current.items() if previous.get(path) != state}
+    changed.update(path for path in previous if path not in current)
+    return changed
+
+
+def watch(paths, on_change, interval=0.025, debounce=0.025, stop_event=None, previous=None):
+    if previous is None:
+        previous = snapshot(paths)
+    pending = set()
+    last_change = 0.0
+    while stop_event is None or not stop_event.is_set():
+        time.sleep(interval)
+        current = snapshot(paths)
+        changed = changed_paths(previous, current)
+        previous = current
+        now = time.monotonic()
+        if changed:
+            # keep collecting until the burst of events goes quiet
+            pending.update(changed)
+            last_change = now
+        elif pending and now - last_change >= debounce:
+            batch = sorted(pending)
+            pending.clear()
+            try:
+                on_change(batch)
+            except Exception:
+                logging.exception("Rebuild failed")